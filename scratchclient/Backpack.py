@@ -1,6 +1,3 @@
-import requests
-
-
 class BackpackItem:
     def __init__(self, data, client):
         self.body_URL = f"https://backpack.scratch.mit.edu/{data['body']}"
@@ -15,7 +12,17 @@ class BackpackItem:
     def delete(self):
         self._client._ensure_logged_in()
 
-        requests.delete(
+        self._client.transport.delete(
+            f"https://backpack.scratch.mit.edu/{self._client.username}/{self.id}",
+            headers=self._client._headers,
+        )
+
+
+class AsyncBackpackItem(BackpackItem):
+    async def delete(self):
+        self._client._ensure_logged_in()
+
+        await self._client.transport.delete(
             f"https://backpack.scratch.mit.edu/{self._client.username}/{self.id}",
             headers=self._client._headers,
         )
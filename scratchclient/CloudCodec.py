@@ -0,0 +1,204 @@
+"""
+Encodes data into numbers so it can be stored in cloud variables, and decodes it back
+Cloud variables can only hold digits, so every bot ends up needing something like this
+
+Text is encoded with two digits per character, using the position of the character in a table
+"00" separates strings when several are encoded together
+"""
+
+import operator
+
+from .ScratchExceptions import CloudVariableException
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DEFAULT_CHARACTERS = (
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    " !\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~\n"
+)
+SEPARATOR = "\x00"
+
+TEXT = "1"
+BYTES = "2"
+INTEGER = "3"
+LIST = "4"
+
+
+class CloudCodec:
+    def __init__(self, characters=DEFAULT_CHARACTERS, use_numpy=True):
+        if len(characters) > 99:
+            raise ValueError("There can be at most 99 characters")
+
+        if SEPARATOR in characters or len(set(characters)) != len(characters):
+            raise ValueError(
+                "Characters must be unique and can't include the separator"
+            )
+
+        self.characters = characters
+        codes = {SEPARATOR: "00"}
+        codes.update(
+            (character, f"{index + 1:02d}")
+            for index, character in enumerate(characters)
+        )
+        self._encode_table = str.maketrans(codes)
+        self._decode_table = {code: character for character, code in codes.items()}
+
+        # The vectorized versions only work when every character fits in one byte
+        self.use_numpy = bool(
+            use_numpy
+            and numpy
+            and all(ord(character) < 256 for character in characters)
+        )
+        if self.use_numpy:
+            # 255 marks characters that aren't in the table
+            self._numpy_encode_table = numpy.full(256, 255, dtype=numpy.uint8)
+            self._numpy_decode_table = numpy.zeros(100, dtype=numpy.uint8)
+            for character, code in codes.items():
+                self._numpy_encode_table[ord(character)] = int(code)
+                self._numpy_decode_table[int(code)] = ord(character)
+
+    def encode_text(self, text):
+        encoded = text.translate(self._encode_table)
+
+        # Characters that aren't in the table are left as they are
+        if len(encoded) != len(text) * 2:
+            unknown = next(
+                character
+                for character in text
+                if character != SEPARATOR and character not in self.characters
+            )
+            raise CloudVariableException(f"'{unknown}' can't be encoded")
+
+        return encoded
+
+    def decode_text(self, digits):
+        if len(digits) % 2:
+            raise CloudVariableException("Encoded text must have an even length")
+
+        # Zipping the iterator with itself reads the digits two at a time
+        pairs = iter(digits)
+        try:
+            return "".join(
+                map(self._decode_table.__getitem__, map(operator.add, pairs, pairs))
+            )
+        except KeyError as err:
+            raise CloudVariableException(f"{err.args[0]} is not a valid character code")
+
+    def encode_texts(self, texts):
+        # Encodes several strings at once, separated by "00"
+        if any(SEPARATOR in text for text in texts):
+            raise CloudVariableException("Strings can't contain the separator")
+
+        text = SEPARATOR.join(texts)
+        if self.use_numpy:
+            return self._encode_text_numpy(text)
+
+        return self.encode_text(text)
+
+    def decode_texts(self, digits):
+        if not digits:
+            return []
+
+        if self.use_numpy:
+            return self._decode_text_numpy(digits).split(SEPARATOR)
+
+        return self.decode_text(digits).split(SEPARATOR)
+
+    def _encode_text_numpy(self, text):
+        try:
+            characters = numpy.frombuffer(text.encode("latin-1"), dtype=numpy.uint8)
+        except UnicodeEncodeError:
+            characters = None
+
+        codes = self._numpy_encode_table[characters] if characters is not None else None
+        if codes is None or (codes == 255).any():
+            # Let the normal version find the character and raise the error
+            return self.encode_text(text)
+
+        digits = numpy.empty(len(codes) * 2, dtype=numpy.uint8)
+        digits[0::2] = codes // 10 + 48
+        digits[1::2] = codes % 10 + 48
+
+        return digits.tobytes().decode("ascii")
+
+    def _decode_text_numpy(self, digits):
+        if len(digits) % 2 or not digits.isdigit():
+            raise CloudVariableException(
+                "Encoded text must be an even number of digits"
+            )
+
+        pairs = (
+            numpy.frombuffer(digits.encode("ascii"), dtype=numpy.uint8).reshape(-1, 2)
+            - 48
+        )
+        codes = pairs[:, 0] * 10 + pairs[:, 1]
+        if codes.max() > len(self.characters):
+            raise CloudVariableException(f"{codes.max()} is not a valid character code")
+
+        return self._numpy_decode_table[codes].tobytes().decode("latin-1")
+
+    def encode_bytes(self, data):
+        # The 1 at the start keeps leading zero bytes from getting lost
+        return str(int.from_bytes(b"\x01" + bytes(data), byteorder="big"))
+
+    def decode_bytes(self, digits):
+        number = int(digits)
+        return number.to_bytes((number.bit_length() + 7) // 8, byteorder="big")[1:]
+
+    def encode_int(self, number):
+        # The first digit is the sign
+        return f"0{number}" if number >= 0 else f"1{-number}"
+
+    def decode_int(self, digits):
+        return int(digits[1:]) if digits[0] == "0" else -int(digits[1:])
+
+    def encode_list(self, items):
+        # Every item has its length in front of it
+        # and the length has its number of digits in front of that
+        encoded_items = [self.encode(item) for item in items]
+        return "".join(
+            f"{len(str(len(item)))}{len(item)}{item}" for item in encoded_items
+        )
+
+    def decode_list(self, digits):
+        items = []
+        index = 0
+        while index < len(digits):
+            length_digits = int(digits[index])
+            start = index + 1 + length_digits
+            length = int(digits[index + 1 : start])
+            items.append(self.decode(digits[start : start + length]))
+            index = start + length
+
+        return items
+
+    def encode(self, value):
+        # Works for any supported type; the first digit says what type it is
+        if isinstance(value, str):
+            return TEXT + self.encode_text(value)
+        elif isinstance(value, (bytes, bytearray)):
+            return BYTES + self.encode_bytes(value)
+        elif isinstance(value, int):
+            return INTEGER + self.encode_int(value)
+        elif isinstance(value, (list, tuple)):
+            return LIST + self.encode_list(value)
+
+        raise CloudVariableException(f"{type(value).__name__} can't be encoded")
+
+    def decode(self, digits):
+        digits = str(digits)
+        kind, data = digits[:1], digits[1:]
+
+        if kind == TEXT:
+            return self.decode_text(data)
+        elif kind == BYTES:
+            return self.decode_bytes(data)
+        elif kind == INTEGER:
+            return self.decode_int(data)
+        elif kind == LIST:
+            return self.decode_list(data)
+
+        raise CloudVariableException(f"'{digits}' is not an encoded value")
@@ -1,99 +1,123 @@
 import json
-import time
+import functools
 import threading
+import time
 import asyncio
-
-from .Websocket import Websocket, AsyncWebsocket
+import queue
+import selectors
+
+from .EventEmitter import EventEmitter
+from .Websocket import Websocket, AsyncWebsocket, PerMessageDeflate, WebsocketException
+from .RateLimiter import RateLimiter
+from .ReconnectPolicy import ReconnectPolicy
+from .LatencyHistogram import LatencyHistogram
+from .CloudCodec import CloudCodec
+from .CloudHistory import CloudHistory, SERVER, SELF
 from .ScratchExceptions import *
 
 
-class EventEmitter:
-    def __init__(self):
-        self._events = {}
+class CloudVariable:
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
 
-    def on(self, key, callback=None, once=False):
-        def add_handler(handler):
-            if not key in self._events:
-                self._events[key] = []
 
-            self._events[key].append((handler, once))
+@functools.lru_cache(maxsize=4096)
+def _cloud_name(name):
+    return name if name.startswith("☁ ") else f"☁ {name}"
 
-        if callback:
-            add_handler(callback)
-            return
 
-        return add_handler
+class _UpdateStream:
+    def __init__(self, filter, queue):
+        self.queue = queue
+        # Updates that didn't fit in the queue, only used by AsyncCloudConnection
+        self.overflow = []
+        # Set by AsyncCloudConnection when the overflow is empty again
+        self.drained = None
 
-    def off(self, key, callback):
-        self._events[key] = [
-            (handler, once)
-            for handler, once in self._events[key]
-            if handler is not callback
-        ]
+        if filter is None:
+            self.matches = lambda variable: True
+        elif isinstance(filter, str):
+            name = _cloud_name(filter)
+            self.matches = lambda variable: variable.name == name
+        elif callable(filter):
+            self.matches = filter
+        else:
+            names = {_cloud_name(name) for name in filter}
+            self.matches = lambda variable: variable.name in names
 
-    def once(self, key, callback=None):
-        return self.on(key, callback, True)
 
-    def emit(self, key, *args, **kwargs):
-        if not key in self._events:
-            return
+class CloudVariableStore:
+    """
+    Cloud variables indexed by their name
+    Iterating over it gives the variables in the order they were added, like a list
+    """
 
-        for handler, once in self._events[key]:
-            if asyncio.iscoroutinefunction(handler):
-                asyncio.create_task(handler(*args, **kwargs))
-            else:
-                handler(*args, **kwargs)
+    def __init__(self):
+        self._variables = {}
 
-            if once:
-                self.off(key, handler)
+    def __iter__(self):
+        return iter(self._variables.values())
 
-    def listeners(self, event):
-        return self._events[event][0]
+    def __len__(self):
+        return len(self._variables)
 
+    def __contains__(self, name):
+        return _cloud_name(name) in self._variables
 
-class CloudVariable:
-    def __init__(self, name, value):
-        self.name = name
-        self.value = value
+    def get(self, name):
+        return self._variables.get(_cloud_name(name))
+
+    def append(self, variable):
+        self._variables[variable.name] = variable
+
+    def remove(self, name):
+        return self._variables.pop(_cloud_name(name), None)
 
 
 class BaseCloudConnection(EventEmitter):
-    def __init__(self, project_id, client, cloud_host):
+    def __init__(
+        self,
+        project_id,
+        client,
+        cloud_host,
+        compression=False,
+        rate_limiter=None,
+        reconnect_policy=None,
+        ping_interval=20,
+        max_missed_pongs=3,
+    ):
         super().__init__()
         self._client = client
         self.project_id = project_id
         self.cloud_host = cloud_host
+        self.compression = compression
+        # Scratch allows 10 updates per second; pass the same limiter to share it
+        self.rate_limiter = rate_limiter or RateLimiter(10)
+        self.reconnect_policy = reconnect_policy or ReconnectPolicy()
+        self.reconnects = 0
+        # Set ping_interval to None to stop sending pings
+        self.ping_interval = ping_interval
+        self.max_missed_pongs = max_missed_pongs
+        self.latency = LatencyHistogram()
+        # Pings that haven't been answered, by their data
+        self._pings = {}
+        self._ping_sequence = 0
+        self._last_ping = time.monotonic()
+        # When on, sets that are waiting to be sent are replaced by newer ones
+        self.coalesce = False
+        self._outbox = {}
+        # Iterators from updates() that are waiting for variables to be set
+        self._streams = []
+        # Updates that were thrown away because an iterator wasn't keeping up
+        self.updates_dropped = 0
+        # Only kept after record_history is called
+        self.history = None
+        self._flusher = None
+        self.codec = CloudCodec()
         self._ws = None
 
-    def _send_packet(self, packet):
-        return self._ws.send(f"{json.dumps(packet)}\n")
-
-    def get_cloud_variable(self, name):
-        try:
-            var = next(
-                x
-                for x in self._cloudvariables
-                if x.name == (f"☁ {name}" if not name.startswith("☁ ") else name)
-            )
-            return var.value
-        except StopIteration:
-            raise CloudVariableException(
-                f"Variable '{(f'☁ {name}' if not name.startswith('☁ ') else name)}' is not in this project"
-            )
-
-
-class CloudConnection(BaseCloudConnection):
-    def __init__(
-        self, project_id, client, cloud_host="clouddata.scratch.mit.edu", headers={}
-    ):
-        super().__init__(project_id, client, cloud_host)
-        self.connect(headers)
-
-    def connect(self, headers):
-        self._ws = Websocket()
-        self._cloudvariables = []
-        self._timer = time.time()
-
+    def _default_headers(self):
         default_headers = {
             "Cookie": f"scratchsessionsid={self._client.session_id};",
             "Origin": "https://scratch.mit.edu",
@@ -105,310 +129,852 @@ class CloudConnection(BaseCloudConnection):
             # Don't send the session ID unless it's Scratch
             del default_headers["Cookie"]
 
-        self._ws.connect(
-            f"wss://{self.cloud_host}",
-            headers={**default_headers, **headers},
-        )  # connect the websocket
-        self._send_packet(
-            {
-                "method": "handshake",
-                "user": self._client.username,
-                "project_id": str(self.project_id),
-            }
-        )
-        self.emit("handshake")
-        response = self._ws.recv().split("\n")
-        for variable in response:
+        return default_headers
+
+    def _url(self):
+        # The host can start with ws:// to connect to a server without TLS
+        if self.cloud_host.startswith(("ws://", "wss://")):
+            return self.cloud_host
+
+        return f"wss://{self.cloud_host}"
+
+    def _handshake_packet(self):
+        return {
+            "method": "handshake",
+            "user": self._client.username,
+            "project_id": str(self.project_id),
+        }
+
+    def _load_snapshot(self, message, resync=False):
+        snapshot = {}
+        for variable in message.split("\n"):
             try:
                 variable = json.loads(str(variable))
             except json.decoder.JSONDecodeError:
                 pass
             else:
-                self._cloudvariables.append(
-                    CloudVariable(variable["name"], variable["value"])
-                )
+                snapshot[variable["name"]] = variable["value"]
+
+        if not resync:
+            for name, value in snapshot.items():
+                self._cloudvariables.append(CloudVariable(name, value))
+            return
+
+        # Only variables that changed while disconnected fire events
+        for name, value in snapshot.items():
+            cloud = self._cloudvariables.get(name)
+            if not cloud:
+                cloud = CloudVariable(name, value)
+                self._cloudvariables.append(cloud)
+                self.emit("create", cloud)
+                self.emit("change", cloud)
+            elif str(cloud.value) != str(value):
+                cloud.value = value
+                self.emit("set", cloud)
+                self._publish(cloud)
+                self.emit("change", cloud)
+
+        for cloud in list(self._cloudvariables):
+            if cloud.name not in snapshot:
+                self._cloudvariables.remove(cloud.name)
+                self.emit("delete", cloud.name)
+
+    def _reset_pings(self):
+        self._ws.on_pong = self._on_pong
+        self._pings.clear()
+        self._last_ping = time.monotonic()
+
+    def _on_pong(self, data):
+        sent = self._pings.pop(bytes(data).decode("utf-8", "replace"), None)
+        if sent is None:
+            return
+
+        self.latency.add(time.monotonic() - sent)
+        # Any pong means the connection is alive, so earlier missed pings don't count
+        self._pings.clear()
+
+    def _next_ping(self):
+        # Returns the data for the next ping, or None if the connection is dead
+        self._last_ping = time.monotonic()
+        if len(self._pings) >= self.max_missed_pongs:
+            self._pings.clear()
+            return None
+
+        self._ping_sequence += 1
+        data = str(self._ping_sequence)
+        self._pings[data] = self._last_ping
+        return data
+
+    def _publish(self, variable):
+        if self.history:
+            self.history.record(variable.name, variable.value, SERVER)
+
+        for stream in self._streams[:]:
+            if stream.matches(variable):
+                # A copy, since the variable's value changes when it's set again
+                self._put_update(stream, CloudVariable(variable.name, variable.value))
+
+    def _close_streams(self):
+        for stream in self._streams[:]:
+            self._put_update(stream, None)
+
+    def _requeue(self, name, value):
+        # Puts a set that couldn't be sent back at the front of the outbox,
+        # unless a newer value for the variable was queued in the meantime
+        self._outbox = {name: value, **self._outbox}
+
+    def _check_value(self, value):
+        if not str(value).isdigit():
+            raise CloudVariableException(
+                "Cloud variables can only be set to a combination of numbers"
+            )
+
+        if len(str(value)) > 256:
+            raise CloudVariableException(
+                "Cloud variable values must be less than 256 characters long"
+            )
+
+    def _set_packet(self, name, value):
+        return {
+            "method": "set",
+            "name": name,
+            "value": str(value),
+            "user": self._client.username,
+            "project_id": str(self.project_id),
+        }
+
+    def _after_set(self, packet, value):
+        self.emit("outgoing", packet)
+
+        cloud = self._cloudvariables.get(packet["name"])
+        if cloud:
+            cloud.value = value
+            self.emit("change", cloud)
+
+        if self.history:
+            self.history.record(packet["name"], value, SELF)
+
+    def _compression_extension(self):
+        return PerMessageDeflate() if self.compression else None
+
+    def _send_packet(self, packet):
+        return self._ws.send(f"{json.dumps(packet)}\n")
+
+    def _send_packets(self, packets):
+        # The server reads one packet per line, so they can all go in one frame
+        return self._ws.send("".join(f"{json.dumps(packet)}\n" for packet in packets))
+
+    def _handle_message(self, message):
+        # The server can send several packets in one message, one on each line
+        for line in message.split("\n"):
+            if not line:
+                continue
+
+            response = json.loads(line)
+
+            if response["method"] != "set":
+                continue
+
+            cloud = self._cloudvariables.get(response["name"])
+            if cloud:
+                cloud.value = response["value"]
+            else:
+                # A new variable was created and was set
+                cloud = CloudVariable(response["name"], response["value"])
+                self._cloudvariables.append(cloud)
+                self.emit("create", cloud)
+
+            self.emit("set", cloud)
+            self._publish(cloud)
+            self.emit("change", cloud)
+
+    def get_cloud_variable(self, name):
+        name = _cloud_name(name)
+        variable = self._cloudvariables.get(name)
+        if not variable:
+            raise CloudVariableException(f"Variable '{name}' is not in this project")
+
+        return variable.value
+
+    def record_history(self, capacity=1000):
+        # Starts keeping the last few values of every variable
+        if not self.history:
+            self.history = CloudHistory(capacity)
+
+        return self.history
+
+    def get_history(self, name):
+        name = _cloud_name(name)
+        if not self.history or name not in self.history:
+            return None
+
+        return self.history[name]
+
+    def set_encoded(self, name, value):
+        # Returns a coroutine on AsyncCloudConnection, like set_cloud_variable
+        return self.set_cloud_variable(name, self.codec.encode(value))
+
+    def get_decoded(self, name):
+        return self.codec.decode(self.get_cloud_variable(name))
+
+
+class CloudConnection(BaseCloudConnection):
+    def __init__(
+        self,
+        project_id,
+        client,
+        cloud_host="clouddata.scratch.mit.edu",
+        headers={},
+        compression=False,
+        pool=None,
+        rate_limiter=None,
+        reconnect_policy=None,
+        ping_interval=20,
+        max_missed_pongs=3,
+    ):
+        super().__init__(
+            project_id,
+            client,
+            cloud_host,
+            compression,
+            rate_limiter,
+            reconnect_policy,
+            ping_interval,
+            max_missed_pongs,
+        )
+        self._headers = headers
+        self._pool = pool
+        self._outbox_condition = threading.Condition()
+        self._stopped = threading.Event()
+        self.connect(headers)
+
+    def connect(self, headers):
+        self._headers = headers
+        self._cloudvariables = CloudVariableStore()
+        self._open()
         self.emit("connect")
-        self._start_cloud_var_loop()
+
+        if self._pool:
+            self._pool._register(self)
+        else:
+            self._start_cloud_var_loop()
+
+    def _open(self, resync=False):
+        # The old socket is kept until the new one connects, so a failed attempt
+        # doesn't leave one that was never opened behind
+        ws = Websocket(compression=self._compression_extension())
+        ws.connect(
+            self._url(),
+            headers={**self._default_headers(), **self._headers},
+        )  # connect the websocket
+        self._ws = ws
+        self._reset_pings()
+        self._send_packet(self._handshake_packet())
+        self.emit("handshake")
+        self._load_snapshot(self._ws.recv(), resync)
+
+    def reconnect(self):
+        # Returns whether it worked before the reconnect policy ran out of attempts
+        for delay in self.reconnect_policy.delays():
+            if self._stopped.wait(delay):
+                return False
+
+            try:
+                self._open(resync=True)
+            except (WebsocketException, OSError):
+                continue
+
+            self.reconnects += 1
+            self.emit("reconnect")
+            return True
+
+        self.emit("disconnect")
+        return False
 
     def set_cloud_variable(self, variable, value):
-        if time.time() - self._timer > 0.1:
-            if not str(value).isdigit():
-                raise CloudVariableException(
-                    "Cloud variables can only be set to a combination of numbers"
-                )
+        self._check_value(value)
 
-            if len(str(value)) > 256:
-                raise CloudVariableException(
-                    "Cloud variable values must be less than 256 characters long"
-                )
+        if self.coalesce:
+            self._queue_set(_cloud_name(variable), value)
+            return
 
-            packet = {
-                "method": "set",
-                "name": (
-                    f"☁ {variable}" if not variable.startswith("☁ ") else variable
-                ),
-                "value": str(value),
-                "user": self._client.username,
-                "project_id": str(self.project_id),
-            }
-            self._send_packet(packet)
-            self.emit("outgoing", packet)
-            self._timer = time.time()
-            for cloud in self._cloudvariables:
-                if (
-                    cloud.name == f"☁ {variable}"
-                    if not variable.startswith("☁ ")
-                    else variable
-                ):
-                    cloud.value = value
-                    self.emit("change", cloud)
-                    break
-        else:
-            time.sleep(time.time() - self._timer)
-            self.set_cloud_variable(variable, value)
+        packet = self._set_packet(_cloud_name(variable), value)
+        self.rate_limiter.acquire()
+        self._send_packet(packet)
+        self._after_set(packet, value)
 
-    def create_cloud_variable(self, name, initial_value=0):
-        if time.time() - self._timer > 0.1:
-            if not str(initial_value).isdigit():
-                raise CloudVariableException(
-                    "Cloud variables can only be set to a combination of numbers"
-                )
+    def set_cloud_variables(self, variables):
+        for value in variables.values():
+            self._check_value(value)
 
-            if len(str(initial_value)) > 256:
-                raise CloudVariableException(
-                    "Cloud variable values must be less than 256 characters long"
-                )
+        if self.coalesce:
+            for name, value in variables.items():
+                self._queue_set(_cloud_name(name), value)
+            return
 
-            packet = {
-                "method": "create",
-                "name": (f"☁ {name}" if not name.startswith("☁ ") else name),
-                "value": str(initial_value),
-                "user": self._client.username,
-                "project_id": str(self.project_id),
-            }
-            self._send_packet(packet)
-            self.emit("outgoing", packet)
-            self._timer = time.time()
-
-            new_variable = CloudVariable(f"☁ {name}" if not name.startswith("☁ ") else name, str(initial_value))
-            self._cloudvariables.append(new_variable)
-            self.emit("create", new_variable)
-            self.emit("change", new_variable)
-        else:
-            time.sleep(time.time() - self._timer)
-            self.create_cloud_variable(name, initial_value)
+        if not variables:
+            return
+
+        packets = [
+            self._set_packet(_cloud_name(name), value)
+            for name, value in variables.items()
+        ]
+        self.rate_limiter.acquire(len(packets))
+        self._send_packets(packets)
+        for packet, value in zip(packets, variables.values()):
+            self._after_set(packet, value)
+
+    def _queue_set(self, name, value):
+        with self._outbox_condition:
+            self._outbox[name] = value
+            self._outbox_condition.notify()
+
+            if not self._flusher:
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self):
+        try:
+            while True:
+                with self._outbox_condition:
+                    while not self._outbox:
+                        self._outbox_condition.wait()
+
+                self.rate_limiter.acquire()
+                with self._outbox_condition:
+                    # Variables are sent in the order they were first queued
+                    # but with the newest value they were given
+                    name = next(iter(self._outbox))
+                    value = self._outbox.pop(name)
+
+                packet = self._set_packet(name, value)
+                try:
+                    self._send_packet(packet)
+                except Exception:
+                    # Anything that goes wrong sending can't lose the value
+                    with self._outbox_condition:
+                        self._requeue(name, value)
+                    # Gives the connection time to reconnect before trying again
+                    if self._stopped.wait(1):
+                        return
+                    continue
+
+                self._after_set(packet, value)
+        finally:
+            self._flusher = None
+
+    def create_cloud_variable(self, name, initial_value=0):
+        self._check_value(initial_value)
+
+        packet = {
+            "method": "create",
+            "name": _cloud_name(name),
+            "value": str(initial_value),
+            "user": self._client.username,
+            "project_id": str(self.project_id),
+        }
+        self.rate_limiter.acquire()
+        self._send_packet(packet)
+        self.emit("outgoing", packet)
+
+        new_variable = CloudVariable(_cloud_name(name), str(initial_value))
+        self._cloudvariables.append(new_variable)
+        self.emit("create", new_variable)
+        self.emit("change", new_variable)
 
     def delete_cloud_variable(self, name):
-        if time.time() - self._timer > 0.1:
-            packet = {
-                "method": "delete",
-                "name": (f"☁ {name}" if not name.startswith("☁ ") else name),
-                "user": self._client.username,
-                "project_id": str(self.project_id),
-            }
-            self._send_packet(packet)
-            self.emit("outgoing", packet)
-            self._timer = time.time()
-
-            self.emit("delete", name)
-        else:
-            time.sleep(time.time() - self._timer)
-            self.delete_cloud_variable(name)
+        packet = {
+            "method": "delete",
+            "name": _cloud_name(name),
+            "user": self._client.username,
+            "project_id": str(self.project_id),
+        }
+        self.rate_limiter.acquire()
+        self._send_packet(packet)
+        self.emit("outgoing", packet)
+
+        self._cloudvariables.remove(name)
+        # Handlers get the name the way it was given, with or without the emoji
+        self.emit("delete", name)
+
+    def _keepalive(self):
+        if not self._ws.connected:
+            return
+
+        data = self._next_ping()
+        if data is None:
+            # The reconnect happens wherever the connection is being read from
+            self._ws.shutdown()
+            return
+
+        try:
+            self._ws.ping(data)
+        except (WebsocketException, OSError):
+            pass
+
+    def _keepalive_loop(self):
+        while not self._stopped.wait(self.ping_interval):
+            self._keepalive()
 
     def _cloud_var_loop(self):
         while True:
-            if self._ws.connected:
-                response = self._ws.recv()
-                response = json.loads(response)
+            if not self._ws.connected:
+                if self._stopped.is_set() or not self.reconnect():
+                    self._stopped.set()
+                    self._close_streams()
+                    break
+                continue
 
-                if response["method"] != "set":
-                    continue
+            try:
+                message = self._ws.recv()
+            except (WebsocketException, OSError):
+                continue
+
+            self._handle_message(message)
 
+    def updates(self, filter=None, maxsize=100, timeout=None):
+        # When the queue is full, the oldest update is dropped, since the thread
+        # receiving updates also answers pings and can't wait for room
+        stream = _UpdateStream(filter, queue.Queue(maxsize))
+        self._streams.append(stream)
+        try:
+            while True:
                 try:
-                    cloud = next(
-                        variable
-                        for variable in self._cloudvariables
-                        if response["name"] == variable.name
-                    )
-                    cloud.value = response["value"]
-                except StopIteration:
-                    # A new variable was created and was set
-                    cloud = CloudVariable(response["name"], response["value"])
-                    self._cloudvariables.append(cloud)
-                    self.emit("create", cloud)
+                    update = stream.queue.get(timeout=timeout)
+                except queue.Empty:
+                    return
 
-                self.emit("set", cloud)
-                self.emit("change", cloud)
-            else:
-                self.connect()
+                if update is None:
+                    return
+
+                yield update
+        finally:
+            self._streams.remove(stream)
+
+    def _put_update(self, stream, update):
+        while True:
+            try:
+                stream.queue.put_nowait(update)
+                return
+            except queue.Full:
+                pass
+
+            try:
+                stream.queue.get_nowait()
+                self.updates_dropped += 1
+            except queue.Empty:
+                pass
+
+    def close(self):
+        # Stops the connection for good instead of reconnecting
+        self._stopped.set()
+        self._ws.shutdown()
+        # Without a pool, the thread reading messages does this when it stops
+        if self._pool:
+            self._close_streams()
 
     def _start_cloud_var_loop(self):
         """Will start a new thread that looks for the cloud variables and appends their results onto cloudvariables"""
         thread = threading.Thread(target=self._cloud_var_loop)
         thread.start()
 
+        if self.ping_interval:
+            threading.Thread(target=self._keepalive_loop, daemon=True).start()
+
+
+class CloudConnectionPool:
+    """
+    Runs many cloud connections with two threads in total instead of one each
+    One thread waits on every socket with a selector and the other runs the event handlers
+    """
+
+    def __init__(self, client, queue_size=0):
+        self._client = client
+        self._selector = selectors.DefaultSelector()
+        self._running = False
+        self.connections = []
+        # Messages waiting for their handlers to be run, as (connection, message)
+        self.dispatch_queue = queue.Queue(queue_size)
+
+    def create_cloud_connection(
+        self,
+        project_id,
+        cloud_host="clouddata.scratch.mit.edu",
+        headers={},
+        compression=False,
+        rate_limiter=None,
+        reconnect_policy=None,
+        ping_interval=20,
+        max_missed_pongs=3,
+    ):
+        connection = CloudConnection(
+            project_id,
+            self._client,
+            cloud_host,
+            headers,
+            compression,
+            self,
+            rate_limiter,
+            reconnect_policy,
+            ping_interval,
+            max_missed_pongs,
+        )
+        self.connections.append(connection)
+
+        return connection
+
+    def remove(self, connection):
+        self._unregister(connection)
+        self.connections.remove(connection)
+        connection._ws.close()
+        connection._close_streams()
+
+    def start(self):
+        if self._running:
+            return
+
+        self._running = True
+        threading.Thread(target=self._select_loop, daemon=True).start()
+        threading.Thread(target=self._dispatch_loop, daemon=True).start()
+
+    def stop(self):
+        self._running = False
+        self.dispatch_queue.put((None, None))
+
+    def close(self):
+        self.stop()
+        for connection in self.connections[:]:
+            self.remove(connection)
+
+        self._selector.close()
+
+    def _register(self, connection):
+        # Anything that came in with the handshake won't wake up the selector
+        for message in connection._ws.buffered_messages():
+            self.dispatch_queue.put((connection, message))
+
+        self._selector.register(connection._ws, selectors.EVENT_READ, connection)
+
+    def _unregister(self, connection):
+        try:
+            self._selector.unregister(connection._ws)
+        except (KeyError, ValueError):
+            pass
+
+    def _select_loop(self):
+        while self._running:
+            for key, _ in self._selector.select(timeout=self._select_timeout()):
+                connection = key.data
+                try:
+                    messages = connection._ws.recv_available()
+                except (WebsocketException, OSError):
+                    messages = []
+
+                for message in messages:
+                    self.dispatch_queue.put((connection, message))
+
+                if not connection._ws.connected:
+                    self._unregister(connection)
+                    # Waiting between attempts would hold up every other connection
+                    threading.Thread(
+                        target=self._reconnect, args=(connection,), daemon=True
+                    ).start()
+
+            now = time.monotonic()
+            for connection in self.connections[:]:
+                if (
+                    connection.ping_interval
+                    and now - connection._last_ping >= connection.ping_interval
+                ):
+                    connection._keepalive()
+
+    def _select_timeout(self):
+        # Wakes up in time for the next ping that's due, and at least once a second
+        # so that connections added from other threads get picked up
+        timeout = 1
+        now = time.monotonic()
+        for connection in self.connections[:]:
+            if connection.ping_interval:
+                timeout = min(
+                    timeout, connection._last_ping + connection.ping_interval - now
+                )
+
+        return max(timeout, 0)
+
+    def _reconnect(self, connection):
+        if connection.reconnect():
+            self._register(connection)
+            return
+
+        # close() already ended the iterators if that's why it stopped
+        if not connection._stopped.is_set():
+            connection._stopped.set()
+            connection._close_streams()
+        if connection in self.connections:
+            self.connections.remove(connection)
+
+    def _dispatch_loop(self):
+        while self._running:
+            connection, message = self.dispatch_queue.get()
+            if connection is None:
+                break
+
+            # One connection's handlers can't be allowed to stop every other's events
+            try:
+                connection._handle_message(message)
+            except Exception as err:
+                connection._handle_error(err)
+
 
 class AsyncCloudConnection(BaseCloudConnection):
     def __init__(
-        self, project_id, client, cloud_host="clouddata.scratch.mit.edu", headers={}
+        self,
+        project_id,
+        client,
+        cloud_host="clouddata.scratch.mit.edu",
+        headers={},
+        compression=False,
+        rate_limiter=None,
+        reconnect_policy=None,
+        ping_interval=20,
+        max_missed_pongs=3,
     ):
-        super().__init__(project_id, client, cloud_host)
+        super().__init__(
+            project_id,
+            client,
+            cloud_host,
+            compression,
+            rate_limiter,
+            reconnect_policy,
+            ping_interval,
+            max_missed_pongs,
+        )
         self._headers = headers
+        self._closed = False
 
     def run(self):
         asyncio.run(self.connect())
 
     async def connect(self):
-        self._ws = AsyncWebsocket()
-        self._cloudvariables = []
-        self._timer = time.time()
-
-        default_headers = {
-            "Cookie": f"scratchsessionsid={self._client.session_id};",
-            "Origin": "https://scratch.mit.edu",
-        }
-        if self.cloud_host == "clouddata.scratch.mit.edu":
-            if not self._client.logged_in:
-                raise UnauthorizedException("You need to be logged in to do this")
-        else:
-            # Don't send the session ID unless it's Scratch
-            del default_headers["Cookie"]
-
-        await self._ws.connect(
-            f"wss://{self.cloud_host}",
-            headers={**default_headers, **self._headers},
-        )  # connect the websocket
+        self._cloudvariables = CloudVariableStore()
+        await self._open()
+        self.emit("connect")
 
-        await self._send_packet(
-            {
-                "method": "handshake",
-                "user": self._client.username,
-                "project_id": str(self.project_id),
-            }
+        keepalive = (
+            asyncio.create_task(self._keepalive_loop()) if self.ping_interval else None
         )
+        try:
+            await self.cloud_variable_loop()
+        finally:
+            if keepalive:
+                keepalive.cancel()
+
+    async def _open(self, resync=False):
+        # The old socket is kept until the new one connects, so a failed attempt
+        # doesn't leave one that was never opened behind
+        ws = AsyncWebsocket(compression=self._compression_extension())
+        await ws.connect(
+            self._url(),
+            headers={**self._default_headers(), **self._headers},
+        )  # connect the websocket
+        self._ws = ws
+        self._reset_pings()
+        await self._send_packet(self._handshake_packet())
         self.emit("handshake")
-        response = (await self._ws.recv()).split("\n")
-        for variable in response:
+        self._load_snapshot(await self._ws.recv(), resync)
+
+    async def reconnect(self):
+        for delay in self.reconnect_policy.delays():
+            await asyncio.sleep(delay)
+            if self._closed:
+                return False
+
             try:
-                variable = json.loads(str(variable))
-            except json.decoder.JSONDecodeError:
-                pass
-            else:
-                self._cloudvariables.append(
-                    CloudVariable(variable["name"], variable["value"])
-                )
-        self.emit("connect")
+                await self._open(resync=True)
+            except (WebsocketException, OSError):
+                continue
 
-        await self.cloud_variable_loop()
+            self.reconnects += 1
+            self.emit("reconnect")
+            return True
+
+        self.emit("disconnect")
+        return False
 
     async def set_cloud_variable(self, variable, value):
-        if time.time() - self._timer > 0.1:
-            if not str(value).isdigit():
-                raise CloudVariableException(
-                    "Cloud variables can only be set to a combination of numbers"
-                )
+        self._check_value(value)
 
-            if len(str(value)) > 256:
-                raise CloudVariableException(
-                    "Cloud variable values must be less than 256 characters long"
-                )
+        if self.coalesce:
+            self._queue_set(_cloud_name(variable), value)
+            return
 
-            packet = {
-                "method": "set",
-                "name": (
-                    f"☁ {variable}" if not variable.startswith("☁ ") else variable
-                ),
-                "value": str(value),
-                "user": self._client.username,
-                "project_id": str(self.project_id),
-            }
-            await self._send_packet(packet)
-            self.emit("outgoing", packet)
-            self._timer = time.time()
-            for cloud in self._cloudvariables:
-                if (
-                    cloud.name == f"☁ {variable}"
-                    if not variable.startswith("☁ ")
-                    else variable
-                ):
-                    cloud.value = value
-                    self.emit("change", cloud)
-                    break
-        else:
-            await asyncio.sleep(time.time() - self._timer)
-            await self.set_cloud_variable(variable, value)
+        packet = self._set_packet(_cloud_name(variable), value)
+        await self.rate_limiter.acquire_async()
+        await self._send_packet(packet)
+        self._after_set(packet, value)
 
-    async def create_cloud_variable(self, name, initial_value=0):
-        if time.time() - self._timer > 0.1:
-            if not str(initial_value).isdigit():
-                raise CloudVariableException(
-                    "Cloud variables can only be set to a combination of numbers"
-                )
+    async def set_cloud_variables(self, variables):
+        for value in variables.values():
+            self._check_value(value)
 
-            if len(str(initial_value)) > 256:
-                raise CloudVariableException(
-                    "Cloud variable values must be less than 256 characters long"
-                )
+        if self.coalesce:
+            for name, value in variables.items():
+                self._queue_set(_cloud_name(name), value)
+            return
 
-            packet = {
-                "method": "create",
-                "name": (f"☁ {name}" if not name.startswith("☁ ") else name),
-                "value": str(initial_value),
-                "user": self._client.username,
-                "project_id": str(self.project_id),
-            }
-            await self._send_packet(packet)
-            self.emit("outgoing", packet)
-            self._timer = time.time()
-
-            new_variable = CloudVariable(f"☁ {name}" if not name.startswith("☁ ") else name, str(initial_value))
-            self._cloudvariables.append(new_variable)
-            self.emit("create", new_variable)
-            self.emit("change", new_variable)
-        else:
-            await asyncio.sleep(time.time() - self._timer)
-            await self.create_cloud_variable(name, initial_value)
+        if not variables:
+            return
+
+        packets = [
+            self._set_packet(_cloud_name(name), value)
+            for name, value in variables.items()
+        ]
+        await self.rate_limiter.acquire_async(len(packets))
+        await self._send_packets(packets)
+        for packet, value in zip(packets, variables.values()):
+            self._after_set(packet, value)
+
+    def _queue_set(self, name, value):
+        self._outbox[name] = value
+
+        if not self._flusher:
+            self._outbox_event = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+        self._outbox_event.set()
+
+    async def _flush_loop(self):
+        try:
+            while True:
+                await self._outbox_event.wait()
+                await self.rate_limiter.acquire_async()
+
+                # Variables are sent in the order they were first queued
+                # but with the newest value they were given
+                name = next(iter(self._outbox))
+                value = self._outbox.pop(name)
+                if not self._outbox:
+                    self._outbox_event.clear()
+
+                packet = self._set_packet(name, value)
+                try:
+                    await self._send_packet(packet)
+                except Exception:
+                    # Anything that goes wrong sending can't lose the value
+                    self._requeue(name, value)
+                    self._outbox_event.set()
+                    # Gives the connection time to reconnect before trying again
+                    await asyncio.sleep(1)
+                    if self._closed:
+                        return
+                    continue
+
+                self._after_set(packet, value)
+        finally:
+            self._flusher = None
+
+    async def create_cloud_variable(self, name, initial_value=0):
+        self._check_value(initial_value)
+
+        packet = {
+            "method": "create",
+            "name": _cloud_name(name),
+            "value": str(initial_value),
+            "user": self._client.username,
+            "project_id": str(self.project_id),
+        }
+        await self.rate_limiter.acquire_async()
+        await self._send_packet(packet)
+        self.emit("outgoing", packet)
+
+        new_variable = CloudVariable(_cloud_name(name), str(initial_value))
+        self._cloudvariables.append(new_variable)
+        self.emit("create", new_variable)
+        self.emit("change", new_variable)
 
     async def delete_cloud_variable(self, name):
-        if time.time() - self._timer > 0.1:
-            packet = {
-                "method": "delete",
-                "name": (f"☁ {name}" if not name.startswith("☁ ") else name),
-                "user": self._client.username,
-                "project_id": str(self.project_id),
-            }
-            await self._send_packet(packet)
-            self.emit("outgoing", packet)
-            self._timer = time.time()
-
-            self.emit("delete", name)
+        packet = {
+            "method": "delete",
+            "name": _cloud_name(name),
+            "user": self._client.username,
+            "project_id": str(self.project_id),
+        }
+        await self.rate_limiter.acquire_async()
+        await self._send_packet(packet)
+        self.emit("outgoing", packet)
+
+        self._cloudvariables.remove(name)
+        # Handlers get the name the way it was given, with or without the emoji
+        self.emit("delete", name)
+
+    async def updates(self, filter=None, maxsize=100):
+        stream = _UpdateStream(filter, asyncio.Queue(maxsize))
+        stream.drained = asyncio.Event()
+        stream.drained.set()
+        self._streams.append(stream)
+        try:
+            while True:
+                update = await stream.queue.get()
+                # Getting an update made room for one that's being held back,
+                # which also lets the end of the updates through after a full queue
+                if stream.overflow:
+                    stream.queue.put_nowait(stream.overflow.pop(0))
+                if not stream.overflow:
+                    stream.drained.set()
+
+                if update is None:
+                    return
+
+                yield update
+        finally:
+            # Also runs when the generator is thrown away, so the loop stops waiting for it
+            self._streams.remove(stream)
+            stream.drained.set()
+
+    def _put_update(self, stream, update):
+        if stream.overflow or stream.queue.full():
+            stream.overflow.append(update)
+            stream.drained.clear()
         else:
-            await asyncio.sleep(time.time() - self._timer)
-            await self.delete_cloud_variable(name)
+            stream.queue.put_nowait(update)
 
-    async def cloud_variable_loop(self):
+    async def _wait_for_streams(self):
+        # Stops reading from the server until every iterator has room for its updates
+        for stream in self._streams[:]:
+            await stream.drained.wait()
+
+    async def close(self):
+        self._closed = True
+        await self._ws.close()
+
+    async def _keepalive_loop(self):
         while True:
-            if self._ws.connected:
-                response = await self._ws.recv()
-                response = json.loads(response)
+            await asyncio.sleep(self.ping_interval)
+            if not self._ws.connected:
+                continue
 
-                if response["method"] != "set":
-                    continue
+            data = self._next_ping()
+            if data is None:
+                self._ws.shutdown()
+                continue
 
-                try:
-                    cloud = next(
-                        variable
-                        for variable in self._cloudvariables
-                        if response["name"] == variable.name
-                    )
-                    cloud.value = response["value"]
-                except StopIteration:
-                    # A new variable was created and was set
-                    cloud = CloudVariable(response["name"], response["value"])
-                    self._cloudvariables.append(cloud)
-                    self.emit("create", cloud)
+            try:
+                await self._ws.ping(data)
+            except (WebsocketException, OSError):
+                pass
 
-                self.emit("set", cloud)
-                self.emit("change", cloud)
-            else:
-                await self.connect()
+    async def cloud_variable_loop(self):
+        while True:
+            if not self._ws.connected:
+                if self._closed or not await self.reconnect():
+                    self._close_streams()
+                    break
+                continue
+
+            try:
+                message = await self._ws.recv()
+            except (WebsocketException, OSError):
+                continue
+
+            self._handle_message(message)
+            await self._wait_for_streams()
@@ -0,0 +1,138 @@
+"""
+Keeps a limited history of the values of each cloud variable, for graphing and such
+Each variable gets ring buffers of timestamps, values, and sources that never grow past their capacity
+Values are stored as floats, so values that aren't numbers are stored as NaN
+"""
+
+import array
+import math
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Where a value came from
+SERVER = 0
+SELF = 1
+
+
+class RingBuffer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._timestamps = array.array("d", bytes(8 * capacity))
+        self._values = array.array("d", bytes(8 * capacity))
+        self._sources = array.array("b", bytes(capacity))
+        # The position of the oldest entry
+        self._start = 0
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return (self[index] for index in range(self._length))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("RingBuffer index out of range")
+
+        position = (self._start + index) % self.capacity
+        return (
+            self._timestamps[position],
+            self._values[position],
+            self._sources[position],
+        )
+
+    def append(self, timestamp, value, source=SERVER):
+        if self._length < self.capacity:
+            position = (self._start + self._length) % self.capacity
+            self._length += 1
+        else:
+            # Overwrites the oldest entry
+            position = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._timestamps[position] = timestamp
+        self._values[position] = value
+        self._sources[position] = source
+
+    def _first_after(self, timestamp):
+        # Binary search, since timestamps only go up
+        low, high = 0, self._length
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamps[(self._start + middle) % self.capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def last(self, count):
+        return [
+            self[index] for index in range(max(0, self._length - count), self._length)
+        ]
+
+    def window(self, seconds, now=None):
+        # The entries from the last few seconds
+        now = time.monotonic() if now is None else now
+        start = self._first_after(now - seconds)
+        return [self[index] for index in range(start, self._length)]
+
+    def rate(self, seconds, now=None):
+        # How much the value changed per second over the last few seconds
+        entries = self.window(seconds, now)
+        if len(entries) < 2 or entries[-1][0] == entries[0][0]:
+            return 0
+
+        return (entries[-1][1] - entries[0][1]) / (entries[-1][0] - entries[0][0])
+
+    def frequency(self, seconds, now=None):
+        # How many times the value was set per second over the last few seconds
+        now = time.monotonic() if now is None else now
+        return (self._length - self._first_after(now - seconds)) / seconds
+
+    def to_numpy(self):
+        # Returns arrays of the timestamps, values, and sources, from oldest to newest
+        if not numpy:
+            raise ImportError("NumPy needs to be installed to do this")
+
+        order = (numpy.arange(self._length) + self._start) % self.capacity
+        return (
+            numpy.frombuffer(self._timestamps, dtype=numpy.float64)[order],
+            numpy.frombuffer(self._values, dtype=numpy.float64)[order],
+            numpy.frombuffer(self._sources, dtype=numpy.int8)[order],
+        )
+
+
+class CloudHistory:
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self._buffers = {}
+
+    def __contains__(self, name):
+        return name in self._buffers
+
+    def __getitem__(self, name):
+        return self._buffers[name]
+
+    def __iter__(self):
+        return iter(self._buffers)
+
+    def record(self, name, value, source=SERVER, timestamp=None):
+        try:
+            value = float(value)
+        except (TypeError, ValueError, OverflowError):
+            value = math.nan
+
+        buffer = self._buffers.get(name)
+        if buffer is None:
+            buffer = self._buffers[name] = RingBuffer(self.capacity)
+
+        buffer.append(
+            time.monotonic() if timestamp is None else timestamp, value, source
+        )
@@ -0,0 +1,149 @@
+"""
+Measures how many sets per second cloud connections can handle, using a local CloudServer
+Every simulated client sets its own variable, and one more connection watches all of them
+so the time between sending a set and it arriving can be measured
+"""
+
+import asyncio
+import threading
+import time
+
+from .CloudConnection import CloudConnection, AsyncCloudConnection
+from .CloudServer import CloudServer
+from .LatencyHistogram import LatencyHistogram
+from .RateLimiter import RateLimiter
+
+
+class _LoadTestClient:
+    # Stands in for a ScratchSession
+    logged_in = False
+    session_id = None
+
+    def __init__(self, username):
+        self.username = username
+
+
+class _Results:
+    def __init__(self, total):
+        self.total = total
+        self.received = 0
+        self.sent = {}
+        self.latency = LatencyHistogram(total)
+
+    def on_set(self, variable):
+        started = self.sent.pop((variable.name, variable.value), None)
+        if started is not None:
+            self.latency.add(time.monotonic() - started)
+            self.received += 1
+
+    def summary(self, seconds):
+        return {
+            "sets": self.total,
+            "received": self.received,
+            "seconds": seconds,
+            "throughput": self.received / seconds,
+            "latency": self.latency.stats(),
+        }
+
+
+def _wait_for(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def run_sync(url, clients=10, sets=100, rate=1000, timeout=30):
+    results = _Results(clients * sets)
+    watcher = CloudConnection(0, _LoadTestClient("watcher"), url, ping_interval=None)
+    watcher.on("set", results.on_set)
+    connections = [
+        CloudConnection(
+            0,
+            _LoadTestClient(f"client{index}"),
+            url,
+            rate_limiter=RateLimiter(rate),
+            ping_interval=None,
+        )
+        for index in range(clients)
+    ]
+
+    def send(index, connection):
+        for number in range(sets):
+            results.sent[(f"☁ client{index}", str(number))] = time.monotonic()
+            connection.set_cloud_variable(f"client{index}", number)
+
+    threads = [
+        threading.Thread(target=send, args=(index, connection))
+        for index, connection in enumerate(connections)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    _wait_for(lambda: results.received == results.total, timeout)
+    seconds = time.monotonic() - started
+
+    for connection in connections + [watcher]:
+        connection.close()
+
+    return results.summary(seconds)
+
+
+async def run_async(url, clients=10, sets=100, rate=1000, timeout=30):
+    results = _Results(clients * sets)
+    connected = asyncio.Semaphore(0)
+
+    def create_connection(username, rate_limiter=None):
+        connection = AsyncCloudConnection(
+            0,
+            _LoadTestClient(username),
+            url,
+            rate_limiter=rate_limiter,
+            ping_interval=None,
+        )
+        connection.on("connect", connected.release)
+        asyncio.create_task(connection.connect())
+        return connection
+
+    watcher = create_connection("watcher")
+    watcher.on("set", results.on_set)
+    connections = [
+        create_connection(f"client{index}", RateLimiter(rate))
+        for index in range(clients)
+    ]
+    for _ in range(clients + 1):
+        await connected.acquire()
+
+    async def send(index, connection):
+        for number in range(sets):
+            results.sent[(f"☁ client{index}", str(number))] = time.monotonic()
+            await connection.set_cloud_variable(f"client{index}", number)
+
+    started = time.monotonic()
+    await asyncio.gather(
+        *(send(index, connection) for index, connection in enumerate(connections))
+    )
+
+    deadline = time.monotonic() + timeout
+    while results.received < results.total and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    seconds = time.monotonic() - started
+
+    for connection in connections + [watcher]:
+        await connection.close()
+
+    return results.summary(seconds)
+
+
+def benchmark(clients=10, sets=100, rate=1000):
+    # Runs both kinds of connection against a local server, and returns their results
+    server = CloudServer().run_in_thread()
+    results = {
+        "sync": run_sync(server.url, clients, sets, rate),
+        "async": asyncio.run(run_async(server.url, clients, sets, rate)),
+    }
+    server.stop_thread()
+
+    return results
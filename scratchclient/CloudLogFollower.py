@@ -0,0 +1,146 @@
+"""
+Follows a project's cloud logs without downloading the whole history every time
+The logs are newest first, so pages are fetched until one has an entry that has already been seen
+"""
+
+import asyncio
+import json
+import os
+import time
+
+PAGE_SIZE = 40
+
+
+def _log_key(log):
+    # Logs don't have IDs, so everything about them is used instead
+    return (log["timestamp"], log["user"], log["verb"], log["name"], log.get("value"))
+
+
+class _Poll:
+    def __init__(self, first):
+        self.first = first
+        self.offset = 0
+        self.logs = []
+        self.keys = set()
+
+
+class CloudLogFollower:
+    def __init__(self, project, cursor_file=None, interval=10, backfill=False):
+        self.project = project
+        self.cursor_file = cursor_file
+        self.interval = interval
+        self.backfill = backfill
+        self.requests_made = 0
+
+        # The newest timestamp seen, and the logs with that timestamp,
+        # since several logs can have the same timestamp
+        self.timestamp = None
+        self._seen = set()
+
+        if cursor_file and os.path.exists(cursor_file):
+            self.load()
+
+    def _is_known(self, log):
+        return self.timestamp is not None and (
+            log["timestamp"] < self.timestamp
+            or (log["timestamp"] == self.timestamp and _log_key(log) in self._seen)
+        )
+
+    def poll(self):
+        # Returns the logs that haven't been seen before, oldest first
+        poll = _Poll(self.timestamp is None)
+        while True:
+            page = self.project.get_cloud_logs(limit=PAGE_SIZE, offset=poll.offset)
+            self.requests_made += 1
+            if not self._add_page(poll, page):
+                break
+
+        return self._finish_poll(poll)
+
+    def _add_page(self, poll, page):
+        # Returns whether the next page is needed
+        for log in page:
+            if self._is_known(log):
+                return False
+
+            # Logs that were added while paging push older ones onto the next page
+            key = _log_key(log)
+            if key not in poll.keys:
+                poll.keys.add(key)
+                poll.logs.append(log)
+
+        if len(page) < PAGE_SIZE or (poll.first and not self.backfill):
+            return False
+
+        poll.offset += PAGE_SIZE
+        return True
+
+    def _finish_poll(self, poll):
+        logs = poll.logs
+        if logs:
+            newest = max(log["timestamp"] for log in logs)
+            if newest != self.timestamp:
+                self.timestamp = newest
+                self._seen = set()
+
+            self._seen.update(
+                _log_key(log) for log in logs if log["timestamp"] == newest
+            )
+            if self.cursor_file:
+                self.save()
+
+        if poll.first and not self.backfill:
+            return []
+
+        return logs[::-1]
+
+    def follow(self):
+        # Yields new logs forever, checking every interval seconds
+        while True:
+            yield from self.poll()
+            time.sleep(self.interval)
+
+    def __iter__(self):
+        return self.follow()
+
+    def save(self):
+        cursor = {
+            "timestamp": self.timestamp,
+            "seen": [list(key) for key in self._seen],
+        }
+        # Written to another file first so a crash can't leave half a cursor
+        temporary_file = f"{self.cursor_file}.tmp"
+        with open(temporary_file, "w") as file:
+            json.dump(cursor, file)
+        os.replace(temporary_file, self.cursor_file)
+
+    def load(self):
+        with open(self.cursor_file) as file:
+            cursor = json.load(file)
+
+        self.timestamp = cursor["timestamp"]
+        self._seen = {tuple(key) for key in cursor["seen"]}
+
+
+class AsyncCloudLogFollower(CloudLogFollower):
+    # The same as CloudLogFollower, but for an AsyncProject
+    async def poll(self):
+        poll = _Poll(self.timestamp is None)
+        while True:
+            page = await self.project.get_cloud_logs(
+                limit=PAGE_SIZE, offset=poll.offset
+            )
+            self.requests_made += 1
+            if not self._add_page(poll, page):
+                break
+
+        return self._finish_poll(poll)
+
+    async def follow(self):
+        while True:
+            for log in await self.poll():
+                yield log
+            await asyncio.sleep(self.interval)
+
+    def __aiter__(self):
+        return self.follow()
@@ -0,0 +1,171 @@
+"""
+Lets Scratch projects call Python functions through cloud variables
+
+A request is set on the request variable:
+1 | request ID (4 digits) | client ID (4 digits) | [method name, *arguments] encoded with CloudCodec.encode
+Responses are set on one of the response variables:
+1 | request ID (4 digits) | client ID (4 digits) | status (1 digit) | result encoded with CloudCodec.encode
+"""
+
+import asyncio
+import collections
+
+from .CloudConnection import _cloud_name
+
+OK = "1"
+ERROR = "2"
+TIMEOUT = "3"
+BUSY = "4"
+UNKNOWN_METHOD = "5"
+
+# Cloud variables can't be longer than this, and a response has 10 digits before its result
+MAX_LENGTH = 256
+HEADER_LENGTH = 10
+
+
+class CloudRPCServer:
+    def __init__(
+        self,
+        connection,
+        request_variable="Request",
+        response_variables=("Response",),
+        workers=4,
+        timeout=5,
+        max_pending_per_client=8,
+    ):
+        self.connection = connection
+        self.request_variable = _cloud_name(request_variable)
+        self.response_variables = [
+            _cloud_name(variable) for variable in response_variables
+        ]
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending_per_client = max_pending_per_client
+
+        self.requests_handled = 0
+        self.requests_failed = 0
+        self.requests_timed_out = 0
+        self.requests_rejected = 0
+        self.responses_failed = 0
+
+        self._methods = {}
+        # Pending requests for each client, in the order the clients showed up
+        self._clients = collections.OrderedDict()
+        self._tasks = []
+        self._running = False
+
+        connection.on("set", self._on_set)
+
+    def method(self, name, callback=None):
+        # Registers a coroutine that gets called with (client_id, *arguments)
+        def add_method(handler):
+            self._methods[name] = handler
+            return handler
+
+        if callback:
+            add_method(callback)
+            return
+
+        return add_method
+
+    def start(self):
+        # Must be called while the event loop is running, like in a "connect" handler
+        if self._running:
+            return
+
+        self._running = True
+        self._pending = asyncio.Semaphore(0)
+        self._responses = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._send_responses()))
+
+    def stop(self):
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+
+        self._tasks = []
+        self._clients.clear()
+
+    @property
+    def pending(self):
+        return sum(len(requests) for requests in self._clients.values())
+
+    def _on_set(self, variable):
+        if not self._running or variable.name != self.request_variable:
+            return
+
+        value = str(variable.value)
+        if len(value) < 10 or value[0] != "1":
+            return
+
+        request_id, client_id = value[1:5], value[5:9]
+        requests = self._clients.setdefault(client_id, collections.deque())
+        if len(requests) >= self.max_pending_per_client:
+            self.requests_rejected += 1
+            self._respond(request_id, client_id, BUSY)
+            return
+
+        requests.append((request_id, value[9:]))
+        self._pending.release()
+
+    def _next_request(self):
+        # Takes turns between clients so one busy client can't starve the rest
+        client_id, requests = self._clients.popitem(last=False)
+        request_id, data = requests.popleft()
+        if requests:
+            self._clients[client_id] = requests
+
+        return client_id, request_id, data
+
+    async def _worker(self):
+        while True:
+            await self._pending.acquire()
+            client_id, request_id, data = self._next_request()
+
+            try:
+                method, *arguments = self.connection.codec.decode(data)
+                handler = self._methods[method]
+            except Exception:
+                self.requests_failed += 1
+                self._respond(request_id, client_id, UNKNOWN_METHOD)
+                continue
+
+            try:
+                result = await asyncio.wait_for(
+                    handler(client_id, *arguments), self.timeout
+                )
+                result = self.connection.codec.encode(result)
+                if HEADER_LENGTH + len(result) > MAX_LENGTH:
+                    raise ValueError("The result is too long for a cloud variable")
+            except asyncio.TimeoutError:
+                self.requests_timed_out += 1
+                self._respond(request_id, client_id, TIMEOUT)
+            except Exception:
+                self.requests_failed += 1
+                self._respond(request_id, client_id, ERROR)
+            else:
+                self.requests_handled += 1
+                self._respond(request_id, client_id, OK, result)
+
+    def _respond(self, request_id, client_id, status, data=""):
+        self._responses.put_nowait(f"1{request_id}{client_id}{status}{data}")
+
+    async def _send_responses(self):
+        while True:
+            responses = [await self._responses.get()]
+
+            # Responses that finished while waiting go out in the same frame
+            while len(responses) < len(self.response_variables):
+                try:
+                    responses.append(self._responses.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await self.connection.set_cloud_variables(
+                    dict(zip(self.response_variables, responses))
+                )
+            except Exception:
+                # Like when the connection dropped, which shouldn't stop later responses
+                self.responses_failed += len(responses)
@@ -0,0 +1,188 @@
+"""
+A small cloud data server that runs locally, for testing bots and measuring how fast they are
+It speaks the same handshake/set/create/delete protocol as clouddata.scratch.mit.edu
+but doesn't check who's connecting or what values are set
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import re
+import struct
+import threading
+
+from .Websocket import GUID, Frame, Opcode, xor_mask
+
+
+class CloudServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        # Port 0 picks a free port when the server starts
+        self.port = port
+        # The variables of each project, as {project ID: {name: value}}
+        self.projects = {}
+        self.packets_received = 0
+
+        self._clients = {}
+        self._server = None
+        self._loop = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self._server.close()
+        for writers in self._clients.values():
+            for writer in list(writers):
+                writer.close()
+
+        await self._server.wait_closed()
+
+    def run_in_thread(self):
+        # Runs the server on its own event loop, so it can be used from sync code
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+        return self
+
+    def stop_thread(self):
+        asyncio.run_coroutine_threadsafe(self.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    async def _handshake(self, reader, writer):
+        request = (await reader.readuntil(b"\r\n\r\n")).decode("utf-8")
+        key = re.search(r"(?i)sec-websocket-key: *(.+?)\r\n", request)
+        if not key:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            return False
+
+        accept = base64.b64encode(
+            hashlib.sha1((key.group(1) + GUID).encode("utf-8")).digest()
+        ).decode("utf-8")
+
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode("utf-8")
+        )
+        return True
+
+    async def _read_message(self, reader, writer):
+        # Returns the next text message, answering pings on the way
+        fragments = []
+        while True:
+            header = await reader.readexactly(2)
+            opcode, fin = header[0] & 0xF, header[0] >> 7
+            length = header[1] & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", await reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", await reader.readexactly(8))[0]
+
+            mask = await reader.readexactly(4) if header[1] >> 7 else None
+            data = await reader.readexactly(length)
+            if mask:
+                data = xor_mask(data, mask)
+
+            if opcode == Opcode.CLOSE:
+                writer.write(Frame.encode(data[:2], Opcode.CLOSE, masked=0))
+                return None
+            elif opcode == Opcode.PING:
+                writer.write(Frame.encode(data, Opcode.PONG, masked=0))
+                continue
+            elif opcode == Opcode.PONG:
+                continue
+
+            fragments.append(data)
+            if fin:
+                return b"".join(fragments).decode("utf-8")
+
+    def _broadcast(self, project_id, sender, packet):
+        frame = Frame.encode(json.dumps(packet), masked=0)
+        for writer in self._clients.get(project_id, ()):
+            if writer is not sender:
+                writer.write(frame)
+
+    def _handle_packet(self, writer, project_id, packet):
+        self.packets_received += 1
+        method = packet.get("method")
+
+        if method == "handshake":
+            project_id = packet["project_id"]
+            self._clients.setdefault(project_id, set()).add(writer)
+            variables = self.projects.setdefault(project_id, {})
+            writer.write(
+                Frame.encode(
+                    "\n".join(
+                        json.dumps({"method": "set", "name": name, "value": value})
+                        for name, value in variables.items()
+                    ),
+                    masked=0,
+                )
+            )
+        elif project_id is None:
+            # Nothing else is allowed before the handshake
+            return project_id
+        elif method in ("set", "create"):
+            self.projects[project_id][packet["name"]] = packet["value"]
+            self._broadcast(
+                project_id,
+                writer,
+                {"method": "set", "name": packet["name"], "value": packet["value"]},
+            )
+        elif method == "delete":
+            self.projects[project_id].pop(packet["name"], None)
+            self._broadcast(
+                project_id, writer, {"method": "delete", "name": packet["name"]}
+            )
+
+        return project_id
+
+    async def _handle_client(self, reader, writer):
+        project_id = None
+        try:
+            if not await self._handshake(reader, writer):
+                return
+
+            while True:
+                message = await self._read_message(reader, writer)
+                if message is None:
+                    break
+
+                for line in message.split("\n"):
+                    try:
+                        packet = json.loads(line)
+                    except json.decoder.JSONDecodeError:
+                        continue
+
+                    project_id = self._handle_packet(writer, project_id, packet)
+
+                await writer.drain()
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            ConnectionError,
+        ):
+            pass
+        finally:
+            if project_id is not None:
+                self._clients[project_id].discard(writer)
+            writer.close()
@@ -0,0 +1,127 @@
+"""
+Sends payloads that are too big for one cloud variable by splitting them into chunks
+
+Every chunk is one cloud variable value:
+1 | transfer ID (2 digits) | chunk number (4 digits) | chunk count (4 digits) | checksum (5 digits) | data
+The chunks are spread over several variables so that projects reading them have time to keep up
+"""
+
+import time
+import zlib
+
+from .EventEmitter import EventEmitter
+from .CloudConnection import _cloud_name
+
+HEADER_LENGTH = 16
+MAX_CHUNK_SIZE = 256 - HEADER_LENGTH
+
+
+def _checksum(data):
+    return f"{zlib.crc32(data.encode('ascii')) % 100000:05d}"
+
+
+class BaseCloudTransfer(EventEmitter):
+    def __init__(self, connection, variables, chunk_size=MAX_CHUNK_SIZE):
+        super().__init__()
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE}")
+
+        self.connection = connection
+        self.variables = [_cloud_name(variable) for variable in variables]
+        self.chunk_size = chunk_size
+
+        self.chunks_sent = 0
+        self.digits_sent = 0
+        self.seconds_sending = 0
+        self.chunks_received = 0
+        self.chunks_rejected = 0
+
+        self._transfer_id = 0
+        # Chunks of transfers that haven't been fully received, by transfer ID
+        self._incoming = {}
+        self._variable_set = set(self.variables)
+        connection.on("set", self._on_set)
+
+    @property
+    def throughput(self):
+        # Digits sent per second
+        return self.digits_sent / self.seconds_sending if self.seconds_sending else 0
+
+    def _chunks(self, payload):
+        digits = self.connection.codec.encode(payload)
+        count = -(-len(digits) // self.chunk_size)
+        if count > 9999:
+            raise ValueError("Payload is too big to send")
+
+        self._transfer_id = self._transfer_id % 99 + 1
+        chunks = []
+        for index in range(count):
+            data = digits[index * self.chunk_size : (index + 1) * self.chunk_size]
+            chunks.append(
+                f"1{self._transfer_id:02d}{index:04d}{count:04d}{_checksum(data)}{data}"
+            )
+
+        return chunks
+
+    def _batches(self, chunks):
+        # Sends one chunk to each variable at a time
+        for start in range(0, len(chunks), len(self.variables)):
+            yield dict(zip(self.variables, chunks[start : start + len(self.variables)]))
+
+    def _record_sent(self, chunks, started):
+        self.chunks_sent += len(chunks)
+        self.digits_sent += sum(len(chunk) for chunk in chunks)
+        self.seconds_sending += time.monotonic() - started
+
+    def _on_set(self, variable):
+        if variable.name not in self._variable_set:
+            return
+
+        value = str(variable.value)
+        if len(value) <= HEADER_LENGTH or value[0] != "1":
+            return
+
+        transfer_id = value[1:3]
+        index, count = int(value[3:7]), int(value[7:11])
+        checksum, data = value[11:16], value[16:]
+        if index >= count or checksum != _checksum(data):
+            self.chunks_rejected += 1
+            self.emit("reject", transfer_id, index)
+            return
+
+        self.chunks_received += 1
+        incoming = self._incoming.get(transfer_id)
+        if not incoming or len(incoming[0]) != count:
+            # A transfer ID is reused after 99 transfers
+            incoming = self._incoming[transfer_id] = [[None] * count, count]
+
+        chunks = incoming[0]
+        if chunks[index] is None:
+            incoming[1] -= 1
+        chunks[index] = data
+
+        if incoming[1]:
+            return
+
+        del self._incoming[transfer_id]
+        self.emit("receive", self.connection.codec.decode("".join(chunks)))
+
+
+class CloudTransfer(BaseCloudTransfer):
+    def send(self, payload):
+        chunks = self._chunks(payload)
+        started = time.monotonic()
+        for batch in self._batches(chunks):
+            self.connection.set_cloud_variables(batch)
+
+        self._record_sent(chunks, started)
+
+
+class AsyncCloudTransfer(BaseCloudTransfer):
+    async def send(self, payload):
+        chunks = self._chunks(payload)
+        started = time.monotonic()
+        for batch in self._batches(chunks):
+            await self.connection.set_cloud_variables(batch)
+
+        self._record_sent(chunks, started)
@@ -1,7 +1,12 @@
-import requests
+import json
 
 from .ScratchExceptions import *
-from .util import get_data_list
+from .util import (
+    get_data_list,
+    async_get_data_list,
+    iter_data_list,
+    async_iter_data_list,
+)
 
 
 class ProjectComment:
@@ -29,7 +34,7 @@ class ProjectComment:
         if self._client.username != self.project.author.username:
             raise UnauthorizedException("You are not allowed to do that")
 
-        requests.delete(
+        self._client.transport.delete(
             f"https://api.scratch.mit.edu/proxy/comments/project/{self.project.id}/comment/{self.id}",
             headers=self.project._headers,
         )
@@ -37,7 +42,7 @@ class ProjectComment:
     def report(self):
         self._client._ensure_logged_in()
 
-        requests.post(
+        self._client.transport.post(
             f"https://api.scratch.mit.edu/proxy/comments/project/{self.project.id}/comment/{self.id}",
             headers=self.project._headers,
         )
@@ -50,13 +55,24 @@ class ProjectComment:
 
         return self.project.post_comment(content, self.id, self.author_id)
 
-    def get_replies(self):
+    def get_replies(self, all=False, limit=20, offset=0):
         return get_data_list(
             all,
             limit,
             offset,
-            f"https://api.scratch.mit.edu/projects/{self.project_id}/comments/{self.id}/replies",
+            f"https://api.scratch.mit.edu/projects/{self.project.id}/comments/{self.id}/replies",
+            lambda reply: ProjectComment(self.project, reply, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_replies(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/projects/{self.project.id}/comments/{self.id}/replies",
             lambda reply: ProjectComment(self.project, reply, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
 
@@ -82,7 +98,7 @@ class StudioComment:
     def delete(self):
         self._client._ensure_logged_in()
 
-        response = requests.delete(
+        response = self._client.transport.delete(
             f"https://api.scratch.mit.edu/proxy/comments/studio/{self.studio.id}/comment/{self.id}",
             headers=self.project._headers,
         )
@@ -93,7 +109,7 @@ class StudioComment:
     def report(self):
         self._client._ensure_logged_in()
 
-        requests.post(
+        self._client.transport.post(
             f"https://api.scratch.mit.edu/proxy/comments/studio/{self.studio.id}/comment/{self.id}",
             headers=self.project._headers,
         )
@@ -111,8 +127,19 @@ class StudioComment:
             all,
             limit,
             offset,
-            f"https://api.scratch.mit.edu/studios/{self.studio_id}/comments/{self.id}/replies",
+            f"https://api.scratch.mit.edu/studios/{self.studio.id}/comments/{self.id}/replies",
             lambda reply: StudioComment(self.studio, reply, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_replies(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.studio.id}/comments/{self.id}/replies",
+            lambda reply: StudioComment(self.studio, reply, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
 
@@ -142,7 +169,7 @@ class ProfileComment:
             "id": comment_id,
         }
 
-        response = requests.post(
+        response = client.transport.post(
             f"https://scratch.mit.edu/site-api/comments/user/{user}/{action}/",
             headers=client._headers,
             data=json.dumps(data),
@@ -166,3 +193,131 @@ class ProfileComment:
         self._client.get_user(self.user).post_comment(
             content, self.id, self.author_id
         )
+
+
+class AsyncProjectComment(ProjectComment):
+    async def delete(self):
+        self._client._ensure_logged_in()
+
+        if self._client.username != self.project.author.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        await self._client.transport.delete(
+            f"https://api.scratch.mit.edu/proxy/comments/project/{self.project.id}/comment/{self.id}",
+            headers=self.project._headers,
+        )
+
+    async def report(self):
+        self._client._ensure_logged_in()
+
+        await self._client.transport.post(
+            f"https://api.scratch.mit.edu/proxy/comments/project/{self.project.id}/comment/{self.id}",
+            headers=self.project._headers,
+        )
+
+    async def reply(self, content):
+        self._client._ensure_logged_in()
+
+        if not self.project.comments_allowed:
+            raise UnauthorizedException("Comments are closed on this project")
+
+        return await self.project.post_comment(content, self.id, self.author_id)
+
+    async def get_replies(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/projects/{self.project.id}/comments/{self.id}/replies",
+            lambda reply: AsyncProjectComment(self.project, reply, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_replies(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/projects/{self.project.id}/comments/{self.id}/replies",
+            lambda reply: AsyncProjectComment(self.project, reply, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+
+class AsyncStudioComment(StudioComment):
+    async def delete(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.delete(
+            f"https://api.scratch.mit.edu/proxy/comments/studio/{self.studio.id}/comment/{self.id}",
+            headers=self.studio._headers,
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do that")
+
+    async def report(self):
+        self._client._ensure_logged_in()
+
+        await self._client.transport.post(
+            f"https://api.scratch.mit.edu/proxy/comments/studio/{self.studio.id}/comment/{self.id}",
+            headers=self.studio._headers,
+        )
+
+    async def reply(self, content):
+        self._client._ensure_logged_in()
+
+        if not self.studio.comments_allowed:
+            raise UnauthorizedException("Comments are closed on this studio")
+
+        return await self.studio.post_comment(content, self.id, self.author_id)
+
+    async def get_replies(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/studios/{self.studio.id}/comments/{self.id}/replies",
+            lambda reply: AsyncStudioComment(self.studio, reply, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_replies(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.studio.id}/comments/{self.id}/replies",
+            lambda reply: AsyncStudioComment(self.studio, reply, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+
+class AsyncProfileComment(ProfileComment):
+    async def _comment_action(self, action, comment_id, user, client):
+        client._ensure_logged_in()
+
+        data = {
+            "id": comment_id,
+        }
+
+        response = await client.transport.post(
+            f"https://scratch.mit.edu/site-api/comments/user/{user}/{action}/",
+            headers=client._headers,
+            data=json.dumps(data),
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do that")
+
+    async def delete(self):
+        await self._comment_action("del", self.id, self.user, self._client)
+
+    async def report(self):
+        await self._comment_action("rep", self.id, self.user, self._client)
+
+    async def reply(self, content):
+        self._client._ensure_logged_in()
+
+        user = await self._client.get_user(self.user)
+        await user.post_comment(content, self.id, self.author_id)
@@ -0,0 +1,264 @@
+import asyncio
+import threading
+import queue
+import traceback
+import concurrent.futures
+
+INLINE = "inline"
+THREAD = "thread"
+QUEUE = "queue"
+
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+# Handlers for this key get every event, with the event's key as the first argument
+WILDCARD = "*"
+
+
+class EventEmitter:
+    """
+    Coroutine handlers are always run as tasks on the running event loop
+    The dispatch policy decides where normal handlers are run:
+    - inline: right away, on the thread that emitted the event
+    - thread: on a thread pool, so slow handlers don't hold up the emitter
+    - queue: in order, on one thread for each event, with a limited number of events waiting
+
+    The handlers for each key are kept in a tuple that's replaced, never changed,
+    so emit can loop over it without copying or locking
+    """
+
+    def __init__(self):
+        # Tuples of (handler, once, is_coroutine) for each key
+        self._events = {}
+
+        self.dispatch = INLINE
+        self.overflow = DROP_OLDEST
+        self.queue_size = 1000
+        self.events_queued = 0
+        self.events_dropped = 0
+        self.events_dispatched = 0
+
+        self._executor = None
+        self._queues = {}
+        self._tasks = set()
+        # The event loop that coroutine error handlers run on when the error
+        # happened on another thread
+        self._loop = None
+        self._dispatch_lock = threading.Lock()
+        self._handlers_lock = threading.Lock()
+
+    def set_dispatch(
+        self, dispatch, max_workers=None, queue_size=1000, overflow=DROP_OLDEST
+    ):
+        if dispatch not in (INLINE, THREAD, QUEUE):
+            raise ValueError(f"'{dispatch}' is not a dispatch policy")
+
+        if overflow not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f"'{overflow}' is not an overflow policy")
+
+        self.dispatch = dispatch
+        self.overflow = overflow
+        # Only applies to events that haven't been queued before
+        self.queue_size = queue_size
+
+        if dispatch == THREAD and not self._executor:
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+
+    def on(self, key, callback=None, once=False):
+        def add_handler(handler):
+            entry = (handler, once, asyncio.iscoroutinefunction(handler))
+            if entry[2]:
+                self._remember_loop()
+
+            with self._handlers_lock:
+                self._events[key] = self._events.get(key, ()) + (entry,)
+
+            return handler
+
+        if callback:
+            add_handler(callback)
+            return
+
+        return add_handler
+
+    def off(self, key, callback):
+        with self._handlers_lock:
+            self._remove(key, lambda entry: entry[0] is callback)
+
+    def once(self, key, callback=None):
+        return self.on(key, callback, True)
+
+    def _remove(self, key, matches):
+        # Returns whether anything was removed; the lock has to be held
+        handlers = self._events.get(key, ())
+        remaining = tuple(entry for entry in handlers if not matches(entry))
+        if remaining:
+            self._events[key] = remaining
+        else:
+            self._events.pop(key, None)
+
+        return len(remaining) != len(handlers)
+
+    def _claim_once(self, key, entry):
+        # Only the first emit to claim a once handler gets to call it
+        with self._handlers_lock:
+            return self._remove(key, lambda other: other is entry)
+
+    def emit(self, key, *args, **kwargs):
+        events = self._events
+        handlers = events.get(key, ())
+        wildcards = events.get(WILDCARD, ())
+        if not handlers and not wildcards:
+            return
+
+        inline = self.dispatch == INLINE
+        calls = []
+        for entry in handlers:
+            handler, once, is_coroutine = entry
+            if once and not self._claim_once(key, entry):
+                continue
+
+            if is_coroutine:
+                self._start_task(handler(*args, **kwargs))
+            elif inline:
+                handler(*args, **kwargs)
+            else:
+                calls.append((handler, args))
+
+        for entry in wildcards:
+            handler, once, is_coroutine = entry
+            if once and not self._claim_once(WILDCARD, entry):
+                continue
+
+            if is_coroutine:
+                self._start_task(handler(key, *args, **kwargs))
+            elif inline:
+                handler(key, *args, **kwargs)
+            else:
+                calls.append((handler, (key, *args)))
+
+        if inline:
+            # Not locked since that would cost more than the rest of emit
+            self.events_dispatched += 1
+            return
+
+        if not calls:
+            return
+
+        if not self._loop:
+            self._remember_loop()
+
+        if self.dispatch == THREAD:
+            self._count("events_queued")
+            self._executor.submit(self._run_handlers, calls, kwargs)
+        else:
+            self._enqueue(key, (calls, kwargs))
+
+    def listeners(self, event):
+        return [handler for handler, once, is_coroutine in self._events.get(event, ())]
+
+    def _count(self, counter):
+        with self._dispatch_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _remember_loop(self):
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+    def _start_task(self, coroutine, done=None):
+        # Keeping a reference stops the task from being garbage collected
+        task = asyncio.create_task(coroutine)
+        self._loop = task.get_loop()
+        self._tasks.add(task)
+        task.add_done_callback(done or self._task_done)
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            self._handle_error(task.exception())
+
+    def _error_task_done(self, task):
+        # Errors in error handlers are printed, since handling them could loop forever
+        # This is also used for futures from run_coroutine_threadsafe
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            err = task.exception()
+            traceback.print_exception(type(err), err, err.__traceback__)
+
+    def _run_handlers(self, calls, kwargs):
+        for handler, args in calls:
+            try:
+                handler(*args, **kwargs)
+            except Exception as err:
+                self._handle_error(err)
+
+        self._count("events_dispatched")
+
+    def _enqueue(self, key, event):
+        with self._dispatch_lock:
+            events = self._queues.get(key)
+            if not events:
+                events = self._queues[key] = queue.Queue(self.queue_size)
+                threading.Thread(
+                    target=self._queue_loop, args=(events,), daemon=True
+                ).start()
+
+        if self.overflow == BLOCK:
+            events.put(event)
+        else:
+            while True:
+                try:
+                    events.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        events.get_nowait()
+                        self._count("events_dropped")
+                    except queue.Empty:
+                        pass
+
+        self._count("events_queued")
+
+    def _queue_loop(self, events):
+        while True:
+            self._run_handlers(*events.get())
+
+    def _handle_error(self, err):
+        # Error handlers are called right away, wherever the error happened,
+        # and coroutine error handlers are run on the event loop
+        handlers = self._events.get("error", ())
+        if not handlers:
+            traceback.print_exception(type(err), err, err.__traceback__)
+
+        for entry in handlers:
+            handler, once, is_coroutine = entry
+            if once and not self._claim_once("error", entry):
+                continue
+
+            if is_coroutine:
+                self._start_error_task(handler(err), err)
+                continue
+
+            try:
+                handler(err)
+            except Exception:
+                traceback.print_exc()
+
+    def _start_error_task(self, coroutine, err):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            self._start_task(coroutine, self._error_task_done)
+            return
+
+        if self._loop and not self._loop.is_closed():
+            future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+            future.add_done_callback(self._error_task_done)
+        else:
+            # There's no event loop to run the handler on, so the error is printed instead
+            coroutine.close()
+            traceback.print_exception(type(err), err, err.__traceback__)
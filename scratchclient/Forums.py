@@ -1,4 +1,3 @@
-import requests
 import xml.etree.ElementTree
 
 from .ScratchExceptions import *
@@ -43,7 +42,7 @@ class ForumSession:
             "AddPostForm": "",
         }
 
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/discuss/{category_id}/topic/add",
             headers=headers,
             files=data,
@@ -57,7 +56,7 @@ class ForumSession:
             "referer": f"https://scratch.mit.edu/discuss/topic/{topic_id}/",
         }
 
-        response = requests.post(
+        response = self._client.transport.post(
             f"https://scratch.mit.edu/discuss/topic/{topic_id}/?",
             headers=headers,
             files={
@@ -83,7 +82,7 @@ class ForumSession:
             "body": content,
         }
 
-        response = requests.post(
+        response = self._client.transport.post(
             f"https://scratch.mit.edu/discuss/post/{post_id}/edit",
             headers=headers,
             data=data,
@@ -107,14 +106,14 @@ class ForumSession:
             "submit": "",
         }
 
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/discuss/misc/?action=report&post_id={post_id}",
             headers=headers,
             data=data,
         )
 
     def get_post_source(self, post_id):
-        return requests.get(
+        return self._client.transport.get(
             f"https://scratch.mit.edu/discuss/post/{post_id}/source/",
         ).text
 
@@ -126,7 +125,7 @@ class ForumSession:
             "referer": f"https://scratch.mit.edu/discuss/topic/{topic_id}/",
         }
 
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/discuss/subscription/topic/{topic_id}/add/",
             headers=headers,
         )
@@ -139,7 +138,7 @@ class ForumSession:
             "referer": f"https://scratch.mit.edu/discuss/topic/{topic_id}/",
         }
 
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/discuss/subscription/topic/{topic_id}/delete/",
             headers=headers,
         )
@@ -158,14 +157,14 @@ class ForumSession:
             "update": "",
         }
 
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/discuss/settings/{self._client.username}/",
             headers=headers,
             data=data,
         )
 
     def get_latest_topic_posts(self, topic_id):
-        rss_feed = requests.get(
+        rss_feed = self._client.transport.get(
             f"https://scratch.mit.edu/discuss/feeds/topic/{topic_id}/",
         ).text
         root = xml.etree.ElementTree.fromstring(rss_feed)
@@ -185,7 +184,7 @@ class ForumSession:
         ]
 
     def get_latest_category_posts(self, category_id):
-        rss_feed = requests.get(
+        rss_feed = self._client.transport.get(
             f"https://scratch.mit.edu/discuss/feeds/forum/{category_id}/",
         ).text
         root = xml.etree.ElementTree.fromstring(rss_feed)
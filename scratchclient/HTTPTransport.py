@@ -0,0 +1,424 @@
+import asyncio
+import http.cookiejar
+import json
+import re
+import threading
+import urllib.parse
+import zlib
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class HTTPTransport:
+    """
+    Sends every request made by a ScratchSession and the objects it creates
+    Connections are kept alive and reused, with a pool of them for each host,
+    so making lots of requests doesn't mean doing a TLS handshake for each one
+    """
+
+    def __init__(
+        self,
+        pool_connections=10,
+        pool_maxsize=10,
+        timeout=30,
+        max_retries=0,
+        headers=None,
+        cache=None,
+    ):
+        # Seconds to wait for the server, or a (connect, read) tuple
+        self.timeout = timeout
+        # A ResponseCache, or None to send every request
+        self.cache = cache
+        self.requests_made = 0
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        # Cookies are sent in the headers of each request, so they shouldn't be
+        # remembered between requests like a browser would
+        self.session.cookies.set_policy(
+            http.cookiejar.DefaultCookiePolicy(allowed_domains=[])
+        )
+
+        # The number of hosts to keep pools for, and the number of connections in each pool
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+
+    def request(self, method, url, cache=True, **kwargs):
+        # cache=False skips the cached response, but the new one is still cached
+        kwargs.setdefault("timeout", self.timeout)
+
+        if self.cache is None:
+            return self._send(method, url, **kwargs)
+
+        if method != "GET":
+            response = self._send(method, url, **kwargs)
+            self.cache.invalidate(url)
+            return response
+
+        key = self.cache.key(url, kwargs.get("headers"), kwargs.get("params"))
+        cached_response, conditional_headers = (
+            self.cache.lookup(key) if cache else (None, {})
+        )
+        if cached_response is not None:
+            return cached_response
+
+        headers = kwargs.get("headers")
+        if conditional_headers:
+            kwargs["headers"] = {**(headers or {}), **conditional_headers}
+
+        response = self._send(method, url, **kwargs)
+        cached_response = self.cache.update(key, url, response)
+        if cached_response is None and conditional_headers:
+            # The stale response was removed while it was being checked,
+            # so the 304 can't be used and the whole response is needed
+            kwargs["headers"] = headers
+            response = self._send(method, url, **kwargs)
+            cached_response = self.cache.update(key, url, response)
+
+        return response if cached_response is None else cached_response
+
+    def _send(self, method, url, **kwargs):
+        with self._lock:
+            self.requests_made += 1
+
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request("POST", url, data=data, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request("PUT", url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Response:
+    # The parts of requests.Response that get used, so code can handle either
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        charset = re.search(r"charset=([\w-]+)", self.headers.get("content-type", ""))
+        return self.content.decode(
+            charset.group(1) if charset else "utf-8", errors="replace"
+        )
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def _encode_body(data, files):
+    # Returns the body and its content type, the same way requests does
+    if files:
+        fields = {**(data or {})}
+        for name, file in files.items():
+            file_name, content, *content_type = file
+            if hasattr(content, "read"):
+                content = content.read()
+
+            fields[name] = (file_name, content, *content_type)
+
+        return urllib3.encode_multipart_formdata(fields)
+
+    if isinstance(data, dict):
+        return (
+            urllib.parse.urlencode(data).encode("utf-8"),
+            "application/x-www-form-urlencoded",
+        )
+
+    if isinstance(data, str):
+        return data.encode("utf-8"), None
+
+    return data, None
+
+
+class AsyncHTTPTransport:
+    """
+    The asyncio version of HTTPTransport, used by AsyncScratchSession
+    Idle connections are kept for each host and reused, and at most pool_maxsize
+    connections to a host are open at once, so other requests wait for one to be free
+    """
+
+    def __init__(
+        self, pool_maxsize=10, timeout=30, max_redirects=10, headers=None, cache=None
+    ):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.headers = CaseInsensitiveDict(
+            {
+                "User-Agent": requests.utils.default_user_agent(),
+                "Accept-Encoding": "gzip, deflate",
+                "Accept": "*/*",
+                **(headers or {}),
+            }
+        )
+        self.cache = cache
+        self.requests_made = 0
+        self.connections_opened = 0
+
+        # Idle (reader, writer) pairs and a semaphore for each (host, port, secure)
+        self._idle = {}
+        self._limits = {}
+
+    async def request(
+        self,
+        method,
+        url,
+        data=None,
+        headers=None,
+        params=None,
+        files=None,
+        timeout=None,
+        cache=True,
+    ):
+        if self.cache is None:
+            return await self._request(
+                method, url, data, headers, params, files, timeout
+            )
+
+        if method != "GET":
+            response = await self._request(
+                method, url, data, headers, params, files, timeout
+            )
+            self.cache.invalidate(url)
+            return response
+
+        key = self.cache.key(url, headers, params)
+        cached_response, conditional_headers = (
+            self.cache.lookup(key) if cache else (None, {})
+        )
+        if cached_response is not None:
+            return cached_response
+
+        response = await self._request(
+            method,
+            url,
+            data,
+            {**(headers or {}), **conditional_headers},
+            params,
+            files,
+            timeout,
+        )
+        cached_response = self.cache.update(key, url, response)
+        if cached_response is None and conditional_headers:
+            # The stale response was removed while it was being checked,
+            # so the 304 can't be used and the whole response is needed
+            response = await self._request(
+                method, url, data, headers, params, files, timeout
+            )
+            cached_response = self.cache.update(key, url, response)
+
+        return response if cached_response is None else cached_response
+
+    async def _request(self, method, url, data, headers, params, files, timeout):
+        request_headers = CaseInsensitiveDict(self.headers)
+        request_headers.update(headers or {})
+        # requests leaves out headers that are None, and so does this
+        for name in [name for name, value in request_headers.items() if value is None]:
+            del request_headers[name]
+
+        body, content_type = _encode_body(data, files)
+        if content_type and "Content-Type" not in request_headers:
+            request_headers["Content-Type"] = content_type
+
+        if params:
+            url += ("&" if "?" in url else "?") + urllib.parse.urlencode(params)
+
+        self.requests_made += 1
+        for _ in range(self.max_redirects + 1):
+            response = await asyncio.wait_for(
+                self._send(method, url, request_headers, body),
+                self.timeout if timeout is None else timeout,
+            )
+
+            location = response.headers.get("location")
+            if response.status_code not in REDIRECT_STATUSES or not location:
+                return response
+
+            url = urllib.parse.urljoin(url, location)
+            if response.status_code == 303 or (
+                response.status_code in (301, 302) and method == "POST"
+            ):
+                method, body = "GET", None
+                request_headers.pop("Content-Type", None)
+
+        raise requests.exceptions.TooManyRedirects(
+            f"Exceeded {self.max_redirects} redirects"
+        )
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, data=None, **kwargs):
+        return await self.request("POST", url, data=data, **kwargs)
+
+    async def put(self, url, data=None, **kwargs):
+        return await self.request("PUT", url, data=data, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+    async def _send(self, method, url, headers, body):
+        parsed_url = urllib.parse.urlsplit(url)
+        secure = parsed_url.scheme == "https"
+        host = (
+            parsed_url.hostname,
+            parsed_url.port or (443 if secure else 80),
+            secure,
+        )
+        path = (parsed_url.path or "/") + (
+            f"?{parsed_url.query}" if parsed_url.query else ""
+        )
+
+        request_headers = {"Host": parsed_url.netloc, **headers}
+        if body is not None or method in ("POST", "PUT"):
+            request_headers["Content-Length"] = len(body or b"")
+
+        request = (
+            f"{method} {path} HTTP/1.1\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in request_headers.items())
+            + "\r\n"
+        ).encode("utf-8") + (body or b"")
+
+        limit = self._limits.get(host)
+        if not limit:
+            limit = self._limits[host] = asyncio.Semaphore(self.pool_maxsize)
+
+        async with limit:
+            while True:
+                reader, writer, reused = await self._get_connection(host)
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    response, keep_alive = await self._read_response(
+                        reader, method, url
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    # The server closed the connection while it was idle, so try another one
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    # Like timeouts, which leave the connection in the middle of a response
+                    writer.close()
+                    raise
+
+                if keep_alive:
+                    self._idle.setdefault(host, []).append((reader, writer))
+                else:
+                    writer.close()
+
+                return response
+
+    async def _get_connection(self, host):
+        idle = self._idle.get(host)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+
+            writer.close()
+
+        hostname, port, secure = host
+        reader, writer = await asyncio.open_connection(hostname, port, ssl=secure)
+        self.connections_opened += 1
+        return reader, writer, False
+
+    async def _read_response(self, reader, method, url):
+        status_line = (await reader.readuntil(b"\r\n")).decode("latin-1")
+        version, status_code = status_line.split(" ", 2)[:2]
+        status_code = int(status_code)
+
+        headers = CaseInsensitiveDict()
+        while True:
+            line = (await reader.readuntil(b"\r\n")).decode("latin-1").strip()
+            if not line:
+                break
+
+            name, value = line.split(":", 1)
+            name, value = name.strip(), value.strip()
+            # Repeated headers are joined, like with requests
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+        keep_alive = (
+            version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        )
+
+        if method == "HEAD" or status_code in (204, 304):
+            content = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if not size:
+                    # Skips any trailers
+                    while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                        pass
+                    break
+
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+
+            content = b"".join(chunks)
+        elif "content-length" in headers:
+            content = await reader.readexactly(int(headers["content-length"]))
+        else:
+            # The end of the response is when the connection closes
+            content = await reader.read()
+            keep_alive = False
+
+        encoding = headers.get("content-encoding", "").lower()
+        if encoding == "gzip":
+            content = zlib.decompress(content, 16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            content = zlib.decompress(content)
+
+        return Response(url, status_code, headers, content), keep_alive
+
+    async def close(self):
+        for connections in self._idle.values():
+            for reader, writer in connections:
+                writer.close()
+
+        self._idle = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
@@ -0,0 +1,66 @@
+import bisect
+import collections
+import statistics
+
+
+class LatencyHistogram:
+    """
+    Keeps the most recent round trip times, in seconds
+    Older samples are dropped once there are more than size of them
+    """
+
+    def __init__(self, size=100):
+        self.size = size
+        self._samples = collections.deque(maxlen=size)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, seconds):
+        self._samples.append(seconds)
+
+    def clear(self):
+        self._samples.clear()
+
+    @property
+    def last(self):
+        return self._samples[-1] if self._samples else None
+
+    @property
+    def min(self):
+        return min(self._samples, default=None)
+
+    @property
+    def max(self):
+        return max(self._samples, default=None)
+
+    @property
+    def mean(self):
+        return statistics.mean(self._samples) if self._samples else None
+
+    def percentile(self, percent):
+        if not self._samples:
+            return None
+
+        samples = sorted(self._samples)
+        index = round(percent / 100 * (len(samples) - 1))
+        return samples[index]
+
+    def histogram(self, edges=(0.05, 0.1, 0.25, 0.5, 1, 2.5)):
+        # Counts the samples below each edge, plus the ones above the last edge
+        counts = [0] * (len(edges) + 1)
+        for sample in self._samples:
+            counts[bisect.bisect_right(edges, sample)] += 1
+
+        return counts
+
+    def stats(self):
+        return {
+            "count": len(self),
+            "last": self.last,
+            "min": self.min,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.max,
+        }
@@ -1,10 +1,15 @@
-import requests
 import json
 
 from .Incomplete import IncompleteUser, RemixtreeProject
-from .ScratchExceptions import UnauthorizedException
-from .Comment import ProjectComment
-from .util import get_data_list
+from .ScratchExceptions import UnauthorizedException, RejectedException
+from .Comment import ProjectComment, AsyncProjectComment
+from .util import (
+    get_data_list,
+    async_get_data_list,
+    iter_data_list,
+    async_iter_data_list,
+)
+from .CloudLogFollower import CloudLogFollower, AsyncCloudLogFollower
 
 
 class Project:
@@ -58,7 +63,7 @@ class Project:
         }
 
     def get_comment(self, comment_id):
-        data = requests.get(
+        data = self._client.transport.get(
             f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/comments/{comment_id}/"
         ).json()
         return ProjectComment(self, data, self._client)
@@ -66,7 +71,7 @@ class Project:
     def love(self):
         self._client._ensure_logged_in()
 
-        return requests.post(
+        return self._client.transport.post(
             f"https://api.scratch.mit.edu/proxy/projects/{self.id}/loves/user/{self._client.username}",
             headers=self._headers,
         ).json()["userLove"]
@@ -74,7 +79,7 @@ class Project:
     def unlove(self):
         self._client._ensure_logged_in()
 
-        return requests.delete(
+        return self._client.transport.delete(
             f"https://api.scratch.mit.edu/proxy/projects/{self.id}/loves/user/{self._client.username}",
             headers=self._headers,
         ).json()["userLove"]
@@ -82,7 +87,7 @@ class Project:
     def favorite(self):
         self._client._ensure_logged_in()
 
-        return requests.post(
+        return self._client.transport.post(
             f"https://api.scratch.mit.edu/proxy/projects/{self.id}/favorites/user/{self._client.username}",
             headers=self._headers,
         ).json()["userFavorite"]
@@ -90,13 +95,15 @@ class Project:
     def unfavorite(self):
         self._client._ensure_logged_in()
 
-        return requests.delete(
+        return self._client.transport.delete(
             f"https://api.scratch.mit.edu/proxy/projects/{self.id}/favorites/user/{self._client.username}",
             headers=self._headers,
         ).json()["userFavorite"]
 
     def get_scripts(self):
-        return requests.get(f"https://projects.scratch.mit.edu/{self.id}/").json()
+        return self._client.transport.get(
+            f"https://projects.scratch.mit.edu/{self.id}/"
+        ).json()
 
     def save(self, project):
         self._client._ensure_logged_in()
@@ -104,7 +111,7 @@ class Project:
         if self.author.username != self._client.username:
             raise UnauthorizedException("You are not allowed to do that")
 
-        requests.put(
+        self._client.transport.put(
             f"https://projects.scratch.mit.edu/{self.id}",
             headers=self._json_headers,
             data=project,
@@ -117,10 +124,21 @@ class Project:
             offset,
             f"https://api.scratch.mit.edu/projects/{self.id}/remixes",
             lambda project: Project(project, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_remixes(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/projects/{self.id}/remixes",
+            lambda project: Project(project, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_remixtree(self):
-        response = requests.get(
+        response = self._client.transport.get(
             f"https://scratch.mit.edu/projects/{self.id}/remixtree/bare"
         )
 
@@ -150,6 +168,17 @@ class Project:
             offset,
             f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/studios",
             lambda studio: Studio(studio, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_studios(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/studios",
+            lambda studio: Studio(studio, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def post_comment(self, content, parent_id="", commentee_id=""):
@@ -163,7 +192,7 @@ class Project:
             "content": content,
             "parent_id": parent_id,
         }
-        response = requests.post(
+        response = self._client.transport.post(
             f"https://api.scratch.mit.edu/proxy/comments/project/{self.id}/",
             headers=self._json_headers,
             data=json.dumps(data),
@@ -181,6 +210,17 @@ class Project:
             offset,
             f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/comments",
             lambda comment: ProjectComment(self, comment, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_comments(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/comments",
+            lambda comment: ProjectComment(self, comment, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_cloud_logs(self, all=False, limit=20, offset=0):
@@ -192,12 +232,28 @@ class Project:
             lambda log: log,
             params=f"&projectid={self.id}",
             headers=self._headers,
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_cloud_logs(self, offset=0, prefetch=False):
+        return iter_data_list(
+            "https://clouddata.scratch.mit.edu/logs",
+            lambda log: log,
+            params=f"&projectid={self.id}",
+            headers=self._headers,
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
+    def follow_cloud_logs(self, cursor_file=None, interval=10, backfill=False):
+        return CloudLogFollower(self, cursor_file, interval, backfill)
+
     def get_visibility(self):
         self._ensure_logged_in()
 
-        return requests.get(
+        return self._client.transport.get(
             f"https//api.scratch.mit.edu/users/{self._client.username}/projects/{self.id}/visibility",
             headers=self._headers,
         ).json()
@@ -211,7 +267,7 @@ class Project:
         data = {"comments_allowed": not self.comments_allowed}
         self.comments_allowed = not self.comments_allowed
         return Project(
-            requests.put(
+            self._client.transport.put(
                 f"https://api.scratch.mit.edu/projects/{self.id}/",
                 data=json.dumps(data),
                 headers=self._json_headers,
@@ -228,7 +284,7 @@ class Project:
         data = {"comments_allowed": True}
         self.comments_allowed = True
         return Project(
-            requests.put(
+            self._client.transport.put(
                 f"https://api.scratch.mit.edu/projects/{self.id}/",
                 data=json.dumps(data),
                 headers=self._json_headers,
@@ -245,7 +301,7 @@ class Project:
         data = {"comments_allowed": False}
         self.comments_allowed = False
         return Project(
-            requests.put(
+            self._client.transport.put(
                 f"https://api.scratch.mit.edu/projects/{self.id}/",
                 data=json.dumps(data),
                 headers=self._json_headers,
@@ -260,7 +316,7 @@ class Project:
             image = self.thumbnail_URL
         data = {"notes": reason, "report_category": category, "thumbnail": image}
 
-        requests.post(
+        self._client.transport.post(
             f"https://api.scratch.mit.edu/proxy/comments/project/{self.id}/",
             data=json.dumps(data),
             headers=self._json_headers,
@@ -272,7 +328,7 @@ class Project:
         if self.author.username != self._client.username:
             raise UnauthorizedException("You are not allowed to do that")
 
-        requests.put(
+        self._client.transport.put(
             f"https://api.scratch.mit.edu/proxy/projects/{self.id}/unshare/",
             headers=self._json_headers,
         )
@@ -285,7 +341,7 @@ class Project:
         if self.author.username != self._client.username:
             raise UnauthorizedException("You are not allowed to do that")
 
-        requests.put(
+        self._client.transport.put(
             f"https://api.scratch.mit.edu/proxy/projects/{self.id}/share/",
             headers=self._json_headers,
         )
@@ -300,7 +356,7 @@ class Project:
 
         data = {"visibility": "trshbyusr"}
 
-        requests.put(
+        self._client.transport.put(
             f"https://scratch.mit.edu/site-api/projects/all/{self.id}/",
             data=json.dumps(data),
             headers=self._json_headers,
@@ -314,14 +370,14 @@ class Project:
 
         data = {"visibility": "visible"}
 
-        requests.put(
+        self._client.transport.put(
             f"https://scratch.mit.edu/site-api/projects/all/{self.id}/",
             data=json.dumps(data),
             headers=self._json_headers,
         )
 
     def view(self):
-        requests.post(
+        self._client.transport.post(
             f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/views/",
             headers=self._headers,
         )
@@ -337,7 +393,7 @@ class Project:
             if isinstance(file_or_data, bytes)
             else open(file_or_data, "rb").read()
         )
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/internalapi/project/thumbnail/{self.id}/set",
             data=data,
             headers=self._headers,
@@ -350,7 +406,7 @@ class Project:
             raise UnauthorizedException("You are not allowed to do that")
 
         data = {"title": title}
-        requests.put(
+        self._client.transport.put(
             f"https://api.scratch.mit.edu/projects/{self.id}/",
             data=json.dumps(data),
             headers=self._json_headers,
@@ -365,7 +421,7 @@ class Project:
             raise UnauthorizedException("You are not allowed to do that")
 
         data = {"instructions": instructions}
-        requests.put(
+        self._client.transport.put(
             f"https://api.scratch.mit.edu/projects/{self.id}/",
             data=json.dumps(data),
             headers=self._json_headers,
@@ -380,7 +436,401 @@ class Project:
             raise UnauthorizedException("You are not allowed to do that")
 
         data = {"description": description}
-        requests.put(
+        self._client.transport.put(
+            f"https://api.scratch.mit.edu/projects/{self.id}/",
+            data=json.dumps(data),
+            headers=self._json_headers,
+        )
+
+        self.description = description
+
+
+class AsyncProject(Project):
+    def __init__(self, data, client):
+        global AsyncStudio
+        from .Studio import AsyncStudio
+
+        super().__init__(data, client)
+
+    async def get_comment(self, comment_id):
+        data = (
+            await self._client.transport.get(
+                f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/comments/{comment_id}/"
+            )
+        ).json()
+        return AsyncProjectComment(self, data, self._client)
+
+    async def love(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.post(
+            f"https://api.scratch.mit.edu/proxy/projects/{self.id}/loves/user/{self._client.username}",
+            headers=self._headers,
+        )
+        return response.json()["userLove"]
+
+    async def unlove(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.delete(
+            f"https://api.scratch.mit.edu/proxy/projects/{self.id}/loves/user/{self._client.username}",
+            headers=self._headers,
+        )
+        return response.json()["userLove"]
+
+    async def favorite(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.post(
+            f"https://api.scratch.mit.edu/proxy/projects/{self.id}/favorites/user/{self._client.username}",
+            headers=self._headers,
+        )
+        return response.json()["userFavorite"]
+
+    async def unfavorite(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.delete(
+            f"https://api.scratch.mit.edu/proxy/projects/{self.id}/favorites/user/{self._client.username}",
+            headers=self._headers,
+        )
+        return response.json()["userFavorite"]
+
+    async def get_scripts(self):
+        response = await self._client.transport.get(
+            f"https://projects.scratch.mit.edu/{self.id}/"
+        )
+        return response.json()
+
+    async def save(self, project):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        await self._client.transport.put(
+            f"https://projects.scratch.mit.edu/{self.id}",
+            headers=self._json_headers,
+            data=project,
+        )
+
+    async def get_remixes(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/projects/{self.id}/remixes",
+            lambda project: AsyncProject(project, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_remixes(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/projects/{self.id}/remixes",
+            lambda project: AsyncProject(project, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_remixtree(self):
+        response = await self._client.transport.get(
+            f"https://scratch.mit.edu/projects/{self.id}/remixtree/bare"
+        )
+
+        if response.text == "no data" or response.status_code == 404:
+            return []
+
+        tree = []
+        for key, value in response.json().items():
+            if key == "root_id":
+                continue
+
+            tree.append(
+                RemixtreeProject(
+                    {
+                        **value,
+                        "id": key,
+                    }
+                )
+            )
+
+        return tree
+
+    async def get_studios(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/studios",
+            lambda studio: AsyncStudio(studio, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_studios(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/studios",
+            lambda studio: AsyncStudio(studio, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def post_comment(self, content, parent_id="", commentee_id=""):
+        self._client._ensure_logged_in()
+
+        if not self.comments_allowed:
+            raise UnauthorizedException("Comments are closed on this project")
+
+        data = {
+            "commentee_id": commentee_id,
+            "content": content,
+            "parent_id": parent_id,
+        }
+        response = (
+            await self._client.transport.post(
+                f"https://api.scratch.mit.edu/proxy/comments/project/{self.id}/",
+                headers=self._json_headers,
+                data=json.dumps(data),
+            )
+        ).json()
+
+        if "rejected" in response:
+            raise RejectedException("Your comment did not post")
+
+        return AsyncProjectComment(self, response, self._client)
+
+    async def get_comments(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/comments",
+            lambda comment: AsyncProjectComment(self, comment, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_comments(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/comments",
+            lambda comment: AsyncProjectComment(self, comment, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_cloud_logs(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            "https://clouddata.scratch.mit.edu/logs",
+            lambda log: log,
+            self._client.transport,
+            params=f"&projectid={self.id}",
+            headers=self._headers,
+            workers=self._client.page_workers,
+        )
+
+    def iter_cloud_logs(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            "https://clouddata.scratch.mit.edu/logs",
+            lambda log: log,
+            self._client.transport,
+            params=f"&projectid={self.id}",
+            headers=self._headers,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    def follow_cloud_logs(self, cursor_file=None, interval=10, backfill=False):
+        return AsyncCloudLogFollower(self, cursor_file, interval, backfill)
+
+    async def get_visibility(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.get(
+            f"https://api.scratch.mit.edu/users/{self._client.username}/projects/{self.id}/visibility",
+            headers=self._headers,
+        )
+        return response.json()
+
+    async def toggle_commenting(self):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"comments_allowed": not self.comments_allowed}
+        self.comments_allowed = not self.comments_allowed
+        response = await self._client.transport.put(
+            f"https://api.scratch.mit.edu/projects/{self.id}/",
+            data=json.dumps(data),
+            headers=self._json_headers,
+        )
+        return AsyncProject(response.json(), self._client)
+
+    async def turn_on_commenting(self):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"comments_allowed": True}
+        self.comments_allowed = True
+        response = await self._client.transport.put(
+            f"https://api.scratch.mit.edu/projects/{self.id}/",
+            data=json.dumps(data),
+            headers=self._json_headers,
+        )
+        return AsyncProject(response.json(), self._client)
+
+    async def turn_off_commenting(self):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"comments_allowed": False}
+        self.comments_allowed = False
+        response = await self._client.transport.put(
+            f"https://api.scratch.mit.edu/projects/{self.id}/",
+            data=json.dumps(data),
+            headers=self._json_headers,
+        )
+        return AsyncProject(response.json(), self._client)
+
+    async def report(self, category, reason, image=None):
+        self._client._ensure_logged_in()
+
+        if not image:
+            image = self.thumbnail_URL
+        data = {"notes": reason, "report_category": category, "thumbnail": image}
+
+        await self._client.transport.post(
+            f"https://api.scratch.mit.edu/proxy/comments/project/{self.id}/",
+            data=json.dumps(data),
+            headers=self._json_headers,
+        )
+
+    async def unshare(self):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        await self._client.transport.put(
+            f"https://api.scratch.mit.edu/proxy/projects/{self.id}/unshare/",
+            headers=self._json_headers,
+        )
+
+        self.public = False
+
+    async def share(self):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        await self._client.transport.put(
+            f"https://api.scratch.mit.edu/proxy/projects/{self.id}/share/",
+            headers=self._json_headers,
+        )
+
+        self.public = True
+
+    async def delete(self):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"visibility": "trshbyusr"}
+
+        await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/projects/all/{self.id}/",
+            data=json.dumps(data),
+            headers=self._json_headers,
+        )
+
+    async def restore_deleted(self):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"visibility": "visible"}
+
+        await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/projects/all/{self.id}/",
+            data=json.dumps(data),
+            headers=self._json_headers,
+        )
+
+    async def view(self):
+        await self._client.transport.post(
+            f"https://api.scratch.mit.edu/users/{self.author.username}/projects/{self.id}/views/",
+            headers=self._headers,
+        )
+
+    async def set_thumbnail(self, file_or_data):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = (
+            file_or_data
+            if isinstance(file_or_data, bytes)
+            else open(file_or_data, "rb").read()
+        )
+        await self._client.transport.post(
+            f"https://scratch.mit.edu/internalapi/project/thumbnail/{self.id}/set",
+            data=data,
+            headers=self._headers,
+        )
+
+    async def set_title(self, title):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"title": title}
+        await self._client.transport.put(
+            f"https://api.scratch.mit.edu/projects/{self.id}/",
+            data=json.dumps(data),
+            headers=self._json_headers,
+        )
+
+        self.title = title
+
+    async def set_instructions(self, instructions):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"instructions": instructions}
+        await self._client.transport.put(
+            f"https://api.scratch.mit.edu/projects/{self.id}/",
+            data=json.dumps(data),
+            headers=self._json_headers,
+        )
+
+        self.instructions = instructions
+
+    async def set_description(self, description):
+        self._client._ensure_logged_in()
+
+        if self.author.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"description": description}
+        await self._client.transport.put(
             f"https://api.scratch.mit.edu/projects/{self.id}/",
             data=json.dumps(data),
             headers=self._json_headers,
@@ -0,0 +1,75 @@
+import time
+import asyncio
+import threading
+
+
+class RateLimiter:
+    """
+    A token bucket that limits how often something can happen
+    Callers reserve tokens in the order they arrive, so waiting is first come, first served
+    The same limiter can be shared by sync and async code
+    """
+
+    def __init__(self, rate=10, burst=1):
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _reserve(self, tokens):
+        # Takes tokens, possibly going into debt, and returns how long to wait for them
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+
+            if self._tokens >= 0:
+                return 0
+
+            self._waiting += 1
+            return -self._tokens / self.rate
+
+    def _finish_waiting(self):
+        with self._lock:
+            self._waiting -= 1
+
+    def _cancel(self, tokens):
+        # Gives back tokens that were reserved but never used
+        with self._lock:
+            self._waiting -= 1
+            self._tokens += tokens
+
+    def acquire(self, tokens=1):
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+            self._finish_waiting()
+
+    async def acquire_async(self, tokens=1):
+        wait = self._reserve(tokens)
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._cancel(tokens)
+                raise
+
+            self._finish_waiting()
+
+    @property
+    def queue_depth(self):
+        # The number of callers that are waiting for a token
+        return self._waiting
+
+    @property
+    def wait_time(self):
+        # How long a caller arriving now would have to wait
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0, (1 - self._tokens) / self.rate)
@@ -0,0 +1,32 @@
+import random
+
+
+class ReconnectPolicy:
+    """
+    Decides how long to wait between reconnection attempts
+    The delay doubles after every failed attempt, and is randomized so that
+    many connections dropped at once don't all reconnect at the same moment
+    """
+
+    def __init__(
+        self, initial_delay=1, max_delay=60, multiplier=2, jitter=0.5, max_attempts=None
+    ):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+
+    def delay(self, attempt):
+        # The exponent is capped so that the delay can't overflow
+        delay = min(
+            self.max_delay, self.initial_delay * self.multiplier ** min(attempt, 32)
+        )
+        return delay * random.uniform(1 - self.jitter, 1)
+
+    def delays(self):
+        # Yields the delay before each attempt, until the attempts run out
+        attempt = 0
+        while self.max_attempts is None or attempt < self.max_attempts:
+            yield self.delay(attempt)
+            attempt += 1
@@ -0,0 +1,171 @@
+"""
+Caches the responses to GET requests made by a transport, so asking for the same user,
+project, or studio again doesn't always need a request
+When an entry is too old, it's checked with the server using its ETag or Last-Modified
+header, and a 304 response means the cached one can keep being used
+"""
+
+import collections
+import re
+import threading
+import time
+import urllib.parse
+
+# Parts of URLs that say which user, project, or studio they're about, so that changing
+# one only removes the cached responses that are about the same thing
+RESOURCE_PATTERN = re.compile(
+    r"/(users?|followers|projects?|studios?|galler(?:y|ies)|bookmarkers|curators-in)/"
+    r"(?:all/)?(?!followers/|bookmarkers/|curators-in/)([^/?]+)"
+)
+RESOURCE_KINDS = {
+    "user": "users",
+    "users": "users",
+    "followers": "users",
+    "project": "projects",
+    "projects": "projects",
+    "studio": "studios",
+    "studios": "studios",
+    "gallery": "studios",
+    "galleries": "studios",
+    "bookmarkers": "studios",
+    "curators-in": "studios",
+}
+# Like https://projects.scratch.mit.edu/123, which has a project's code
+PROJECT_HOST_PATTERN = re.compile(r"//projects\.scratch\.mit\.edu/(\d+)")
+
+
+def _resources(url):
+    resources = {
+        (RESOURCE_KINDS[kind], resource_id.lower())
+        for kind, resource_id in RESOURCE_PATTERN.findall(url)
+    }
+    resources.update(
+        ("projects", project_id) for project_id in PROJECT_HOST_PATTERN.findall(url)
+    )
+    return resources
+
+
+class _Entry:
+    def __init__(self, url, response, expires):
+        self.response = response
+        self.expires = expires
+        self.resources = _resources(url)
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+
+
+class ResponseCache:
+    def __init__(self, max_entries=1000, ttl=60, ttls=None):
+        self.max_entries = max_entries
+        # The number of seconds responses are used for before they're checked again
+        self.ttl = ttl
+        # TTLs for URLs that match regular expressions, which are checked in order
+        self.ttls = [
+            (re.compile(pattern), seconds) for pattern, seconds in (ttls or {}).items()
+        ]
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        # Least recently used first
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, url):
+        for pattern, seconds in self.ttls:
+            if pattern.search(url):
+                return seconds
+
+        return self.ttl
+
+    def key(self, url, headers=None, params=None):
+        if params:
+            url += ("&" if "?" in url else "?") + urllib.parse.urlencode(params)
+
+        # Responses can depend on who's logged in
+        headers = {name.lower(): value for name, value in (headers or {}).items()}
+        return (url, headers.get("x-token"), headers.get("cookie"))
+
+    def lookup(self, key):
+        # Returns a fresh response, or None and the headers to check a stale one with
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                self.misses += 1
+                return None, {}
+
+            self._entries.move_to_end(key)
+            if entry.expires > time.monotonic():
+                self.hits += 1
+                return entry.response, {}
+
+            self.misses += 1
+            headers = {}
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+            return None, headers
+
+    def update(self, key, url, response):
+        # Returns the response that should be used, or None if it's a 304 for a
+        # response that was removed while it was being checked
+        ttl = self.ttl_for(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if response.status_code == 304 and entry:
+                self.revalidations += 1
+                entry.expires = time.monotonic() + ttl
+                return entry.response
+
+            if response.status_code == 304:
+                return None
+
+            if response.status_code != 200 or ttl <= 0:
+                return response
+
+            self._entries[key] = _Entry(url, response, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return response
+
+    def invalidate(self, url):
+        # Removes the responses about the same users, projects, or studios as the URL
+        resources = _resources(url)
+        if not resources:
+            return
+
+        with self._lock:
+            for key in [
+                key
+                for key, entry in self._entries.items()
+                if entry.resources & resources
+            ]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
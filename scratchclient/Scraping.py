@@ -1,4 +1,3 @@
-import requests
 import re
 from datetime import datetime
 import html
@@ -410,28 +409,28 @@ class ScrapingSession:
     def get_follower_count(self, user):
         username = user if isinstance(user, str) else user.username
 
-        page = requests.get(f"https://scratch.mit.edu/users/{username}/followers/", headers=self._headers).text
+        page = self._client.transport.get(f"https://scratch.mit.edu/users/{username}/followers/", headers=self._headers).text
 
         return re.search("&raquo;\s+Followers\s+\((\d+)\)", page).groups()[0]
 
     def get_following_count(self, user):
         username = user if isinstance(user, str) else user.username
 
-        page = requests.get(f"https://scratch.mit.edu/users/{username}/following/", headers=self._headers).text
+        page = self._client.transport.get(f"https://scratch.mit.edu/users/{username}/following/", headers=self._headers).text
 
         return re.search("&raquo;\s+Following\s+\((\d+)\)", page).groups()[0]
 
     def get_favorited_count(self, user):
         username = user if isinstance(user, str) else user.username
 
-        page = requests.get(f"https://scratch.mit.edu/users/{username}/favorites/", headers=self._headers).text
+        page = self._client.transport.get(f"https://scratch.mit.edu/users/{username}/favorites/", headers=self._headers).text
 
         return re.search("&raquo;\s+Favorites\s+\((\d+)\)", page).groups()[0]
 
     def get_followed_studios_count(self, user):
         username = user if isinstance(user, str) else user.username
 
-        page = requests.get(
+        page = self._client.transport.get(
             f"https://scratch.mit.edu/users/{username}/studios_following/",
             headers=self._headers
         ).text
@@ -441,21 +440,21 @@ class ScrapingSession:
     def get_curated_studios_count(self, user):
         username = user if isinstance(user, str) else user.username
 
-        page = requests.get(f"https://scratch.mit.edu/users/{username}/studios/", headers=self._headers).text
+        page = self._client.transport.get(f"https://scratch.mit.edu/users/{username}/studios/", headers=self._headers).text
 
         return re.search("&raquo;\s+Studios I Curate\s+\((\d+)\)", page).groups()[0]
 
     def get_shared_projects_count(self, user):
         username = user if isinstance(user, str) else user.username
 
-        page = requests.get(f"https://scratch.mit.edu/users/{username}/projects/", headers=self._headers).text
+        page = self._client.transport.get(f"https://scratch.mit.edu/users/{username}/projects/", headers=self._headers).text
 
         return re.search("&raquo;\s+Shared Projects\s+\((\d+)\)", page).groups()[0]
 
     def get_user_activity(self, user, max=100000):
         username = user if isinstance(user, str) else user.username
 
-        page = requests.get(
+        page = self._client.transport.get(
             f"https://scratch.mit.edu/messages/ajax/user-activity/?user={username}&max={max}", 
             headers=self._headers
         ).text
@@ -471,7 +470,7 @@ class ScrapingSession:
             comments = []
 
             while True:
-                response = requests.get(
+                response = self._client.transport.get(
                     f"https://scratch.mit.edu/site-api/comments/user/{username}/?page={page}", 
                     headers=self._headers
                 )
@@ -486,7 +485,7 @@ class ScrapingSession:
 
                 page += 1
 
-        page_content = requests.get(
+        page_content = self._client.transport.get(
             f"https://scratch.mit.edu/site-api/comments/user/{username}/?page={page}",
             headers=self._headers
         ).text
@@ -496,7 +495,7 @@ class ScrapingSession:
         return parser.comments
 
     def get_signature(self, post_id, as_html=False):
-        page_content = requests.get(
+        page_content = self._client.transport.get(
             f"https://scratch.mit.edu/discuss/post/{post_id}/",
             headers=self._headers
         ).text
@@ -1,27 +1,149 @@
-import requests
 import re
 import json
+import asyncio
 import hashlib
 import pathlib
 
 from .ScratchExceptions import *
-from .User import User
-from .Project import Project
-from .Studio import Studio
+from .User import User, AsyncUser
+from .Project import Project, AsyncProject
+from .Studio import Studio, AsyncStudio
 from .News import News
 from .Message import Message
-from .CloudConnection import CloudConnection, AsyncCloudConnection
+from .CloudConnection import (
+    CloudConnection,
+    AsyncCloudConnection,
+    CloudConnectionPool,
+)
 from .Forums import ForumSession
 from .Scraping import ScrapingSession
-from .Backpack import BackpackItem
+from .Backpack import BackpackItem, AsyncBackpackItem
 from .Incomplete import *
 from .Comment import ProjectComment
 from .Activity import Activity
-from .util import get_data_list
+from .HTTPTransport import HTTPTransport, AsyncHTTPTransport
+from .util import (
+    get_data_list,
+    async_get_data_list,
+    iter_data_list,
+    async_iter_data_list,
+)
+
+
+# Converts responses that are used by both ScratchSession and AsyncScratchSession
+def _mystuff_project(project, client, project_class=Project):
+    return project_class(
+        {
+            "id": project["pk"],
+            "title": project["fields"]["title"],
+            "visibility": project["fields"]["visibility"],
+            "public": project["fields"]["isPublished"],
+            "comments_allowed": True,
+            "is_published": project["fields"]["isPublished"],
+            "author": {
+                "id": client.user.id,
+                "username": client.user.username,
+                "scratchteam": client.user.scratchteam,
+                "history": {
+                    "joined": client.user.joined_timestamp,
+                },
+                "profile": {
+                    "id": client.user.profile.id,
+                    "images": {
+                        "90x90": client.user.profile.avatar_URL,
+                    },
+                },
+            },
+            "image": project["fields"]["thumbnail_url"],
+            "history": {
+                "created": project["fields"]["datetime_created"],
+                "modified": project["fields"]["datetime_modified"],
+                "shared": project["fields"]["datetime_shared"],
+            },
+            "stats": {
+                "views": project["fields"]["view_count"],
+                "loves": project["fields"]["love_count"],
+                "favorites": project["fields"]["favorite_count"],
+                "remixes": project["fields"]["remixers_count"],
+            },
+        },
+        client,
+    )
+
+
+def _mystuff_studio(studio, client, studio_class=Studio):
+    return studio_class(
+        {
+            "id": studio["pk"],
+            "title": studio["fields"]["title"],
+            "host": studio["fields"]["owner"]["pk"],
+            "image": studio["fields"]["thumbnail_url"],
+            "visibility": "visible",
+            "open_to_all": False,
+            "comments_allowed": True,
+            "history": {
+                "created": studio["fields"]["datetime_created"],
+                "modified": studio["fields"]["datetime_modified"],
+            },
+            "stats": {
+                "comments": studio["fields"]["commenters_count"],
+                "curators": studio["fields"]["curators_count"],
+                "projects": studio["fields"]["projecters_count"],
+            },
+        },
+        client,
+    )
+
+
+def _front_page(response):
+    return {
+        "featured_projects": [
+            IncompleteProject(project)
+            for project in response["community_featured_projects"]
+        ],
+        "featured_studios": [
+            IncompleteStudio(studio)
+            for studio in response["community_featured_studios"]
+        ],
+        "top_loved": [
+            IncompleteProject(project)
+            for project in response["community_most_loved_projects"]
+        ],
+        "top_remixed": [
+            IncompleteProject(project)
+            for project in response["community_most_remixed_projects"]
+        ],
+        "newest": [
+            IncompleteProject(project)
+            for project in response["community_newest_projects"]
+        ],
+        "curated": [
+            IncompleteProject(project) for project in response["curator_top_projects"]
+        ],
+        "scratch_design_studio": [
+            IncompleteProject(project) for project in response["scratch_design_studio"]
+        ],
+        "curator": response["curator_top_projects"][0]["curator_name"],
+        "current_sds": IncompleteStudio(
+            {
+                "id": response["scratch_design_studio"][0]["gallery_id"],
+                "title": response["scratch_design_studio"][0]["gallery_title"],
+                "thumbnail_url": f"""https://cdn2.scratch.mit.edu/get_image/gallery/{
+                  response["scratch_design_studio"][0]["gallery_id"]
+                }_480x360.png""",
+            }
+        ),
+    }
 
 
 class ScratchSession:
-    def __init__(self, username=None, password=None, session_id=None, token=None):
+    def __init__(
+        self, username=None, password=None, session_id=None, token=None, transport=None
+    ):
+        # Every request goes through this, so connections get reused
+        self.transport = transport or HTTPTransport()
+        # The number of pages that get_* methods download at once when all=True
+        self.page_workers = 1
         self.logged_in = False
         self.username = username
         self.session_id = session_id
@@ -58,7 +180,7 @@ class ScratchSession:
         }
         data = json.dumps({"username": self.username, "password": password})
 
-        request = requests.post(
+        request = self.transport.post(
             "https://scratch.mit.edu/login/", data=data, headers=headers
         )
 
@@ -77,7 +199,9 @@ class ScratchSession:
             "referer": "https://scratch.mit.edu",
         }
 
-        request = requests.get("https://scratch.mit.edu/csrf_token/", headers=headers)
+        request = self.transport.get(
+            "https://scratch.mit.edu/csrf_token/", headers=headers
+        )
 
         self.csrf_token = re.search(
             "scratchcsrftoken=(.*?);", request.headers["Set-Cookie"]
@@ -86,7 +210,7 @@ class ScratchSession:
     def logout(self):
         self._client._ensure_logged_in()
 
-        requests.post(
+        self.transport.post(
             "https://scratch.mit.edu/accounts/logout/",
             data={"csrfmiddlewaretoken": self.csrf_token},
         )
@@ -99,7 +223,7 @@ class ScratchSession:
             "password": password,
         }
 
-        response = requests.post(
+        response = self.transport.post(
             "https://scratch.mit.edu/accounts/check_password",
             data=json.dumps(data),
             headers=self._headers,
@@ -107,38 +231,41 @@ class ScratchSession:
 
         return response["success"]
 
-    def get_user(self, user):
+    def get_user(self, user, cache=True):
         username = user.username if isinstance(user, (IncompleteUser, User)) else user
         return User(
-            requests.get(
+            self.transport.get(
                 f"https://api.scratch.mit.edu/users/{username}/",
                 headers=self._headers,
+                cache=cache,
             ).json(),
             self,
         )
 
-    def get_project(self, project):
+    def get_project(self, project, cache=True):
         project_id = (
             project.id
             if isinstance(project, (IncompleteProject, RemixtreeProject, Project))
             else project
         )
         return Project(
-            requests.get(
+            self.transport.get(
                 f"https://api.scratch.mit.edu/projects/{project_id}/",
                 headers=self._headers,
+                cache=cache,
             ).json(),
             self,
         )
 
-    def get_studio(self, studio):
+    def get_studio(self, studio, cache=True):
         studio_id = (
             studio.id if isinstance(studio, (IncompleteStudio, Studio)) else studio
         )
         return Studio(
-            requests.get(
+            self.transport.get(
                 f"https://api.scratch.mit.edu/studios/{studio}/",
                 headers=self._headers,
+                cache=cache,
             ).json(),
             self,
         )
@@ -150,6 +277,17 @@ class ScratchSession:
             offset,
             f"https://api.scratch.mit.edu/news/",
             News,
+            transport=self.transport,
+            workers=self.page_workers,
+        )
+
+    def iter_news(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/news/",
+            News,
+            transport=self.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_messages(self, all=False, limit=20, offset=0, filter=""):
@@ -161,19 +299,66 @@ class ScratchSession:
             Message,
             params=f"&filter={filter}",
             headers=self._headers,
+            transport=self.transport,
+            workers=self.page_workers,
+        )
+
+    def iter_messages(self, filter="", offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/messages",
+            Message,
+            params=f"&filter={filter}",
+            headers=self._headers,
+            transport=self.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
-    def create_cloud_connection(self, project_id, is_async=False, cloud_host="clouddata.scratch.mit.edu", headers={}):
+    def create_cloud_connection(
+        self,
+        project_id,
+        is_async=False,
+        cloud_host="clouddata.scratch.mit.edu",
+        headers={},
+        compression=False,
+        rate_limiter=None,
+        reconnect_policy=None,
+        ping_interval=20,
+        max_missed_pongs=3,
+    ):
         return (
-            AsyncCloudConnection(project_id, self, cloud_host, headers)
+            AsyncCloudConnection(
+                project_id,
+                self,
+                cloud_host,
+                headers,
+                compression,
+                rate_limiter=rate_limiter,
+                reconnect_policy=reconnect_policy,
+                ping_interval=ping_interval,
+                max_missed_pongs=max_missed_pongs,
+            )
             if is_async
-            else CloudConnection(project_id, self, cloud_host, headers)
+            else CloudConnection(
+                project_id,
+                self,
+                cloud_host,
+                headers,
+                compression,
+                rate_limiter=rate_limiter,
+                reconnect_policy=reconnect_policy,
+                ping_interval=ping_interval,
+                max_missed_pongs=max_missed_pongs,
+            )
         )
 
+    def create_cloud_connection_pool(self, queue_size=0):
+        return CloudConnectionPool(self, queue_size)
+
     def explore_projects(self, mode="trending", query="*", language="en"):
         return [
             Project(project, self)
-            for project in requests.get(
+            for project in self.transport.get(
                 f"https://api.scratch.mit.edu/explore/projects/?mode={mode}&q={query}&language={language}"
             ).json()
         ]
@@ -181,7 +366,7 @@ class ScratchSession:
     def explore_studios(self, mode="trending", query="*"):
         return [
             Studio(studio, self)
-            for studio in requests.get(
+            for studio in self.transport.get(
                 f"https://api.scratch.mit.edu/explore/studios/?mode={mode}&q={query}"
             ).json()
         ]
@@ -189,7 +374,7 @@ class ScratchSession:
     def search_projects(self, mode="popular", query="*", language="en"):
         return [
             Project(project, self)
-            for project in requests.get(
+            for project in self.transport.get(
                 f"https://api.scratch.mit.edu/search/projects/?mode={mode}&q={query}&language={language}"
             ).json()
         ]
@@ -197,60 +382,23 @@ class ScratchSession:
     def search_studios(self, mode="popular", query="*"):
         return [
             Studio(studio, self)
-            for studio in requests.get(
+            for studio in self.transport.get(
                 f"https://api.scratch.mit.edu/search/studios/?mode={mode}&q={query}"
             ).json()
         ]
 
     def get_front_page(self):
-        response = requests.get("https://api.scratch.mit.edu/proxy/featured").json()
-        return {
-            "featured_projects": [
-                IncompleteProject(project)
-                for project in response["community_featured_projects"]
-            ],
-            "featured_studios": [
-                IncompleteStudio(studio)
-                for studio in response["community_featured_studios"]
-            ],
-            "top_loved": [
-                IncompleteProject(project)
-                for project in response["community_most_loved_projects"]
-            ],
-            "top_remixed": [
-                IncompleteProject(project)
-                for project in response["community_most_remixed_projects"]
-            ],
-            "newest": [
-                IncompleteProject(project)
-                for project in response["community_newest_projects"]
-            ],
-            "curated": [
-                IncompleteProject(project)
-                for project in response["curator_top_projects"]
-            ],
-            "scratch_design_studio": [
-                IncompleteProject(project)
-                for project in response["scratch_design_studio"]
-            ],
-            "curator": response["curator_top_projects"][0]["curator_name"],
-            "current_sds": IncompleteStudio(
-                {
-                    "id": response["scratch_design_studio"][0]["gallery_id"],
-                    "title": response["scratch_design_studio"][0]["gallery_title"],
-                    "thumbnail_url": f"""https://cdn2.scratch.mit.edu/get_image/gallery/{
-                      response["scratch_design_studio"][0]["gallery_id"]
-                    }_480x360.png""",
-                }
-            ),
-        }
+        response = self.transport.get(
+            "https://api.scratch.mit.edu/proxy/featured"
+        ).json()
+        return _front_page(response)
 
     def get_activity(self, limit=5, offset=0):
         self._ensure_logged_in()
 
         return [
             Activity(activity)
-            for activity in requests.get(
+            for activity in self.transport.get(
                 f"https://api.scratch.mit.edu/users/{self.username}/following/users/activity?limit={limit}&offset={offset}",
                 headers=self._headers,
             ).json()
@@ -259,7 +407,7 @@ class ScratchSession:
     def create_project(self, project):
         self._ensure_logged_in()
 
-        response = requests.post(
+        response = self.transport.post(
             "https://projects.scratch.mit.edu/",
             headers={
                 **self._headers,
@@ -274,7 +422,7 @@ class ScratchSession:
     def create_studio(self):
         self._ensure_logged_in()
 
-        response = requests.post(
+        response = self.transport.post(
             "https://scratch.mit.edu/studios/create/",
             headers={
                 **self._headers,
@@ -302,7 +450,7 @@ class ScratchSession:
             "password": password,
         }
 
-        response = requests.put(
+        response = self.transport.put(
             "https://scratch.mit.edu/site-api/projects/trashed/empty/",
             headers=self._headers,
             data=json.dumps(data),
@@ -311,49 +459,10 @@ class ScratchSession:
     def get_own_projects(self, all=False, sort="", filter="all", page=1):
         self._ensure_logged_in()
 
-        def mystuff_project_to_project(project):
-            return Project(
-                {
-                    "id": project["pk"],
-                    "title": project["fields"]["title"],
-                    "visibility": project["fields"]["visibility"],
-                    "public": project["fields"]["isPublished"],
-                    "comments_allowed": True,
-                    "is_published": project["fields"]["isPublished"],
-                    "author": {
-                        "id": self.user.id,
-                        "username": self.user.username,
-                        "scratchteam": self.user.scratchteam,
-                        "history": {
-                            "joined": self.user.joined_timestamp,
-                        },
-                        "profile": {
-                            "id": self.user.profile.id,
-                            "images": {
-                                "90x90": self.user.profile.avatar_URL,
-                            },
-                        },
-                    },
-                    "image": project["fields"]["thumbnail_url"],
-                    "history": {
-                        "created": project["fields"]["datetime_created"],
-                        "modified": project["fields"]["datetime_modified"],
-                        "shared": project["fields"]["datetime_shared"],
-                    },
-                    "stats": {
-                        "views": project["fields"]["view_count"],
-                        "loves": project["fields"]["love_count"],
-                        "favorites": project["fields"]["favorite_count"],
-                        "remixes": project["fields"]["remixers_count"],
-                    },
-                },
-                self,
-            )
-
         if all:
             projects = []
             while True:
-                response = requests.get(
+                response = self.transport.get(
                     f"https://scratch.mit.edu/site-api/projects/{filter}/?page={page}&ascsort=&descsort={sort}",
                     headers=self._headers,
                 )
@@ -364,11 +473,11 @@ class ScratchSession:
                 projects += response.json()
                 page += 1
 
-            return [mystuff_project_to_project(project) for project in projects]
+            return [_mystuff_project(project, self) for project in projects]
 
         return [
-            mystuff_project_to_project(project)
-            for project in requests.get(
+            _mystuff_project(project, self)
+            for project in self.transport.get(
                 f"https://scratch.mit.edu/site-api/projects/{filter}/?page={page}&ascsort=&descsort={sort}",
                 headers=self._headers,
             ).json()
@@ -377,33 +486,10 @@ class ScratchSession:
     def get_own_studios(self, all=False, sort="", page=1):
         self._ensure_logged_in()
 
-        def mystuff_studio_to_studio(studio):
-            return Studio(
-                {
-                    "id": studio["pk"],
-                    "title": studio["fields"]["title"],
-                    "host": studio["fields"]["owner"]["pk"],
-                    "image": studio["fields"]["thumbnail_url"],
-                    "visibility": "visible",
-                    "open_to_all": False,
-                    "comments_allowed": True,
-                    "history": {
-                        "created": studio["fields"]["datetime_created"],
-                        "modified": studio["fields"]["datetime_modified"],
-                    },
-                    "stats": {
-                        "comments": studio["fields"]["commenters_count"],
-                        "curators": studio["fields"]["curators_count"],
-                        "projects": studio["fields"]["projecters_count"],
-                    },
-                },
-                self,
-            )
-
         if all:
             studios = []
             while True:
-                response = requests.get(
+                response = self.transport.get(
                     f"https://scratch.mit.edu/site-api/galleries/all/?page={page}&ascsort=&descsort={sort}",
                     headers=self._headers,
                 )
@@ -414,11 +500,11 @@ class ScratchSession:
                 studios += response.json()
                 page += 1
 
-            return [mystuff_studio_to_studio(studio) for studio in studios]
+            return [_mystuff_studio(studio, self) for studio in studios]
 
         return [
-            mystuff_studio_to_studio(studio)
-            for studio in requests.get(
+            _mystuff_studio(studio, self)
+            for studio in self.transport.get(
                 f"https://scratch.mit.edu/site-api/galleries/all/?page={page}&ascsort=&descsort={sort}",
                 headers=self._headers,
             ).json()
@@ -432,7 +518,7 @@ class ScratchSession:
         if isinstance(asset, str):
             file_ext = pathlib.Path(asset).suffix
 
-        requests.post(
+        self.transport.post(
             f"https://assets.scratch.mit.edu/{hashlib.md5(data).hexdigest()}.{file_ext}",
             headers=self._headers,
             data=data,
@@ -446,7 +532,7 @@ class ScratchSession:
             "country": country,
         }
 
-        requests.post(
+        self.transport.post(
             "https://scratch.mit.edu/accounts/settings/",
             data=data,
             headers=self._headers,
@@ -462,7 +548,7 @@ class ScratchSession:
             "new_password2": new_password,
         }
 
-        requests.post(
+        self.transport.post(
             "https://scratch.mit.edu/accounts/password_change/",
             data=data,
             headers=self._headers,
@@ -477,7 +563,7 @@ class ScratchSession:
             "password": password,
         }
 
-        requests.post(
+        self.transport.post(
             "https://scratch.mit.edu/accounts/email_change/",
             data=data,
             headers=self._headers,
@@ -495,7 +581,7 @@ class ScratchSession:
         if teacher_tips:
             data["teacher_tips"] = "on"
 
-        requests.post(
+        self.transport.post(
             "https://scratch.mit.edu/accounts/settings/update_subscription/",
             data=data,
             headers=self._headers,
@@ -511,6 +597,20 @@ class ScratchSession:
             f"https://backpack.scratch.mit.edu/{self.username}",
             lambda item: BackpackItem(item, self),
             headers=self._headers,
+            transport=self.transport,
+            workers=self.page_workers,
+        )
+
+    def iter_backpack(self, offset=0, prefetch=False):
+        self._ensure_logged_in()
+
+        return iter_data_list(
+            f"https://backpack.scratch.mit.edu/{self.username}",
+            lambda item: BackpackItem(item, self),
+            headers=self._headers,
+            transport=self.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def add_to_backpack(self, item_type, body, mime_type, name, thumbnail):
@@ -524,7 +624,7 @@ class ScratchSession:
             "thumbnail": thumbnail,
         }
 
-        requests.post(
+        self.transport.post(
             f"https://backpack.scratch.mit.edu/{self.username}",
             headers=self._headers,
             data=json.dumps(data),
@@ -533,13 +633,13 @@ class ScratchSession:
         return BackpackItem(data, self)
 
     def get_statistics(self):
-        overall = requests.get(
+        overall = self.transport.get(
             "https://scratch.mit.edu/statistics/data/daily/",
         ).json()
-        last_month = requests.get(
+        last_month = self.transport.get(
             "https://scratch.mit.edu/statistics/data/monthly-ga/",
         ).json()
-        over_time = requests.get(
+        over_time = self.transport.get(
             "https://scratch.mit.edu/statistics/data/monthly/"
         ).json()
         del overall["_TS"]
@@ -553,7 +653,7 @@ class ScratchSession:
         }
 
     def is_valid_username(self, username):
-        response = requests.get(
+        response = self.transport.get(
             f"https://scratch.mit.edu/accounts/check_username/{username}/",
         ).json()
 
@@ -562,3 +662,523 @@ class ScratchSession:
     def _ensure_logged_in(self):
         if not self.logged_in:
             raise UnauthorizedException("You need to be logged in to do this")
+
+
+class AsyncScratchSession:
+    """
+    The asyncio version of ScratchSession, which returns AsyncUser, AsyncProject, and so on
+    Nothing is sent until connect is awaited, or until the session is used with async with
+    """
+
+    def __init__(
+        self, username=None, password=None, session_id=None, token=None, transport=None
+    ):
+        self.transport = transport or AsyncHTTPTransport()
+        self.page_workers = 1
+        self.logged_in = False
+        self.username = username
+        self.session_id = session_id
+        self.csrf_token = None
+        self.token = token
+        self.user = None
+        self._password = password
+        self._update_headers()
+
+    def _update_headers(self):
+        self._headers = {
+            "x-csrftoken": self.csrf_token,
+            "X-Token": self.token,
+            "x-requested-with": "XMLHttpRequest",
+            "Cookie": f"scratchcsrftoken={self.csrf_token};scratchlanguage=en;scratchsessionsid={self.session_id};",
+            "referer": f"https://scratch.mit.edu/",
+        }
+
+    async def connect(self):
+        if self._password:
+            await self.login(self._password)
+            self._password = None
+
+        if self.session_id or self.token:
+            if not self.csrf_token:
+                await self.get_csrf_token()
+            self.logged_in = True
+
+        self._update_headers()
+        self.user = await self.get_user(self.username) if self.logged_in else None
+        return self
+
+    async def close(self):
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def login(self, password):
+        headers = {
+            "x-csrftoken": "a",
+            "x-requested-with": "XMLHttpRequest",
+            "Cookie": "scratchcsrftoken=a;scratchlanguage=en;",
+            "referer": "https://scratch.mit.edu",
+            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.101 Safari/537.36",
+        }
+        data = json.dumps({"username": self.username, "password": password})
+
+        request = await self.transport.post(
+            "https://scratch.mit.edu/login/", data=data, headers=headers
+        )
+
+        try:
+            self.session_id = re.search('"(.*)"', request.headers["Set-Cookie"]).group()
+            self.token = request.json()[0]["token"]
+        except (AttributeError, KeyError):
+            raise InvalidCredentialsException("Your password or username is incorrect")
+
+        await self.get_csrf_token()
+
+    async def get_csrf_token(self):
+        headers = {
+            "x-requested-with": "XMLHttpRequest",
+            "Cookie": "scratchlanguage=en;permissions=%7B%7D;",
+            "referer": "https://scratch.mit.edu",
+        }
+
+        request = await self.transport.get(
+            "https://scratch.mit.edu/csrf_token/", headers=headers
+        )
+
+        self.csrf_token = re.search(
+            "scratchcsrftoken=(.*?);", request.headers["Set-Cookie"]
+        ).group(1)
+
+    async def logout(self):
+        self._ensure_logged_in()
+
+        await self.transport.post(
+            "https://scratch.mit.edu/accounts/logout/",
+            data={"csrfmiddlewaretoken": self.csrf_token},
+        )
+
+    async def check_password(self, password):
+        self._ensure_logged_in()
+
+        data = {
+            "csrfmiddlewaretoken": self.csrf_token,
+            "password": password,
+        }
+
+        response = await self.transport.post(
+            "https://scratch.mit.edu/accounts/check_password",
+            data=json.dumps(data),
+            headers=self._headers,
+        )
+
+        return response.json()["success"]
+
+    async def get_user(self, user, cache=True):
+        username = user.username if isinstance(user, (IncompleteUser, User)) else user
+        response = await self.transport.get(
+            f"https://api.scratch.mit.edu/users/{username}/",
+            headers=self._headers,
+            cache=cache,
+        )
+        return AsyncUser(response.json(), self)
+
+    async def get_project(self, project, cache=True):
+        project_id = (
+            project.id
+            if isinstance(project, (IncompleteProject, RemixtreeProject, Project))
+            else project
+        )
+        response = await self.transport.get(
+            f"https://api.scratch.mit.edu/projects/{project_id}/",
+            headers=self._headers,
+            cache=cache,
+        )
+        return AsyncProject(response.json(), self)
+
+    async def get_studio(self, studio, cache=True):
+        studio_id = (
+            studio.id if isinstance(studio, (IncompleteStudio, Studio)) else studio
+        )
+        response = await self.transport.get(
+            f"https://api.scratch.mit.edu/studios/{studio_id}/",
+            headers=self._headers,
+            cache=cache,
+        )
+        return AsyncStudio(response.json(), self)
+
+    async def get_news(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/news/",
+            News,
+            self.transport,
+            workers=self.page_workers,
+        )
+
+    def iter_news(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/news/",
+            News,
+            self.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_messages(self, all=False, limit=20, offset=0, filter=""):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/users/{self.username}/messages",
+            Message,
+            self.transport,
+            params=f"&filter={filter}",
+            headers=self._headers,
+            workers=self.page_workers,
+        )
+
+    def iter_messages(self, filter="", offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/messages",
+            Message,
+            self.transport,
+            params=f"&filter={filter}",
+            headers=self._headers,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    def create_cloud_connection(
+        self,
+        project_id,
+        cloud_host="clouddata.scratch.mit.edu",
+        headers={},
+        compression=False,
+        rate_limiter=None,
+        reconnect_policy=None,
+        ping_interval=20,
+        max_missed_pongs=3,
+    ):
+        return AsyncCloudConnection(
+            project_id,
+            self,
+            cloud_host,
+            headers,
+            compression,
+            rate_limiter=rate_limiter,
+            reconnect_policy=reconnect_policy,
+            ping_interval=ping_interval,
+            max_missed_pongs=max_missed_pongs,
+        )
+
+    async def explore_projects(self, mode="trending", query="*", language="en"):
+        response = await self.transport.get(
+            f"https://api.scratch.mit.edu/explore/projects/?mode={mode}&q={query}&language={language}"
+        )
+        return [AsyncProject(project, self) for project in response.json()]
+
+    async def explore_studios(self, mode="trending", query="*"):
+        response = await self.transport.get(
+            f"https://api.scratch.mit.edu/explore/studios/?mode={mode}&q={query}"
+        )
+        return [AsyncStudio(studio, self) for studio in response.json()]
+
+    async def search_projects(self, mode="popular", query="*", language="en"):
+        response = await self.transport.get(
+            f"https://api.scratch.mit.edu/search/projects/?mode={mode}&q={query}&language={language}"
+        )
+        return [AsyncProject(project, self) for project in response.json()]
+
+    async def search_studios(self, mode="popular", query="*"):
+        response = await self.transport.get(
+            f"https://api.scratch.mit.edu/search/studios/?mode={mode}&q={query}"
+        )
+        return [AsyncStudio(studio, self) for studio in response.json()]
+
+    async def get_front_page(self):
+        response = await self.transport.get(
+            "https://api.scratch.mit.edu/proxy/featured"
+        )
+        return _front_page(response.json())
+
+    async def get_activity(self, limit=5, offset=0):
+        self._ensure_logged_in()
+
+        response = await self.transport.get(
+            f"https://api.scratch.mit.edu/users/{self.username}/following/users/activity?limit={limit}&offset={offset}",
+            headers=self._headers,
+        )
+        return [Activity(activity) for activity in response.json()]
+
+    async def create_project(self, project):
+        self._ensure_logged_in()
+
+        response = await self.transport.post(
+            "https://projects.scratch.mit.edu/",
+            headers={
+                **self._headers,
+                "accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            data=json.dumps(project),
+        )
+
+        return int(response.json()["content-name"])
+
+    async def create_studio(self):
+        self._ensure_logged_in()
+
+        response = (
+            await self.transport.post(
+                "https://scratch.mit.edu/studios/create/",
+                headers={
+                    **self._headers,
+                    "referer": "https://scratch.mit.edu/mystuff/",
+                },
+                data=None,
+            )
+        ).json()
+
+        if response[0]["success"] == False:
+            if response[0]["errors"][0].startswith("Woah"):
+                raise RejectedException("You are creating studios too quickly")
+            else:
+                raise UnauthorizedException(
+                    "You need to be a Scratcher to create a studio"
+                )
+
+        return int(re.search("\d+", response["redirect"]).group())
+
+    async def empty_trash(self, password):
+        self._ensure_logged_in()
+
+        data = {
+            "models": [],
+            "csrfmiddlewaretoken": self.csrf_token,
+            "password": password,
+        }
+
+        await self.transport.put(
+            "https://scratch.mit.edu/site-api/projects/trashed/empty/",
+            headers=self._headers,
+            data=json.dumps(data),
+        )
+
+    async def get_own_projects(self, all=False, sort="", filter="all", page=1):
+        self._ensure_logged_in()
+
+        if all:
+            projects = []
+            while True:
+                response = await self.transport.get(
+                    f"https://scratch.mit.edu/site-api/projects/{filter}/?page={page}&ascsort=&descsort={sort}",
+                    headers=self._headers,
+                )
+
+                if response.status_code == 404:
+                    break
+
+                projects += response.json()
+                page += 1
+
+            return [
+                _mystuff_project(project, self, AsyncProject) for project in projects
+            ]
+
+        response = await self.transport.get(
+            f"https://scratch.mit.edu/site-api/projects/{filter}/?page={page}&ascsort=&descsort={sort}",
+            headers=self._headers,
+        )
+        return [
+            _mystuff_project(project, self, AsyncProject) for project in response.json()
+        ]
+
+    async def get_own_studios(self, all=False, sort="", page=1):
+        self._ensure_logged_in()
+
+        if all:
+            studios = []
+            while True:
+                response = await self.transport.get(
+                    f"https://scratch.mit.edu/site-api/galleries/all/?page={page}&ascsort=&descsort={sort}",
+                    headers=self._headers,
+                )
+
+                if response.status_code == 404:
+                    break
+
+                studios += response.json()
+                page += 1
+
+            return [_mystuff_studio(studio, self, AsyncStudio) for studio in studios]
+
+        response = await self.transport.get(
+            f"https://scratch.mit.edu/site-api/galleries/all/?page={page}&ascsort=&descsort={sort}",
+            headers=self._headers,
+        )
+        return [
+            _mystuff_studio(studio, self, AsyncStudio) for studio in response.json()
+        ]
+
+    async def upload_asset(self, asset, file_ext=None):
+        self._ensure_logged_in()
+
+        data = asset if isinstance(asset, bytes) else open(asset, "rb").read()
+
+        if isinstance(asset, str):
+            file_ext = pathlib.Path(asset).suffix
+
+        await self.transport.post(
+            f"https://assets.scratch.mit.edu/{hashlib.md5(data).hexdigest()}.{file_ext}",
+            headers=self._headers,
+            data=data,
+        )
+
+    async def change_country(self, country):
+        self._ensure_logged_in()
+
+        data = {
+            "csrfmiddlewaretoken": self.csrf_token,
+            "country": country,
+        }
+
+        await self.transport.post(
+            "https://scratch.mit.edu/accounts/settings/",
+            data=data,
+            headers=self._headers,
+        )
+
+    async def change_password(self, old_password, new_password):
+        self._ensure_logged_in()
+
+        data = {
+            "csrfmiddlewaretoken": self.csrf_token,
+            "old_password": old_password,
+            "new_password1": new_password,
+            "new_password2": new_password,
+        }
+
+        await self.transport.post(
+            "https://scratch.mit.edu/accounts/password_change/",
+            data=data,
+            headers=self._headers,
+        )
+
+    async def change_email(self, new_email, password):
+        self._ensure_logged_in()
+
+        data = {
+            "csrfmiddlewaretoken": self.csrf_token,
+            "email_address": new_email,
+            "password": password,
+        }
+
+        await self.transport.post(
+            "https://scratch.mit.edu/accounts/email_change/",
+            data=data,
+            headers=self._headers,
+        )
+
+    async def change_email_subscription(self, activities=False, teacher_tips=False):
+        self._ensure_logged_in()
+
+        data = {
+            "csrfmiddlewaretoken": self.csrf_token,
+        }
+
+        if activities:
+            data["activites"] = "on"
+        if teacher_tips:
+            data["teacher_tips"] = "on"
+
+        await self.transport.post(
+            "https://scratch.mit.edu/accounts/settings/update_subscription/",
+            data=data,
+            headers=self._headers,
+        )
+
+    async def get_backpack(self, all=False, limit=20, offset=0):
+        self._ensure_logged_in()
+
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://backpack.scratch.mit.edu/{self.username}",
+            lambda item: AsyncBackpackItem(item, self),
+            self.transport,
+            headers=self._headers,
+            workers=self.page_workers,
+        )
+
+    def iter_backpack(self, offset=0, prefetch=False):
+        self._ensure_logged_in()
+
+        return async_iter_data_list(
+            f"https://backpack.scratch.mit.edu/{self.username}",
+            lambda item: AsyncBackpackItem(item, self),
+            self.transport,
+            headers=self._headers,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def add_to_backpack(self, item_type, body, mime_type, name, thumbnail):
+        self._ensure_logged_in()
+
+        data = {
+            "type": item_type,
+            "body": body,
+            "mime_type": mime_type,
+            "name": name,
+            "thumbnail": thumbnail,
+        }
+
+        await self.transport.post(
+            f"https://backpack.scratch.mit.edu/{self.username}",
+            headers=self._headers,
+            data=json.dumps(data),
+        )
+
+        return AsyncBackpackItem(data, self)
+
+    async def get_statistics(self):
+        # The three requests are sent at the same time
+        overall, last_month, over_time = [
+            response.json()
+            for response in await asyncio.gather(
+                self.transport.get("https://scratch.mit.edu/statistics/data/daily/"),
+                self.transport.get(
+                    "https://scratch.mit.edu/statistics/data/monthly-ga/"
+                ),
+                self.transport.get("https://scratch.mit.edu/statistics/data/monthly/"),
+            )
+        ]
+        del overall["_TS"]
+        del last_month["_TS"]
+        del over_time["_TS"]
+
+        return {
+            **over_time,
+            "overall": overall,
+            "last_month": last_month,
+        }
+
+    async def is_valid_username(self, username):
+        response = (
+            await self.transport.get(
+                f"https://scratch.mit.edu/accounts/check_username/{username}/",
+            )
+        ).json()
+
+        return response[0]["msg"] == "valid username"
+
+    def _ensure_logged_in(self):
+        if not self.logged_in:
+            raise UnauthorizedException("You need to be logged in to do this")
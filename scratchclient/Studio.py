@@ -1,11 +1,15 @@
-import requests
 import json
 
-from .Comment import StudioComment
+from .Comment import StudioComment, AsyncStudioComment
 from .Activity import Activity
 from .Incomplete import IncompleteProject
 from .ScratchExceptions import *
-from .util import get_data_list
+from .util import (
+    get_data_list,
+    async_get_data_list,
+    iter_data_list,
+    async_iter_data_list,
+)
 
 
 class Studio:
@@ -62,7 +66,7 @@ class Studio:
         headers = self._headers
         headers["referer"] = f"https://scratch.mit.edu/projects/{project_id}/"
 
-        response = requests.post(
+        response = self._client.transport.post(
             f"https://api.scratch.mit.edu/studios/{self.id}/project/{project_id}/",
             headers=headers,
         )
@@ -77,7 +81,7 @@ class Studio:
         headers = self._headers.copy()
         headers["referer"] = f"https://scratch.mit.edu/projects/{project_id}/"
 
-        response = requests.delete(
+        response = self._client.transport.delete(
             f"https://api.scratch.mit.edu/studios/{self.id}/project/{project_id}/",
             headers=headers,
         )
@@ -92,6 +96,17 @@ class Studio:
             offset,
             f"https://api.scratch.mit.edu/studios/{self.id}/projects",
             lambda project: IncompleteProject(project),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_projects(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/projects",
+            lambda project: IncompleteProject(project),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_curators(self, all=False, limit=20, offset=0):
@@ -101,6 +116,17 @@ class Studio:
             offset,
             f"https://api.scratch.mit.edu/studios/{self.id}/curators",
             lambda curator: User(curator, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_curators(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/curators",
+            lambda curator: User(curator, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_managers(self, all=False, limit=20, offset=0):
@@ -110,19 +136,30 @@ class Studio:
             offset,
             f"https://api.scratch.mit.edu/studios/{self.id}/managers",
             lambda manager: User(manager, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_managers(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/managers",
+            lambda manager: User(manager, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_roles(self):
         self._client._ensure_logged_in()
 
-        return requests.get(
+        return self._client.transport.get(
             f"https://api.scratch.mit.edu/studios/{self.id}/users/{self._client.username}"
         ).json()
 
     def follow(self):
         self._client._ensure_logged_in()
 
-        return requests.put(
+        return self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/bookmarkers/{self.id}/add/?usernames={self._client.username}",
             headers=self._headers,
         ).json()
@@ -130,7 +167,7 @@ class Studio:
     def unfollow(self):
         self._client._ensure_logged_in()
 
-        return requests.put(
+        return self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/bookmarkers/{self.id}/remove/?usernames={self._client.username}",
             headers=self._headers,
         ).json()
@@ -138,7 +175,7 @@ class Studio:
     def open_to_public(self):
         self._client._ensure_logged_in()
 
-        response = requests.put(
+        response = self._client.transport.put(
             f"https://scratch.mit.edu/site-api/galleries/{self.id}/mark/open/",
             headers=self._headers,
         )
@@ -149,7 +186,7 @@ class Studio:
     def close_to_public(self):
         self._client._ensure_logged_in()
 
-        response = requests.put(
+        response = self._client.transport.put(
             f"https://scratch.mit.edu/site-api/galleries/{self.id}/mark/open/",
             headers=self._headers,
         )
@@ -163,7 +200,7 @@ class Studio:
         headers = self._headers.copy()
         headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/comments/"
 
-        response = requests.post(
+        response = self._client.transport.post(
             f"https://scratch.mit.edu/site-api/comments/gallery/{self.id}/toggle-comments/",
             headers=headers,
         )
@@ -172,7 +209,7 @@ class Studio:
             raise UnauthorizedException("You are not allowed to do this")
 
     def get_comment(self, comment_id):
-        data = requests.get(
+        data = self._client.transport.get(
             f"https://api.scratch.mit.edu/studios/{self.id}/comments/{comment_id}/"
         ).json()
         return StudioComment(self, data, self._client)
@@ -184,6 +221,17 @@ class Studio:
             offset,
             f"https://api.scratch.mit.edu/studios/{self.id}/comments",
             lambda comment: StudioComment(self, comment, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_comments(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/comments",
+            lambda comment: StudioComment(self, comment, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_activity(self, all=False, limit=20, offset=0):
@@ -193,6 +241,17 @@ class Studio:
             offset,
             f"https://api.scratch.mit.edu/studios/{self.id}/activity",
             Activity,
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_activity(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/activity",
+            Activity,
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def post_comment(self, content, parent_id="", commentee_id=""):
@@ -209,7 +268,7 @@ class Studio:
             "parent_id": parent_id,
         }
 
-        response = requests.post(
+        response = self._client.transport.post(
             f"https://scratch.mit.edu/site-api/comments/gallery/{self.id}/add/",
             headers=headers,
             data=json.dumps(data),
@@ -227,7 +286,7 @@ class Studio:
         headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/comments/"
         data = {"id": comment_id}
 
-        response = requests.post(
+        response = self._client.transport.post(
             f"https://scratch.mit.edu/site-api/comments/gallery/{self.id}/del/",
             headers=headers,
             data=json.dumps(data),
@@ -243,7 +302,7 @@ class Studio:
         headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/comments/"
 
         data = {"id": comment_id}
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/site-api/comments/gallery/{self.id}/rep/",
             headers=headers,
             data=json.dumps(data),
@@ -256,7 +315,7 @@ class Studio:
         headers = self._headers.copy()
         headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/curators/"
 
-        response = requests.put(
+        response = self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/curators-in/{self.id}/invite_curator/?usernames={username}",
             headers=headers,
         )
@@ -271,7 +330,7 @@ class Studio:
         headers = self._headers.copy()
         headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/curators/"
 
-        response = requests.put(
+        response = self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/curators-in/{self.id}/add/?usernames={username}",
             headers=headers,
         )
@@ -286,7 +345,7 @@ class Studio:
         headers = self._headers.copy()
         headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/curators/"
 
-        response = requests.put(
+        response = self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/curators-in/{self.id}/promote/?usernames={username}",
             headers=headers,
         )
@@ -300,7 +359,7 @@ class Studio:
         username = username = user if isinstance(user, str) else user.username
         body = {"password": password}
 
-        response = requests.put(
+        response = self._client.transport.put(
             f"https://api.scratch.mit.edu/studios/{self.id}/transfer/{username}",
             headers=self._headers,
             body=body,
@@ -316,7 +375,7 @@ class Studio:
             raise UnauthorizedException("You are not allowed to do this")
 
         data = {"description": content}
-        requests.put(
+        self._client.transport.put(
             f"https://scratch.mit.edu/site-api/galleries/all/{self.id}/",
             headers=self._headers,
             data=json.dumps(data),
@@ -330,7 +389,7 @@ class Studio:
             raise UnauthorizedException("You are not allowed to do this")
 
         data = {"title": content}
-        requests.put(
+        self._client.transport.put(
             f"https://scratch.mit.edu/site-api/galleries/all/{self.id}/",
             headers=self._headers,
             data=json.dumps(data),
@@ -348,7 +407,7 @@ class Studio:
             if isinstance(file_or_data, bytes)
             else open(file_or_data, "rb").read()
         )
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/site-api/galleries/all/{self.id}",
             data=data,
             headers=self._headers,
@@ -362,8 +421,390 @@ class Studio:
 
         data = {"visibility": "delbyusr"}
 
-        requests.put(
+        self._client.transport.put(
             f"https://scratch.mit.edu/site-api/galleries/all/{self.id}/",
             data=json.dumps(data),
             headers=self._json_headers,
         )
+
+
+class AsyncStudio(Studio):
+    def __init__(self, data, client):
+        global AsyncUser
+        from .User import AsyncUser
+
+        super().__init__(data, client)
+
+    async def add_project(self, project):
+        self._client._ensure_logged_in()
+
+        project_id = project if isinstance(project, (str, int)) else project.id
+        headers = self._headers.copy()
+        headers["referer"] = f"https://scratch.mit.edu/projects/{project_id}/"
+
+        response = await self._client.transport.post(
+            f"https://api.scratch.mit.edu/studios/{self.id}/project/{project_id}/",
+            headers=headers,
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def remove_project(self, project):
+        self._client._ensure_logged_in()
+
+        project_id = project if isinstance(project, (str, int)) else project.id
+        headers = self._headers.copy()
+        headers["referer"] = f"https://scratch.mit.edu/projects/{project_id}/"
+
+        response = await self._client.transport.delete(
+            f"https://api.scratch.mit.edu/studios/{self.id}/project/{project_id}/",
+            headers=headers,
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def get_projects(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/studios/{self.id}/projects",
+            lambda project: IncompleteProject(project),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_projects(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/projects",
+            lambda project: IncompleteProject(project),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_curators(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/studios/{self.id}/curators",
+            lambda curator: AsyncUser(curator, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_curators(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/curators",
+            lambda curator: AsyncUser(curator, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_managers(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/studios/{self.id}/managers",
+            lambda manager: AsyncUser(manager, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_managers(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/managers",
+            lambda manager: AsyncUser(manager, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_roles(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.get(
+            f"https://api.scratch.mit.edu/studios/{self.id}/users/{self._client.username}"
+        )
+        return response.json()
+
+    async def follow(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/bookmarkers/{self.id}/add/?usernames={self._client.username}",
+            headers=self._headers,
+        )
+        return response.json()
+
+    async def unfollow(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/bookmarkers/{self.id}/remove/?usernames={self._client.username}",
+            headers=self._headers,
+        )
+        return response.json()
+
+    async def open_to_public(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/galleries/{self.id}/mark/open/",
+            headers=self._headers,
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def close_to_public(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/galleries/{self.id}/mark/closed/",
+            headers=self._headers,
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def toggle_commenting(self):
+        self._client._ensure_logged_in()
+
+        headers = self._headers.copy()
+        headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/comments/"
+
+        response = await self._client.transport.post(
+            f"https://scratch.mit.edu/site-api/comments/gallery/{self.id}/toggle-comments/",
+            headers=headers,
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def get_comment(self, comment_id):
+        data = (
+            await self._client.transport.get(
+                f"https://api.scratch.mit.edu/studios/{self.id}/comments/{comment_id}/"
+            )
+        ).json()
+        return AsyncStudioComment(self, data, self._client)
+
+    async def get_comments(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/studios/{self.id}/comments",
+            lambda comment: AsyncStudioComment(self, comment, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_comments(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/comments",
+            lambda comment: AsyncStudioComment(self, comment, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_activity(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/studios/{self.id}/activity",
+            Activity,
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_activity(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/studios/{self.id}/activity",
+            Activity,
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def post_comment(self, content, parent_id="", commentee_id=""):
+        self._client._ensure_logged_in()
+
+        if not self.comments_allowed:
+            raise UnauthorizedException("Comments are closed in this studio")
+
+        headers = self._headers.copy()
+        headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/comments/"
+        data = {
+            "commentee_id": commentee_id,
+            "content": content,
+            "parent_id": parent_id,
+        }
+
+        response = (
+            await self._client.transport.post(
+                f"https://scratch.mit.edu/site-api/comments/gallery/{self.id}/add/",
+                headers=headers,
+                data=json.dumps(data),
+            )
+        ).json()
+
+        if "rejected" in response:
+            raise RejectedException("Your comment did not post")
+
+        return AsyncStudioComment(self, response, self._client)
+
+    async def delete_comment(self, comment_id):
+        self._client._ensure_logged_in()
+
+        headers = self._headers.copy()
+        headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/comments/"
+        data = {"id": comment_id}
+
+        response = await self._client.transport.post(
+            f"https://scratch.mit.edu/site-api/comments/gallery/{self.id}/del/",
+            headers=headers,
+            data=json.dumps(data),
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def report_comment(self, comment_id):
+        self._client._ensure_logged_in()
+
+        headers = self._headers.copy()
+        headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/comments/"
+
+        data = {"id": comment_id}
+        await self._client.transport.post(
+            f"https://scratch.mit.edu/site-api/comments/gallery/{self.id}/rep/",
+            headers=headers,
+            data=json.dumps(data),
+        )
+
+    async def invite_curator(self, user):
+        self._client._ensure_logged_in()
+
+        username = user if isinstance(user, str) else user.username
+        headers = self._headers.copy()
+        headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/curators/"
+
+        response = await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/curators-in/{self.id}/invite_curator/?usernames={username}",
+            headers=headers,
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def accept_curator(self):
+        self._client._ensure_logged_in()
+
+        headers = self._headers.copy()
+        headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/curators/"
+
+        response = await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/curators-in/{self.id}/add/?usernames={self._client.username}",
+            headers=headers,
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def promote_curator(self, user):
+        self._client._ensure_logged_in()
+
+        username = user if isinstance(user, str) else user.username
+        headers = self._headers.copy()
+        headers["referer"] = f"https://scratch.mit.edu/studios/{self.id}/curators/"
+
+        response = await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/curators-in/{self.id}/promote/?usernames={username}",
+            headers=headers,
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def transfer_host(self, user, password):
+        self._client._ensure_logged_in()
+
+        username = user if isinstance(user, str) else user.username
+        data = {"password": password}
+
+        response = await self._client.transport.put(
+            f"https://api.scratch.mit.edu/studios/{self.id}/transfer/{username}",
+            headers=self._headers,
+            data=json.dumps(data),
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do this")
+
+    async def set_description(self, content):
+        self._client._ensure_logged_in()
+
+        if self.host != self._client.user.id:
+            raise UnauthorizedException("You are not allowed to do this")
+
+        data = {"description": content}
+        await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/galleries/all/{self.id}/",
+            headers=self._headers,
+            data=json.dumps(data),
+        )
+        self.description = content
+
+    async def set_title(self, content):
+        self._client._ensure_logged_in()
+
+        if self.host != self._client.user.id:
+            raise UnauthorizedException("You are not allowed to do this")
+
+        data = {"title": content}
+        await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/galleries/all/{self.id}/",
+            headers=self._headers,
+            data=json.dumps(data),
+        )
+        self.title = content
+
+    async def set_thumbnail(self, file_or_data):
+        self._client._ensure_logged_in()
+
+        if self.host != self._client.user.id:
+            raise UnauthorizedException("You are not allowed to do this")
+
+        data = (
+            file_or_data
+            if isinstance(file_or_data, bytes)
+            else open(file_or_data, "rb").read()
+        )
+        await self._client.transport.post(
+            f"https://scratch.mit.edu/site-api/galleries/all/{self.id}",
+            data=data,
+            headers=self._headers,
+        )
+
+    async def delete(self):
+        self._client._ensure_logged_in()
+
+        if self.host != self._client.user.id:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"visibility": "delbyusr"}
+
+        await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/galleries/all/{self.id}/",
+            data=json.dumps(data),
+            headers=self._headers,
+        )
@@ -1,10 +1,14 @@
-import requests
 import json
 
 from .ScratchExceptions import UnauthorizedException
 from .UserProfile import *
-from .Comment import ProjectComment
-from .util import get_data_list
+from .Comment import ProjectComment, AsyncProfileComment
+from .util import (
+    get_data_list,
+    async_get_data_list,
+    iter_data_list,
+    async_iter_data_list,
+)
 
 
 class User:
@@ -39,6 +43,20 @@ class User:
                 {**project, "author": {**project["author"], "username": self.username}},
                 self._client,
             ),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_projects(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/projects",
+            lambda project: Project(
+                {**project, "author": {**project["author"], "username": self.username}},
+                self._client,
+            ),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_curating(self, all=False, limit=20, offset=0):
@@ -48,6 +66,17 @@ class User:
             offset,
             f"https://api.scratch.mit.edu/users/{self.username}/studios/curate",
             lambda studio: Studio(studio, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_curating(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/studios/curate",
+            lambda studio: Studio(studio, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_favorites(self, all=False, limit=20, offset=0):
@@ -57,6 +86,17 @@ class User:
             offset,
             f"https://api.scratch.mit.edu/users/{self.username}/favorites",
             lambda project: Project(project, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_favorites(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/favorites",
+            lambda project: Project(project, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_followers(self, all=False, limit=20, offset=0):
@@ -66,6 +106,17 @@ class User:
             offset,
             f"https://api.scratch.mit.edu/users/{self.username}/followers",
             lambda follower: User(follower, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_followers(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/followers",
+            lambda follower: User(follower, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_following(self, all=False, limit=20, offset=0):
@@ -75,10 +126,21 @@ class User:
             offset,
             f"https://api.scratch.mit.edu/users/{self.username}/following",
             lambda follower: User(follower, self._client),
+            transport=self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_following(self, offset=0, prefetch=False):
+        return iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/following",
+            lambda follower: User(follower, self._client),
+            transport=self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
         )
 
     def get_message_count(self):
-        return requests.get(
+        return self._client.transport.get(
             f"https://api.scratch.mit.edu/users/{self.username}/messages/count/",
             headers={
                 "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.101 Safari/537.36",
@@ -93,7 +155,7 @@ class User:
             "content": content,
             "parent_id": parent_id,
         }
-        response = requests.post(
+        response = self._client.transport.post(
             f"https://scratch.mit.edu/site-api/comments/user/{self.username}/add",
             headers=self._headers,
             data=json.dumps(data),
@@ -116,7 +178,7 @@ class User:
         self._client._ensure_logged_in()
 
         data = {"selected_field": field}
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/site-api/users/all/{self.username}/report",
             headers=self._headers,
             data=json.dumps(data),
@@ -128,7 +190,7 @@ class User:
         if self.username != self._client.username:
             raise UnauthorizedException("You are not allowed to do that")
 
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/site-api/comments/user/{self.username}/toggle-comments/",
             headers=self._headers,
         )
@@ -136,7 +198,7 @@ class User:
     def follow(self):
         self._client._ensure_logged_in()
 
-        return requests.put(
+        return self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/followers/{self.username}/add/?usernames={self._client.username}",
             headers=self._headers,
         ).json()
@@ -144,7 +206,199 @@ class User:
     def unfollow(self):
         self._client._ensure_logged_in()
 
-        return requests.put(
+        return self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/followers/{self.username}/remove/?usernames={self._client.username}",
             headers=self._headers,
         ).json()
+
+
+class AsyncUser(User):
+    def __init__(self, data, client):
+        global AsyncProject
+        global AsyncStudio
+        from .Project import AsyncProject
+        from .Studio import AsyncStudio
+
+        super().__init__(data, client)
+        self.profile = AsyncUserProfile(data["profile"], self)
+
+    async def get_projects(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/users/{self.username}/projects",
+            lambda project: AsyncProject(
+                {**project, "author": {**project["author"], "username": self.username}},
+                self._client,
+            ),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_projects(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/projects",
+            lambda project: AsyncProject(
+                {**project, "author": {**project["author"], "username": self.username}},
+                self._client,
+            ),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_curating(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/users/{self.username}/studios/curate",
+            lambda studio: AsyncStudio(studio, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_curating(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/studios/curate",
+            lambda studio: AsyncStudio(studio, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_favorites(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/users/{self.username}/favorites",
+            lambda project: AsyncProject(project, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_favorites(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/favorites",
+            lambda project: AsyncProject(project, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_followers(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/users/{self.username}/followers",
+            lambda follower: AsyncUser(follower, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_followers(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/followers",
+            lambda follower: AsyncUser(follower, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_following(self, all=False, limit=20, offset=0):
+        return await async_get_data_list(
+            all,
+            limit,
+            offset,
+            f"https://api.scratch.mit.edu/users/{self.username}/following",
+            lambda follower: AsyncUser(follower, self._client),
+            self._client.transport,
+            workers=self._client.page_workers,
+        )
+
+    def iter_following(self, offset=0, prefetch=False):
+        return async_iter_data_list(
+            f"https://api.scratch.mit.edu/users/{self.username}/following",
+            lambda follower: AsyncUser(follower, self._client),
+            self._client.transport,
+            offset=offset,
+            prefetch=prefetch,
+        )
+
+    async def get_message_count(self):
+        response = await self._client.transport.get(
+            f"https://api.scratch.mit.edu/users/{self.username}/messages/count/",
+            headers={
+                "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.101 Safari/537.36",
+            },
+        )
+        return response.json()["count"]
+
+    async def post_comment(self, content, parent_id="", commentee_id=""):
+        self._client._ensure_logged_in()
+
+        data = {
+            "commentee_id": commentee_id,
+            "content": content,
+            "parent_id": parent_id,
+        }
+        response = await self._client.transport.post(
+            f"https://scratch.mit.edu/site-api/comments/user/{self.username}/add",
+            headers=self._headers,
+            data=json.dumps(data),
+        )
+
+        if response.status_code == 403:
+            raise UnauthorizedException("You are not allowed to do that")
+
+    async def delete_comment(self, comment_id):
+        return await AsyncProfileComment._comment_action(
+            None, "del", comment_id, self.username, self._client
+        )
+
+    async def report_comment(self, comment_id):
+        return await AsyncProfileComment._comment_action(
+            None, "rep", comment_id, self.username, self._client
+        )
+
+    async def report(self, field):
+        self._client._ensure_logged_in()
+
+        data = {"selected_field": field}
+        await self._client.transport.post(
+            f"https://scratch.mit.edu/site-api/users/all/{self.username}/report",
+            headers=self._headers,
+            data=json.dumps(data),
+        )
+
+    async def toggle_commenting(self):
+        self._client._ensure_logged_in()
+
+        if self.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        await self._client.transport.post(
+            f"https://scratch.mit.edu/site-api/comments/user/{self.username}/toggle-comments/",
+            headers=self._headers,
+        )
+
+    async def follow(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/followers/{self.username}/add/?usernames={self._client.username}",
+            headers=self._headers,
+        )
+        return response.json()
+
+    async def unfollow(self):
+        self._client._ensure_logged_in()
+
+        response = await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/followers/{self.username}/remove/?usernames={self._client.username}",
+            headers=self._headers,
+        )
+        return response.json()
@@ -1,9 +1,9 @@
-import requests
 import json
 import pathlib
 
 from .Project import Project
 from .Incomplete import IncompleteProject, RemixtreeProject
+from .ScratchExceptions import UnauthorizedException
 
 class UserProfile:
     def __init__(self, data, user):
@@ -24,7 +24,7 @@ class UserProfile:
 
         data = {"bio": content}
 
-        requests.put(
+        self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
             data=json.dumps(data),
             headers=self.user._headers,
@@ -40,7 +40,7 @@ class UserProfile:
 
         data = {"status": content}
 
-        requests.put(
+        self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
             data=json.dumps(data),
             headers=self.user._headers,
@@ -62,14 +62,14 @@ class UserProfile:
             ),
         }
 
-        requests.post(
+        self._client.transport.post(
             f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
             files=files,
             headers=self.user._headers,
         )
 
     def get_featured_project(self):
-        data = requests.get(
+        data = self._client.transport.get(
             f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
         ).json()
 
@@ -94,8 +94,100 @@ class UserProfile:
         project_id = project.id if isinstance(project, (Project, IncompleteProject, RemixtreeProject)) else project
         data = {"featured_project": project_id, "featured_project_label": label_num}
 
-        requests.put(
+        self._client.transport.put(
             f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
             data=json.dumps(data),
             headers=self._headers,
         )
+
+
+class AsyncUserProfile(UserProfile):
+    async def set_bio(self, content):
+        self._client._ensure_logged_in()
+
+        if self.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"bio": content}
+
+        await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
+            data=json.dumps(data),
+            headers=self.user._headers,
+        )
+
+        self.bio = content
+
+    async def set_status(self, content):
+        self._client._ensure_logged_in()
+
+        if self.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        data = {"status": content}
+
+        await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
+            data=json.dumps(data),
+            headers=self.user._headers,
+        )
+
+        self.status = content
+
+    async def set_avatar(self, filename):
+        self._client._ensure_logged_in()
+
+        if self.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        files = {
+            "file": (
+                filename,
+                open(filename, "rb"),
+                f"image/{pathlib.Path(filename).suffix}",
+            ),
+        }
+
+        await self._client.transport.post(
+            f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
+            files=files,
+            headers=self.user._headers,
+        )
+
+    async def get_featured_project(self):
+        data = (
+            await self._client.transport.get(
+                f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
+            )
+        ).json()
+
+        return IncompleteProject(data["featured_project_data"])
+
+    async def set_featured_project(self, label, project):
+        self._client._ensure_logged_in()
+
+        if self.username != self._client.username:
+            raise UnauthorizedException("You are not allowed to do that")
+
+        label_num = (
+            {
+                "featured_project": "",
+                "featured_tutorial": 0,
+                "work_in_progress": 1,
+                "remix_this": 2,
+                "my_favorite_things": 3,
+                "why_i_scratch": 4,
+            }
+        )[label]
+        project_id = (
+            project.id
+            if isinstance(project, (Project, IncompleteProject, RemixtreeProject))
+            else project
+        )
+        data = {"featured_project": project_id, "featured_project_label": label_num}
+
+        await self._client.transport.put(
+            f"https://scratch.mit.edu/site-api/users/all/{self.username}/",
+            data=json.dumps(data),
+            headers=self.user._headers,
+        )
@@ -7,10 +7,11 @@ scratchclient used to use https://pypi.org/project/websocket-client/ but this wa
 - It doesn't support asyncio, which is something I wanted; I found https://pypi.org/project/websockets/ but using both seemed like overkill
 - The WebSocket protocol is pretty simple, so it seemed pointless to introduce a dependency for it
 
-This does not implement the full protocol but it is enough for the purposes of this library. Some features (namely fragmenting) are not included.
+This does not implement the full protocol but it is enough for the purposes of this library.
 """
 
 import socket
+import threading
 import base64
 import secrets
 import struct
@@ -20,15 +21,56 @@ import urllib.parse
 import re
 import hashlib
 import asyncio
+import zlib
 from enum import IntEnum
 
 GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+RECV_BUFFER_SIZE = 65536
+
+
+def _xor_mask_python(data, mask):
+    # XOR the whole payload as one big integer instead of byte by byte
+    length = len(data)
+    full_mask = mask * (length // 4) + mask[: length % 4]
+    return (
+        int.from_bytes(data, byteorder="big")
+        ^ int.from_bytes(full_mask, byteorder="big")
+    ).to_bytes(length, byteorder="big")
+
+
+def _xor_mask_numpy(data, mask):
+    data_array = numpy.frombuffer(data, dtype=numpy.uint8)
+    mask_array = numpy.resize(numpy.frombuffer(mask, dtype=numpy.uint8), len(data))
+    return numpy.bitwise_xor(data_array, mask_array).tobytes()
+
+
+def _xor_mask_wsaccel(data, mask):
+    return XorMaskerSimple(mask).process(data)
+
+
+# The fastest backend available is picked at import time
+# Install scratchclient[fast] to get the faster ones
+try:
+    from wsaccel.xormask import XorMaskerSimple
+
+    MASK_BACKEND = "wsaccel"
+    _xor_mask = _xor_mask_wsaccel
+except ImportError:
+    try:
+        import numpy
+
+        MASK_BACKEND = "numpy"
+        _xor_mask = _xor_mask_numpy
+    except ImportError:
+        MASK_BACKEND = "python"
+        _xor_mask = _xor_mask_python
 
 
 def xor_mask(data, mask):
-    encoded = data.encode("utf-8")
-    data_bytes = struct.unpack(f"{len(encoded)}c", encoded)
-    return bytes(ord(byte) ^ mask[idx % 4] for idx, byte in enumerate(data_bytes))
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    return _xor_mask(bytes(data), mask)
 
 
 class Status(IntEnum):
@@ -73,11 +115,14 @@ class Frame:
         self.rsv3 = rsv3
 
     @staticmethod
-    def encode(data, opcode=Opcode.TEXT, masked=1):
+    def encode(data, opcode=Opcode.TEXT, masked=1, fin=1, rsv1=0):
         # https://datatracker.ietf.org/doc/html/rfc6455#section-5.2
-        fin, rsv1, rsv2, rsv3 = 1, 0, 0, 0
+        rsv2, rsv3 = 0, 0
         header = bytes([opcode | rsv3 << 4 | rsv2 << 5 | rsv1 << 6 | fin << 7])
 
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
         length = len(data)
         len_bytes = bytes(
             [
@@ -93,11 +138,39 @@ class Frame:
                 len_bytes += struct.pack("!H", length)
 
         if not masked:
-            return header + len_bytes + data.encode("utf-8")
+            return header + len_bytes + data
 
         mask = secrets.token_bytes(4)
         return header + len_bytes + mask + xor_mask(data, mask)
 
+    @staticmethod
+    def encode_message(data, max_frame_size=None, masked=1, compression=None):
+        # Yields the frames of a message, split into fragments if it's too big
+        # https://datatracker.ietf.org/doc/html/rfc6455#section-5.4
+        opcode = Opcode.BINARY if isinstance(data, (bytes, bytearray)) else Opcode.TEXT
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        # Only the first frame of a compressed message has RSV1 set
+        rsv1 = 0
+        if compression:
+            data = compression.compress(data)
+            rsv1 = 1
+
+        if not max_frame_size or len(data) <= max_frame_size:
+            yield Frame.encode(data, opcode, masked, 1, rsv1)
+            return
+
+        view = memoryview(data)
+        for start in range(0, len(view), max_frame_size):
+            yield Frame.encode(
+                view[start : start + max_frame_size],
+                opcode if start == 0 else Opcode.CONT,
+                masked,
+                int(start + max_frame_size >= len(view)),
+                rsv1 if start == 0 else 0,
+            )
+
     @staticmethod
     def decode_beginning(response):
         header = response[0]
@@ -130,9 +203,209 @@ class Frame:
         return Frame(length, data_start, opcode, fin, rsv1, rsv2, rsv3), None
 
 
-class Websocket:
+class FrameBuffer:
+    """
+    Holds data received from the socket until it makes up complete frames
+    Several frames can arrive in one read and a frame can be split across reads
+    """
+
     def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def __len__(self):
+        return len(self._buffer) - self._position
+
+    def feed(self, data):
+        # Drop the data that has already been parsed before growing the buffer
+        if self._position:
+            del self._buffer[: self._position]
+            self._position = 0
+
+        self._buffer += data
+
+    def read_frame(self):
+        # Returns (frame, payload) or (None, None) if no complete frame is buffered
+        available = len(self)
+        if available < 2:
+            return None, None
+
+        length_byte = self._buffer[self._position + 1] & 0x7F
+        header_length = 10 if length_byte == 127 else 4 if length_byte == 126 else 2
+        if available < header_length:
+            return None, None
+
+        frame, err = Frame.decode_beginning(
+            self._buffer[self._position : self._position + header_length]
+        )
+        if err:
+            raise err
+
+        end = self._position + frame.data_start + frame.length
+        if end > len(self._buffer):
+            return None, None
+
+        payload = bytes(self._buffer[self._position + frame.data_start : end])
+        self._position = end
+
+        return frame, payload
+
+
+class PerMessageDeflate:
+    """
+    The permessage-deflate extension, which compresses every message
+    https://datatracker.ietf.org/doc/html/rfc7692
+    """
+
+    def __init__(
+        self,
+        client_no_context_takeover=False,
+        server_no_context_takeover=False,
+        client_max_window_bits=None,
+        server_max_window_bits=None,
+        compression_level=zlib.Z_DEFAULT_COMPRESSION,
+    ):
+        self.client_no_context_takeover = client_no_context_takeover
+        self.server_no_context_takeover = server_no_context_takeover
+        self.client_max_window_bits = client_max_window_bits
+        self.server_max_window_bits = server_max_window_bits
+        self.compression_level = compression_level
+
+        self._window_bits = client_max_window_bits or 15
+        self._compressor = None
+        self._decompressor = None
+
+    def offer(self):
+        params = ["permessage-deflate"]
+        if self.client_no_context_takeover:
+            params.append("client_no_context_takeover")
+        if self.server_no_context_takeover:
+            params.append("server_no_context_takeover")
+        if self.server_max_window_bits:
+            params.append(f"server_max_window_bits={self.server_max_window_bits}")
+
+        # This tells the server that it's allowed to limit our window size
+        params.append(
+            f"client_max_window_bits={self.client_max_window_bits}"
+            if self.client_max_window_bits
+            else "client_max_window_bits"
+        )
+
+        return "; ".join(params)
+
+    def accept(self, extensions):
+        # Returns whether the server agreed to use the extension, or raises
+        # WebsocketException if it can't be used the way the server wants
+        for extension in extensions.split(","):
+            name, *params = [param.strip() for param in extension.split(";")]
+            if name.lower() != "permessage-deflate":
+                continue
+
+            for param in params:
+                key, _, value = param.partition("=")
+                key = key.strip().lower()
+                if key == "client_no_context_takeover":
+                    self.client_no_context_takeover = True
+                elif key == "server_no_context_takeover":
+                    self.server_no_context_takeover = True
+                elif key == "client_max_window_bits" and value:
+                    # zlib doesn't support raw deflate with a window smaller than 2^9,
+                    # and using a bigger window than the server allows isn't allowed
+                    # https://datatracker.ietf.org/doc/html/rfc7692#section-7.1.2.2
+                    bits = value.strip('"')
+                    if not bits.isdigit() or not 9 <= int(bits) <= 15:
+                        raise WebsocketException(
+                            f"Can't compress with client_max_window_bits={bits}"
+                        )
+                    self._window_bits = int(bits)
+
+            self._compressor = None
+            self._decompressor = None
+            return True
+
+        return False
+
+    def compress(self, data):
+        if not self._compressor or self.client_no_context_takeover:
+            self._compressor = zlib.compressobj(
+                self.compression_level, zlib.DEFLATED, -self._window_bits
+            )
+
+        data = self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+        # https://datatracker.ietf.org/doc/html/rfc7692#section-7.2.1
+        return data[:-4] if data.endswith(b"\x00\x00\xff\xff") else data
+
+    def decompress(self, data):
+        if not self._decompressor or self.server_no_context_takeover:
+            self._decompressor = zlib.decompressobj(-15)
+
+        return self._decompressor.decompress(data + b"\x00\x00\xff\xff")
+
+
+class MessageBuffer:
+    """
+    Puts fragmented messages back together
+    The fragments are only joined once the last one arrives
+    """
+
+    def __init__(self, compression=None):
+        self._fragments = []
+        self._opcode = None
+        self._compressed = False
+        self._compression = compression
+
+    def add(self, frame, data):
+        # Returns (data, opcode) once a message is complete, (None, None) otherwise
+        if frame.opcode == Opcode.CONT:
+            if self._opcode is None:
+                raise WebsocketException("Unexpected continuation frame")
+        elif self._opcode is not None:
+            raise WebsocketException("Expected a continuation frame")
+        else:
+            if frame.rsv1 and not self._compression:
+                raise WebsocketException("Compressed frame without an extension")
+
+            if frame.fin:
+                return self._decode(data, frame.rsv1), frame.opcode
+
+            self._opcode = frame.opcode
+            self._compressed = frame.rsv1
+
+        self._fragments.append(data)
+        if not frame.fin:
+            return None, None
+
+        message = self._decode(b"".join(self._fragments), self._compressed)
+        opcode = self._opcode
+        self._fragments = []
+        self._opcode = None
+
+        return message, opcode
+
+    def _decode(self, data, compressed):
+        if not compressed:
+            return data
+
+        try:
+            return self._compression.decompress(data)
+        except zlib.error:
+            raise WebsocketException("Compressed message could not be inflated")
+
+
+class Websocket:
+    def __init__(self, max_frame_size=None, compression=None):
         self.connected = False
+        self.max_frame_size = max_frame_size
+        self.compression = compression
+        # Called with the data of every pong that's received
+        self.on_pong = None
+        self._deflate = None
+        # Set when connecting, so sending before then says the connection is closed
+        self.sock = None
+        # Frames from different threads could get mixed together otherwise
+        self._send_lock = threading.Lock()
 
     def connect(self, url, headers={}):
         parsed_url = urllib.parse.urlparse(url)
@@ -170,6 +443,9 @@ class Websocket:
             "Sec-Websocket-Version": "13",
             "Origin": f"{'https' if secure else 'http'}://{parsed_url.netloc}",
         }
+        if self.compression:
+            default_headers["Sec-Websocket-Extensions"] = self.compression.offer()
+
         handshake_headers = {**default_headers, **headers}
 
         handshake_str = "".join(
@@ -181,7 +457,20 @@ class Websocket:
                 "utf-8"
             )
         )
-        response = self.sock.recv(1024).decode("utf-8")
+
+        self._frame_buffer = FrameBuffer()
+        response = b""
+        while b"\r\n\r\n" not in response:
+            data = self.sock.recv(1024)
+            if not data:
+                break
+
+            response += data
+
+        # Frames the server sent right after the handshake response
+        response, _, extra = response.partition(b"\r\n\r\n")
+        self._frame_buffer.feed(extra)
+        response = f"{response.decode('utf-8')}\r\n"
 
         status_match = re.search("HTTP/\d\.\d 101", response)
         key_match = re.search("(?i:Sec-Websocket-Accept\: )(?P<key>.*)\r\n", response)
@@ -198,38 +487,137 @@ class Websocket:
             self.sock = None
             raise WebsocketException("Handshake failed")
 
+        try:
+            self._negotiate_extensions(response)
+        except WebsocketException:
+            self.sock.close()
+            self.sock = None
+            raise
         self.connected = True
 
+    def _negotiate_extensions(self, response):
+        extensions_match = re.search(
+            "(?i:Sec-Websocket-Extensions\: )(?P<extensions>.*)\r\n", response
+        )
+
+        self._deflate = (
+            self.compression
+            if self.compression
+            and extensions_match
+            and self.compression.accept(extensions_match.groupdict()["extensions"])
+            else None
+        )
+        self._message_buffer = MessageBuffer(self._deflate)
+
     def send(self, data):
-        if isinstance(data, bytes):
-            self.sock.sendall(Frame.encode(data, Opcode.BINARY))
-        else:
-            self.sock.sendall(Frame.encode(data, Opcode.TEXT))
+        if not self.sock:
+            raise WebsocketException("Connection is closed")
 
-    def recv_data(self):
-        beginning_data = self.sock.recv(10)
-        frame, err = Frame.decode_beginning(beginning_data)
-        if err:
-            self.close(Status.PROTOCOL_ERROR, "Server frame was masked")
-            raise err
+        with self._send_lock:
+            for frame in Frame.encode_message(
+                data, self.max_frame_size, compression=self._deflate
+            ):
+                self.sock.sendall(frame)
+
+    def _read_frame(self):
+        while True:
+            try:
+                frame, data = self._frame_buffer.read_frame()
+            except WebsocketException as err:
+                self.close(Status.PROTOCOL_ERROR, str(err))
+                raise
 
-        header_length = frame.data_start
+            if frame:
+                return frame, data
 
-        remaining_data = (
-            self.sock.recv(frame.length - header_length)
-            if frame.length + header_length > 10
-            else b""
-        )
-        frame_data = beginning_data + remaining_data
-        data = frame_data[frame.data_start : frame.data_start + frame.length]
+            try:
+                received = self.sock.recv(RECV_BUFFER_SIZE)
+            except OSError:
+                # A reset connection is treated the same as a closed one
+                received = b""
+
+            if not received:
+                self._drop_connection()
+                raise WebsocketException("Connection closed by server")
+
+            self._frame_buffer.feed(received)
 
+    def _handle_frame(self, frame, data):
+        # Returns (data, opcode) for control frames and complete messages
         if frame.opcode == Opcode.CLOSE:
             code = int.from_bytes(data[:2], byteorder="big")
             self.close(code, data[2:].decode("utf-8"))
+            return (data, frame.opcode)
         elif frame.opcode == Opcode.PING:
-            self.pong(data.decode("utf-8"))
+            self.pong(data)
+            return (data, frame.opcode)
+        elif frame.opcode == Opcode.PONG:
+            if self.on_pong:
+                self.on_pong(data)
+            return (data, frame.opcode)
+
+        try:
+            return self._message_buffer.add(frame, data)
+        except WebsocketException as err:
+            self.close(Status.PROTOCOL_ERROR, str(err))
+            raise
+
+    def recv_data(self):
+        if not self.sock:
+            raise WebsocketException("Connection is closed")
 
-        return (data, frame.opcode)
+        while True:
+            data, opcode = self._handle_frame(*self._read_frame())
+            if opcode is not None:
+                return (data, opcode)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def recv_available(self):
+        """
+        Reads from the socket once and returns every complete message received
+        Only call this when the socket is readable, e.g. from a selector
+        """
+        if not self.sock:
+            raise WebsocketException("Connection is closed")
+
+        try:
+            received = self.sock.recv(RECV_BUFFER_SIZE)
+        except OSError:
+            received = b""
+
+        if not received:
+            self._drop_connection()
+            raise WebsocketException("Connection closed by server")
+
+        self._frame_buffer.feed(received)
+        # SSL sockets can hold decrypted data that selectors don't know about
+        while getattr(self.sock, "pending", lambda: 0)():
+            self._frame_buffer.feed(self.sock.recv(RECV_BUFFER_SIZE))
+
+        return self.buffered_messages()
+
+    def buffered_messages(self):
+        # Returns the complete messages that have been received but not read yet
+        messages = []
+        while self.sock:
+            try:
+                frame, data = self._frame_buffer.read_frame()
+            except WebsocketException as err:
+                self.close(Status.PROTOCOL_ERROR, str(err))
+                raise
+
+            if not frame:
+                break
+
+            data, opcode = self._handle_frame(frame, data)
+            if opcode == Opcode.BINARY:
+                messages.append(data)
+            elif opcode == Opcode.TEXT:
+                messages.append(data.decode("utf-8"))
+
+        return messages
 
     def recv(self):
         while True:
@@ -244,25 +632,49 @@ class Websocket:
             return
 
         # https://datatracker.ietf.org/doc/html/rfc6455#section-1.4
-        body = code.to_bytes(2, byteorder="big").decode("raw_unicode_escape") + reason
-        self.sock.sendall(Frame.encode(body, Opcode.CLOSE))
+        body = code.to_bytes(2, byteorder="big") + reason.encode("utf-8")
+        with self._send_lock:
+            self.sock.sendall(Frame.encode(body, Opcode.CLOSE))
 
         # The server probably should send a closing handshake
         # but it doesn't really matter what happens here
-        self.sock.close()
+        self._drop_connection()
+
+    def _drop_connection(self):
+        if self.sock:
+            self.sock.close()
         self.sock = None
         self.connected = False
 
     def ping(self, data=""):
-        self.sock.sendall(Frame.encode(data, Opcode.PING))
+        if not self.sock:
+            raise WebsocketException("Connection is closed")
+
+        with self._send_lock:
+            self.sock.sendall(Frame.encode(data, Opcode.PING))
 
     def pong(self, data=""):
-        self.sock.sendall(Frame.encode(data, Opcode.PONG))
+        with self._send_lock:
+            self.sock.sendall(Frame.encode(data, Opcode.PONG))
+
+    def shutdown(self):
+        # Wakes up anything waiting to receive, which then finds the connection closed
+        if self.sock:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
 
 
 class AsyncWebsocket:
-    def __init__(self):
+    def __init__(self, max_frame_size=None, compression=None):
         self.connected = False
+        self.max_frame_size = max_frame_size
+        self.compression = compression
+        self.on_pong = None
+        self._deflate = None
+        # Set when connecting, so sending before then says the connection is closed
+        self.reader = self.writer = None
 
     async def connect(self, url, headers={}):
         parsed_url = urllib.parse.urlparse(url)
@@ -286,6 +698,9 @@ class AsyncWebsocket:
             "Sec-Websocket-Version": "13",
             "Origin": f"{'https' if secure else 'http'}://{parsed_url.netloc}",
         }
+        if self.compression:
+            default_headers["Sec-Websocket-Extensions"] = self.compression.offer()
+
         handshake_headers = {**default_headers, **headers}
 
         handshake_str = "".join(
@@ -299,7 +714,11 @@ class AsyncWebsocket:
         )
         await self.writer.drain()
 
-        response = (await self.reader.read(1024)).decode("utf-8")
+        self._frame_buffer = FrameBuffer()
+        try:
+            response = (await self.reader.readuntil(b"\r\n\r\n")).decode("utf-8")
+        except asyncio.IncompleteReadError as err:
+            response = err.partial.decode("utf-8")
 
         status_match = re.search("HTTP/\d\.\d 101", response)
         key_match = re.search("(?i:Sec-Websocket-Accept\: )(?P<key>.*)\r\n", response)
@@ -316,40 +735,88 @@ class AsyncWebsocket:
             self.reader = self.writer = None
             raise WebsocketException("Handshake failed")
 
+        try:
+            self._negotiate_extensions(response)
+        except WebsocketException:
+            self.writer.close()
+            self.reader = self.writer = None
+            raise
         self.connected = True
 
+    def _negotiate_extensions(self, response):
+        extensions_match = re.search(
+            "(?i:Sec-Websocket-Extensions\: )(?P<extensions>.*)\r\n", response
+        )
+
+        self._deflate = (
+            self.compression
+            if self.compression
+            and extensions_match
+            and self.compression.accept(extensions_match.groupdict()["extensions"])
+            else None
+        )
+        self._message_buffer = MessageBuffer(self._deflate)
+
     async def send(self, data):
-        if isinstance(data, bytes):
-            self.writer.write(Frame.encode(data, Opcode.BINARY))
-        else:
-            self.writer.write(Frame.encode(data, Opcode.TEXT))
+        if not self.writer:
+            raise WebsocketException("Connection is closed")
 
-        await self.writer.drain()
+        for frame in Frame.encode_message(
+            data, self.max_frame_size, compression=self._deflate
+        ):
+            self.writer.write(frame)
+            await self.writer.drain()
 
-    async def recv_data(self):
-        beginning_data = await self.reader.read(10)
-        frame, err = Frame.decode_beginning(beginning_data)
-        if err:
-            self.close(Status.PROTOCOL_ERROR, "Server frame was masked")
-            raise err
+    async def _read_frame(self):
+        while True:
+            try:
+                frame, data = self._frame_buffer.read_frame()
+            except WebsocketException as err:
+                await self.close(Status.PROTOCOL_ERROR, str(err))
+                raise
 
-        header_length = frame.data_start
+            if frame:
+                return frame, data
 
-        remaining_data = (
-            await self.reader.read(frame.length - header_length)
-            if frame.length + header_length > 10
-            else b""
-        )
-        frame_data = beginning_data + remaining_data
-        data = frame_data[frame.data_start : frame.data_start + frame.length]
+            try:
+                received = await self.reader.read(RECV_BUFFER_SIZE)
+            except OSError:
+                # A reset connection is treated the same as a closed one
+                received = b""
 
-        if frame.opcode == Opcode.CLOSE:
-            code = int.from_bytes(data[:2], byteorder="big")
-            await self.close(code, data[2:].decode("utf-8"))
-        elif frame.opcode == Opcode.PING:
-            await self.pong(data.decode("utf-8"))
+            if not received:
+                self._drop_connection()
+                raise WebsocketException("Connection closed by server")
 
-        return (data, frame.opcode)
+            self._frame_buffer.feed(received)
+
+    async def recv_data(self):
+        if not self.writer:
+            raise WebsocketException("Connection is closed")
+
+        while True:
+            frame, data = await self._read_frame()
+
+            if frame.opcode == Opcode.CLOSE:
+                code = int.from_bytes(data[:2], byteorder="big")
+                await self.close(code, data[2:].decode("utf-8"))
+                return (data, frame.opcode)
+            elif frame.opcode == Opcode.PING:
+                await self.pong(data)
+                return (data, frame.opcode)
+            elif frame.opcode == Opcode.PONG:
+                if self.on_pong:
+                    self.on_pong(data)
+                return (data, frame.opcode)
+
+            try:
+                data, opcode = self._message_buffer.add(frame, data)
+            except WebsocketException as err:
+                await self.close(Status.PROTOCOL_ERROR, str(err))
+                raise
+
+            if opcode is not None:
+                return (data, opcode)
 
     async def recv(self):
         while True:
@@ -363,19 +830,30 @@ class AsyncWebsocket:
         if not self.writer:
             return
 
-        body = code.to_bytes(2, byteorder="big").decode("raw_unicode_escape") + reason
+        body = code.to_bytes(2, byteorder="big") + reason.encode("utf-8")
         self.writer.write(Frame.encode(body, Opcode.CLOSE))
         await self.writer.drain()
 
         # The server probably should send a closing handshake but it doesn't really matter what happens here
-        self.writer.close()
+        self._drop_connection()
+
+    def _drop_connection(self):
+        if self.writer:
+            self.writer.close()
         self.reader = self.writer = None
         self.connected = False
 
     async def ping(self, data=""):
+        if not self.writer:
+            raise WebsocketException("Connection is closed")
+
         self.writer.write(Frame.encode(data, Opcode.PING))
         await self.writer.drain()
 
     async def pong(self, data=""):
         self.writer.write(Frame.encode(data, Opcode.PONG))
         await self.writer.drain()
+
+    def shutdown(self):
+        if self.writer:
+            self.writer.transport.abort()
@@ -1 +1 @@
-from .ScratchSession import ScratchSession
+from .ScratchSession import ScratchSession, AsyncScratchSession
@@ -1,21 +1,208 @@
+import asyncio
+import collections
+import concurrent.futures
+
 import requests
 
+PAGE_SIZE = 40
+
+
+def _get_all_pages(url, params, headers, transport, workers):
+    # Keeps the next few pages downloading at once, and stops asking for more
+    # once any page is short, since that's the last one
+    end = None
+
+    def get_page(offset):
+        nonlocal end
+        page = transport.get(
+            f"{url}/?limit={PAGE_SIZE}&offset={offset}{params}", headers=headers
+        ).json()
+        if len(page) != PAGE_SIZE and (end is None or offset < end):
+            end = offset
+        return page
+
+    data = []
+    pages = collections.deque()
+    offset = 0
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        try:
+            while True:
+                while len(pages) < workers and (end is None or offset <= end):
+                    pages.append(executor.submit(get_page, offset))
+                    offset += PAGE_SIZE
+
+                # Pages are added in order, whichever one finishes first
+                page = pages.popleft().result()
+                data += page
+                if len(page) != PAGE_SIZE:
+                    break
+        finally:
+            for future in pages:
+                future.cancel()
+
+    return data
+
+
 # Helper function to get lists of data from the API
-def get_data_list(all, limit, offset, url, callback, params="", headers={}):
-    if all:
+# transport is usually the HTTPTransport of a ScratchSession
+def get_data_list(
+    all,
+    limit,
+    offset,
+    url,
+    callback,
+    params="",
+    headers={},
+    transport=requests,
+    workers=1,
+):
+    if all and workers > 1:
+        data = _get_all_pages(url, params, headers, transport, workers)
+        return [callback(item) for item in data]
+    elif all:
         data = []
         offset = 0
         while True:
-            res = requests.get(
-                f"{url}/?limit=40&offset={offset}{params}", headers=headers
+            res = transport.get(
+                f"{url}/?limit={PAGE_SIZE}&offset={offset}{params}", headers=headers
             ).json()
             data += res
-            if len(res) != 40:
+            if len(res) != PAGE_SIZE:
                 break
-            offset += 40
+            offset += PAGE_SIZE
         return [callback(item) for item in data]
     else:
-        data = requests.get(
+        data = transport.get(
             f"{url}/?limit={limit}&offset={offset}{params}", headers=headers
         ).json()
         return [callback(item) for item in data]
+
+
+async def _async_get_all_pages(url, params, headers, transport, workers):
+    end = None
+
+    async def get_page(offset):
+        nonlocal end
+        page = (
+            await transport.get(
+                f"{url}/?limit={PAGE_SIZE}&offset={offset}{params}", headers=headers
+            )
+        ).json()
+        if len(page) != PAGE_SIZE and (end is None or offset < end):
+            end = offset
+        return page
+
+    data = []
+    pages = collections.deque()
+    offset = 0
+    try:
+        while True:
+            while len(pages) < workers and (end is None or offset <= end):
+                pages.append(asyncio.ensure_future(get_page(offset)))
+                offset += PAGE_SIZE
+
+            page = await pages.popleft()
+            data += page
+            if len(page) != PAGE_SIZE:
+                break
+    finally:
+        for task in pages:
+            task.cancel()
+
+    return data
+
+
+# The same as get_data_list, with an AsyncHTTPTransport
+async def async_get_data_list(
+    all, limit, offset, url, callback, transport, params="", headers={}, workers=1
+):
+    if all and workers > 1:
+        data = await _async_get_all_pages(url, params, headers, transport, workers)
+        return [callback(item) for item in data]
+    elif all:
+        data = []
+        offset = 0
+        while True:
+            res = (
+                await transport.get(
+                    f"{url}/?limit={PAGE_SIZE}&offset={offset}{params}", headers=headers
+                )
+            ).json()
+            data += res
+            if len(res) != PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
+        return [callback(item) for item in data]
+    else:
+        data = (
+            await transport.get(
+                f"{url}/?limit={limit}&offset={offset}{params}", headers=headers
+            )
+        ).json()
+        return [callback(item) for item in data]
+
+
+# Yields items a page at a time instead of getting every page first
+# With prefetch, the next page downloads while the current one is being used
+def iter_data_list(
+    url, callback, params="", headers={}, transport=requests, offset=0, prefetch=False
+):
+    def get_page(offset):
+        return transport.get(
+            f"{url}/?limit={PAGE_SIZE}&offset={offset}{params}", headers=headers
+        ).json()
+
+    executor = concurrent.futures.ThreadPoolExecutor(1) if prefetch else None
+    try:
+        page = get_page(offset)
+        while True:
+            next_page = None
+            if prefetch and len(page) == PAGE_SIZE:
+                next_page = executor.submit(get_page, offset + PAGE_SIZE)
+
+            for item in page:
+                yield callback(item)
+
+            if len(page) != PAGE_SIZE:
+                return
+
+            offset += PAGE_SIZE
+            page = next_page.result() if next_page else get_page(offset)
+    finally:
+        # Runs when the loop stops early too
+        if executor:
+            executor.shutdown(wait=False)
+
+
+async def async_iter_data_list(
+    url, callback, transport, params="", headers={}, offset=0, prefetch=False
+):
+    async def get_page(offset):
+        return (
+            await transport.get(
+                f"{url}/?limit={PAGE_SIZE}&offset={offset}{params}", headers=headers
+            )
+        ).json()
+
+    next_page = None
+    try:
+        page = await get_page(offset)
+        while True:
+            if prefetch and len(page) == PAGE_SIZE:
+                next_page = asyncio.ensure_future(get_page(offset + PAGE_SIZE))
+
+            for item in page:
+                yield callback(item)
+
+            if len(page) != PAGE_SIZE:
+                return
+
+            offset += PAGE_SIZE
+            if next_page:
+                page = await next_page
+                next_page = None
+            else:
+                page = await get_page(offset)
+    finally:
+        if next_page:
+            next_page.cancel()
@@ -0,0 +1,68 @@
+# Makes sure coalesced sets that are queued while a cloud connection
+# is reconnecting are still sent once it's back, using a local
+# CloudServer that's stopped and started again on the same port.
+
+import asyncio
+import time
+
+from scratchclient.CloudConnection import CloudConnection, AsyncCloudConnection
+from scratchclient.CloudLoadTest import _LoadTestClient
+from scratchclient.CloudServer import CloudServer
+from scratchclient.ReconnectPolicy import ReconnectPolicy
+
+
+def policy():
+    return ReconnectPolicy(initial_delay=0.2, max_delay=0.2, jitter=0)
+
+
+server = CloudServer().run_in_thread()
+connection = CloudConnection(
+    0, _LoadTestClient("sync"), server.url, reconnect_policy=policy()
+)
+connection.coalesce = True
+
+server.stop_thread()
+time.sleep(0.5)
+for value in range(10):
+    connection.set_cloud_variable("sync", value)
+time.sleep(1)
+
+server = CloudServer(port=server.port).run_in_thread()
+time.sleep(3)
+print(server.projects)
+assert server.projects["0"]["☁ sync"] == "9"
+assert connection._flusher
+connection.close()
+server.stop_thread()
+
+
+async def main():
+    server = CloudServer()
+    await server.start()
+    connection = AsyncCloudConnection(
+        0, _LoadTestClient("async"), server.url, reconnect_policy=policy()
+    )
+    connection.coalesce = True
+    task = asyncio.create_task(connection.connect())
+    await asyncio.sleep(0.3)
+
+    await server.close()
+    await asyncio.sleep(0.5)
+    for value in range(10):
+        await connection.set_cloud_variable("async", value)
+    await asyncio.sleep(1)
+
+    server = CloudServer(port=server.port)
+    await server.start()
+    await asyncio.sleep(3)
+    print(server.projects)
+    assert server.projects["0"]["☁ async"] == "9"
+    assert connection._flusher
+
+    await connection.close()
+    await asyncio.wait_for(task, 5)
+    await server.close()
+
+
+asyncio.run(main())
+print("ok")
@@ -0,0 +1,49 @@
+# Compares how long CloudCodec takes to encode and decode text with
+# the character by character encoder most projects use.
+
+import timeit
+
+from scratchclient.CloudCodec import CloudCodec, DEFAULT_CHARACTERS, numpy
+
+
+def encode_text_loop(text, characters=DEFAULT_CHARACTERS):
+    # The character by character encoder, for comparison
+    encoded = ""
+    for character in text:
+        encoded += str(characters.index(character) + 1).zfill(2)
+
+    return encoded
+
+
+strings = 1000
+length = 100
+number = 20
+
+texts = [
+    (DEFAULT_CHARACTERS * 2)[index % 90 : index % 90 + length]
+    for index in range(strings)
+]
+codecs = {"table": CloudCodec(use_numpy=False)}
+if numpy:
+    codecs["numpy"] = CloudCodec()
+
+results = {
+    "loop": timeit.timeit(
+        lambda: [encode_text_loop(text) for text in texts], number=number
+    ),
+    "table": timeit.timeit(
+        lambda: [codecs["table"].encode_text(text) for text in texts],
+        number=number,
+    ),
+}
+for name, codec in codecs.items():
+    encoded = codec.encode_texts(texts)
+    results[f"{name} batch encode"] = timeit.timeit(
+        lambda: codec.encode_texts(texts), number=number
+    )
+    results[f"{name} batch decode"] = timeit.timeit(
+        lambda: codec.decode_texts(encoded), number=number
+    )
+
+for name, seconds in results.items():
+    print(f"{name}: {seconds / number / strings * 1e6:.3f} µs per string")
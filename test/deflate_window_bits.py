@@ -0,0 +1,82 @@
+# Makes sure connecting fails when a server asks for a compression
+# window smaller than zlib can use, instead of quietly compressing
+# with a bigger one, using a server that only does the handshake.
+
+import asyncio
+import base64
+import hashlib
+import re
+import socket
+import threading
+
+from scratchclient.Websocket import (
+    GUID,
+    AsyncWebsocket,
+    PerMessageDeflate,
+    Websocket,
+    WebsocketException,
+)
+
+
+def handshake_server(extensions):
+    # Answers one handshake with the given extensions, and returns its URL
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def run():
+        client, _ = server.accept()
+        request = b""
+        while b"\r\n\r\n" not in request:
+            request += client.recv(1024)
+
+        key = re.search(rb"(?i)sec-websocket-key: *(.+?)\r\n", request).group(1)
+        accept = base64.b64encode(hashlib.sha1(key + GUID.encode()).digest())
+        client.sendall(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n"
+            b"Sec-WebSocket-Extensions: " + extensions.encode() + b"\r\n\r\n"
+        )
+        client.recv(1024)
+        client.close()
+        server.close()
+
+    threading.Thread(target=run, daemon=True).start()
+    return f"ws://127.0.0.1:{server.getsockname()[1]}"
+
+
+too_small = "permessage-deflate; client_max_window_bits=8"
+allowed = "permessage-deflate; client_max_window_bits=10"
+
+ws = Websocket(compression=PerMessageDeflate())
+try:
+    ws.connect(handshake_server(too_small))
+except WebsocketException as err:
+    print(err)
+else:
+    raise AssertionError("client_max_window_bits=8 was accepted")
+assert not ws.connected and ws.sock is None
+
+ws = Websocket(compression=PerMessageDeflate())
+ws.connect(handshake_server(allowed))
+assert ws.connected and ws._deflate._window_bits == 10
+ws.close()
+
+
+async def main():
+    ws = AsyncWebsocket(compression=PerMessageDeflate())
+    try:
+        await ws.connect(handshake_server(too_small))
+    except WebsocketException as err:
+        print(err)
+    else:
+        raise AssertionError("client_max_window_bits=8 was accepted")
+    assert not ws.connected and ws.writer is None
+
+    ws = AsyncWebsocket(compression=PerMessageDeflate())
+    await ws.connect(handshake_server(allowed))
+    assert ws.connected and ws._deflate._window_bits == 10
+    await ws.close()
+
+
+asyncio.run(main())
+print("ok")
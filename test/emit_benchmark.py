@@ -0,0 +1,48 @@
+# Compares how long EventEmitter.emit takes per handler with
+# how the emitter used to store handlers in lists.
+
+import asyncio
+import timeit
+
+from scratchclient.EventEmitter import EventEmitter
+
+
+class ListEventEmitter:
+    # How EventEmitter used to store handlers, for comparison
+    def __init__(self):
+        self._events = {}
+
+    def on(self, key, callback, once=False):
+        self._events.setdefault(key, []).append((callback, once))
+
+    def off(self, key, callback):
+        self._events[key] = [
+            (handler, once)
+            for handler, once in self._events[key]
+            if handler is not callback
+        ]
+
+    def emit(self, key, *args, **kwargs):
+        if not key in self._events:
+            return
+
+        for handler, once in self._events[key]:
+            if asyncio.iscoroutinefunction(handler):
+                asyncio.create_task(handler(*args, **kwargs))
+            else:
+                handler(*args, **kwargs)
+
+            if once:
+                self.off(key, handler)
+
+
+number = 20000
+for count in (1, 10, 100):
+    for name, emitter in (("list", ListEventEmitter()), ("tuple", EventEmitter())):
+        for _ in range(count):
+            emitter.on("set", lambda variable: None)
+
+        seconds = timeit.timeit(lambda: emitter.emit("set", None), number=number)
+        print(
+            f"{name}, {count} handlers: {seconds / number / count * 1e9:.0f} ns per handler"
+        )
@@ -0,0 +1,12 @@
+# Measures how many sets per second sync and async cloud connections
+# can handle against a local CloudServer, and how long they take to arrive.
+
+from scratchclient.CloudLoadTest import benchmark
+
+for name, result in benchmark(clients=20, sets=200).items():
+    latency = result["latency"]
+    print(
+        f"{name}: {result['received']}/{result['sets']} sets in {result['seconds']:.2f}s, "
+        f"{result['throughput']:.0f} sets/s, "
+        f"latency p50 {latency['p50'] * 1000:.1f}ms p95 {latency['p95'] * 1000:.1f}ms"
+    )
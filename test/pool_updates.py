@@ -0,0 +1,42 @@
+# Makes sure updates() iterators on pooled cloud connections stop
+# when the connection is closed and when it gives up reconnecting,
+# using a local CloudServer.
+
+import threading
+import time
+
+from scratchclient.CloudConnection import CloudConnectionPool
+from scratchclient.CloudLoadTest import _LoadTestClient
+from scratchclient.CloudServer import CloudServer
+from scratchclient.ReconnectPolicy import ReconnectPolicy
+
+
+def iterate(connection):
+    # Returns a thread that finishes when the iterator stops
+    thread = threading.Thread(target=lambda: list(connection.updates()), daemon=True)
+    thread.start()
+    time.sleep(0.2)
+    return thread
+
+
+server = CloudServer().run_in_thread()
+pool = CloudConnectionPool(_LoadTestClient("pool"))
+pool.start()
+
+connection = pool.create_cloud_connection(0, server.url)
+thread = iterate(connection)
+connection.close()
+thread.join(5)
+assert not thread.is_alive(), "iterator didn't stop after close()"
+
+connection = pool.create_cloud_connection(
+    0, server.url, reconnect_policy=ReconnectPolicy(initial_delay=0.1, max_attempts=1)
+)
+thread = iterate(connection)
+server.stop_thread()
+thread.join(5)
+assert not thread.is_alive(), "iterator didn't stop after reconnecting failed"
+assert connection not in pool.connections
+
+pool.close()
+print("ok")